@@ -0,0 +1,271 @@
+# 봇(AI) 의사결정 정책 logic
+
+# project-root/backend/app/core/ai.py
+import functools
+import math
+import random
+import time
+from typing import Callable, Dict, List, Optional
+
+from .card import CARD_IDS, Catalog, current_catalog
+from .engine import Phase
+
+# 정책 함수 규약: policy(player_id, engine) -> 사용/구매할 카드 이름 (없으면 None)
+#   - ACTION 페이즈에서는 플레이할 액션 카드를 반환
+#   - BUY 페이즈에서는 구매할 카드를 반환
+#   - None을 반환하면 현재 페이즈를 마칩니다.
+Policy = Callable[[str, object], Optional[str]]
+
+
+def is_risky(card, hp: int) -> bool:
+    """자해 카드인데 쓰고 나면 체력 여유가 5 이하로 남는지 (smart/priority 공통 규칙)"""
+    return card.add_hp < 0 and hp <= -card.add_hp + 5
+
+
+def smart_ai_decision(pid, engine):
+    """AI의 의사결정 로직"""
+    p_state = engine.state.players[pid]
+
+    # 1. 액션 페이즈 판단
+    if engine.state.phase == Phase.ACTION:
+        for card_name in engine.legal_moves(pid).play:
+            card = engine.cards[card_name]
+            if card.card_type != "ACTION":
+                continue
+            # [전략] 체력이 20 이하인데 자폭 카드(Madness 등)라면 사용하지 않음 (여유치 5 남김)
+            if is_risky(card, p_state.hp):
+                continue
+            return card_name
+
+    # 2. 구매 페이즈 판단
+    elif engine.state.phase == Phase.BUY:
+        # [전략] 현재 골드로 살 수 있는 가장 비싼 전용 카드 혹은 실버/골드 선택 (동률이면 전용 카드)
+        # 전용 카드는 비용 순 인덱스에서 bisect 로 바로 찾습니다.
+        if p_state.buys <= 0:
+            return None
+        gold = p_state.gold
+        private, _ = engine.market_index(pid)
+        choice = private.best(gold)
+        if choice is not None and p_state.private_market[choice] <= 0:
+            engine.invalidate_market_index()  # 엔진 밖에서 재고가 바뀐 경우
+            choice = engine.market_index(pid)[0].best(gold)
+
+        supply, cards = engine.state.supply, engine.cards
+        for name in ("Gold", "Silver"):
+            cost = cards[name].cost
+            if supply.get(name, 0) > 0 and cost <= gold and (choice is None or cost > cards[choice].cost):
+                choice = name
+        return choice
+
+    return None
+
+
+@functools.lru_cache(maxsize=8)
+def action_priority(catalog: Catalog) -> List[str]:
+    """priority 정책의 액션 카드 순서: 액션을 더 주는 카드 → 더 뽑는 카드 → 비싼 카드 (같으면 카드 ID 순)"""
+    cards = catalog.cards
+    return sorted(catalog.of_type("ACTION"),
+                  key=lambda name: (-cards[name].add_actions, -cards[name].add_cards, -cards[name].cost, CARD_IDS[name]))
+
+
+ACTION_PRIORITY: List[str] = action_priority(current_catalog())
+
+
+def priority_ai_decision(pid, engine):
+    """
+    손패 순서와 상관없는 고정 우선순위 정책. 벡터 시뮬레이터(core.vector_sim)가 같은 규칙을 배열로 구현합니다.
+      - ACTION: action_priority(게임의 카탈로그) 순으로 손패에 있고 위험하지 않은 첫 액션 카드
+      - BUY: smart_ai_decision 과 같음
+    """
+    state = engine.state
+    if state.phase == Phase.ACTION:
+        player = state.players[pid]
+        if player.actions <= 0:
+            return None
+        hand, cards = player.hand.ids, engine.cards
+        for card_name in action_priority(state.catalog):
+            if CARD_IDS[card_name] in hand and not is_risky(cards[card_name], player.hp):
+                return card_name
+        return None
+    return smart_ai_decision(pid, engine)
+
+
+def random_ai_decision(pid, engine):
+    """사용 가능한 카드 중 하나를 무작위로 고르는 기준선(baseline) 정책"""
+    moves = engine.legal_moves(pid)
+
+    if engine.state.phase == Phase.ACTION:
+        actions = [c for c in moves.play if engine.cards[c].card_type == "ACTION"]
+        return random.choice(actions) if actions else None
+
+    elif engine.state.phase == Phase.BUY:
+        return random.choice(moves.buy) if moves.buy else None
+
+    return None
+
+
+def play_turn(engine, pid: str, policy: Policy) -> None:
+    """
+    한 플레이어의 턴(액션 → 재물 → 구매 → 정리)을 엔진 API로만 진행합니다.
+    턴 중간(예: 구매 페이즈)에서 불러도 남은 단계부터 이어서 진행합니다.
+    """
+    state = engine.state
+    player = state.players[pid]
+
+    # --- [단계 1] 액션 페이즈 ---
+    while state.phase == Phase.ACTION and player["actions"] > 0 and not state.is_game_over:
+        card_name = policy(pid, engine)
+        if not card_name or not engine.play_card(pid, card_name)[0]:
+            break
+    if state.is_game_over:
+        return
+    if state.phase == Phase.ACTION:
+        engine.next_phase()
+
+    # --- [단계 2] 구매 페이즈 ---
+    for card_name in list(player["hand"]):
+        if engine.cards[card_name].card_type == "TREASURE":
+            engine.play_card(pid, card_name)
+
+    while player["buys"] > 0 and not state.is_game_over:
+        card_name = policy(pid, engine)
+        if not card_name or not engine.buy_card(pid, card_name)[0]:
+            break
+
+    # --- [단계 3] 턴 종료 ---
+    if not state.is_game_over:
+        engine.next_phase()
+
+
+# ──────────────────────────────────────────────────────────────
+# MCTS (몬테카를로 트리 탐색) 정책
+# ──────────────────────────────────────────────────────────────
+class MCTSPolicy:
+    """
+    지금 고를 수 있는 후보(카드 또는 None = 페이즈 종료)마다 엔진을 fork 해서
+    rollout_policy 로 rollout_turns 라운드 뒤(또는 게임 끝)까지 진행해 보고,
+    UCB1 로 유망한 후보에 rollout 을 더 배분합니다 (루트 한 단계만 펼친 UCT).
+
+    상대 손패/덱과 내 덱 순서는 알 수 없는 정보이므로 rollout 마다 다시 섞어서 정합니다.
+    time_budget(초)과 rollouts(횟수) 중 먼저 닿는 쪽에서 멈추며, 둘 중 하나는 있어야 합니다.
+    seed 를 생략하면 결정마다 그 게임의 RNG 에서 탐색용 RNG 를 갈라 씁니다 (게임 RNG 자체는 움직이지 않음).
+    time_budget=None 으로 rollouts 만 주면 같은 시드의 게임에서 항상 같은 수를 고릅니다 (시뮬레이터용).
+    time_budget 을 주면 rollout 수가 머신 속도에 따라 달라지므로 결과를 재현할 수 없습니다 (실시간 대전용).
+    """
+
+    def __init__(self, time_budget: Optional[float] = 0.05, rollouts: Optional[int] = None,
+                 rollout_turns: int = 4, exploration: float = 1.4,
+                 rollout_policy: Policy = smart_ai_decision, seed: Optional[int] = None):
+        if time_budget is None and rollouts is None:
+            raise ValueError("time_budget 과 rollouts 중 하나는 지정해야 합니다.")
+        self.time_budget = time_budget
+        self.rollouts = rollouts
+        self.rollout_turns = rollout_turns
+        self.exploration = exploration
+        self.rollout_policy = rollout_policy
+        self.rng: Optional[random.Random] = None if seed is None else random.Random(seed)
+        # 마지막 결정의 후보별 (rollout 수, 평균 점수) — 디버깅/튜닝용
+        self.last_stats: Dict[Optional[str], tuple] = {}
+
+    def candidates(self, pid: str, engine) -> List[Optional[str]]:
+        moves = engine.legal_moves(pid)
+        phase = engine.state.phase
+        if phase == Phase.ACTION:
+            cards = [c for c in moves.play if engine.cards[c].card_type == "ACTION"]
+        elif phase == Phase.BUY and engine.state.players[pid].buys > 0:
+            cards = list(moves.buy)
+        else:
+            return []
+        return cards + [None] if cards else []
+
+    def __call__(self, pid: str, engine) -> Optional[str]:
+        moves = self.candidates(pid, engine)
+        self.last_stats = {}
+        if len(moves) <= 1:
+            return moves[0] if moves else None
+
+        rng = _search_rng(engine) if self.rng is None else self.rng
+        deadline = None if self.time_budget is None else time.perf_counter() + self.time_budget
+        visits = [0] * len(moves)
+        totals = [0.0] * len(moves)
+        n = 0
+        while self.rollouts is None or n < self.rollouts:
+            if n >= len(moves) and deadline is not None and time.perf_counter() >= deadline:
+                break
+            if n < len(moves):
+                i = n  # 모든 후보를 한 번씩 먼저 시도
+            else:
+                log_n = self.exploration * math.sqrt(math.log(n))
+                i = max(range(len(moves)),
+                        key=lambda k: totals[k] / visits[k] + log_n / math.sqrt(visits[k]))
+            totals[i] += self._rollout(engine, pid, moves[i], rng)
+            visits[i] += 1
+            n += 1
+
+        self.last_stats = {move: (visits[i], totals[i] / visits[i]) for i, move in enumerate(moves)}
+        # 가장 많이 시도된 후보 (동률이면 평균 점수가 높은 쪽)
+        best = max(range(len(moves)), key=lambda k: (visits[k], totals[k] / visits[k]))
+        return moves[best]
+
+    def _rollout(self, engine, pid: str, move: Optional[str], rng: random.Random) -> float:
+        sim = engine.fork(rng)
+        state = sim.state
+        self._determinize(state, pid, rng)
+
+        if move is None:
+            sim.next_phase()
+        elif state.phase == Phase.ACTION:
+            sim.play_card(pid, move)
+        else:
+            sim.buy_card(pid, move)
+
+        last_turn = state.turn_count + self.rollout_turns
+        while not state.is_game_over and state.turn_count < last_turn:
+            play_turn(sim, state.turn_owner, self.rollout_policy)
+        return _score(state, pid)
+
+    def _determinize(self, state, pid: str, rng: random.Random) -> None:
+        """보이지 않는 정보(내 덱 순서, 상대 손패 + 덱)를 무작위로 다시 정합니다."""
+        shuffle = rng.shuffle
+        for other, p in state.players.items():
+            if other == pid:
+                p.deck.shuffle(rng)
+            else:
+                hidden = p.hand.ids + p.deck.ids
+                shuffle(hidden)
+                size = len(p.hand.ids)
+                p.hand.ids, p.deck.ids = hidden[:size], hidden[size:]
+
+
+def _search_rng(engine) -> random.Random:
+    """
+    게임 RNG 의 지금 상태에서 갈라낸 탐색용 RNG. 게임 RNG 는 복사본에서만 뽑으므로
+    원본 진행과 액션 기록 재생(replay)이 어긋나지 않고, 같은 시드 / 같은 진행이면 같은 값이 나옵니다.
+    """
+    twin = random.Random()
+    twin.setstate(engine.state.rng.getstate())
+    return random.Random(twin.getrandbits(64))
+
+
+def _score(state, pid: str) -> float:
+    """pid 입장의 결과 점수 (승리 1, 패배 0, 끝나지 않았으면 남은 HP 비율)"""
+    if state.is_game_over:
+        if state.winner is None:
+            return 0.5
+        return 1.0 if state.winner == pid else 0.0
+    mine = max(state.players[pid].hp, 0)
+    total = mine + sum(max(p.hp, 0) for other, p in state.players.items() if other != pid)
+    return mine / total if total else 0.5
+
+
+# 시뮬레이터용 MCTS 의 결정당 rollout 수 (실시간 대전의 기본 50ms 예산에서 도는 정도)
+MCTS_SIM_ROLLOUTS = 128
+
+# 이름으로 정책을 찾기 위한 레지스트리 (멀티 프로세스 시뮬레이터는 이름만 전달합니다)
+# mcts 는 시간 예산 없이 rollout 수만 정해 두어 같은 시드면 같은 결과가 나옵니다.
+POLICIES: Dict[str, Policy] = {
+    "smart": smart_ai_decision,
+    "random": random_ai_decision,
+    "priority": priority_ai_decision,
+    "mcts": MCTSPolicy(time_budget=None, rollouts=MCTS_SIM_ROLLOUTS),
+}
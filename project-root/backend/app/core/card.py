@@ -1,8 +1,18 @@
 # 카드 데이터 및 효과 logic
 
 # project-root/backend/app/core/card.py
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+import warnings
+import weakref
 from abc import ABC, abstractmethod
-from typing import Dict
+from bisect import bisect_right
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 class Card(ABC):
     def __init__(self, name: str, cost: int, card_type: str):
@@ -15,6 +25,38 @@ class Card(ABC):
         """카드를 사용했을 때 발생하는 개별 효과"""
         pass
 
+# --- 카드 효과 opcode ---
+# 액션 카드의 효과는 로딩 시점에 (opcode, 필드, 수치) 튜플 목록으로 한 번만 컴파일됩니다.
+# 0인 효과는 목록에 들어가지 않으므로, 카드 사용은 실제로 바뀌는 것만 도는 짧은 루프가 됩니다.
+OP_STAT = 0      # 내 스탯 변경 (actions / buys / gold, 디버그 로그 남김)
+OP_MANA = 1      # 내 마나 변경
+OP_HP = 2        # 내 체력 변경 (사망 판정 포함)
+OP_OP_HP = 3     # 상대 체력 변경
+OP_OP_MANA = 4   # 상대 마나 변경
+OP_DRAW = 5      # 카드 드로우
+
+# card_data.json 의 effects 키 → (opcode, 필드, ActionCard 속성). 이 순서대로 실행됩니다.
+EFFECTS = {
+    "actions": (OP_STAT, "actions", "add_actions"),
+    "buys": (OP_STAT, "buys", "add_buys"),
+    "gold": (OP_STAT, "gold", "add_gold"),
+    "mana": (OP_MANA, "mana", "add_mana"),
+    "hp": (OP_HP, "hp", "add_hp"),
+    "op_hp": (OP_OP_HP, "hp", "op_add_hp"),
+    "op_mana": (OP_OP_MANA, "mana", "op_add_mana"),
+    "cards": (OP_DRAW, "hand", "add_cards"),
+}
+
+
+def compile_effects(effects: Dict[str, int]) -> Tuple[Tuple[int, str, int], ...]:
+    """{"cards": 3, "hp": -10} → ((OP_HP, "hp", -10), (OP_DRAW, "hand", 3))"""
+    unknown = set(effects) - set(EFFECTS)
+    if unknown:
+        raise ValueError(f"알 수 없는 카드 효과입니다: {', '.join(sorted(unknown))}")
+    return tuple((op, field, effects[key]) for key, (op, field, _attr) in EFFECTS.items()
+                 if effects.get(key, 0) != 0)
+
+
 # --- 액션 카드 ---
 class ActionCard(Card):
     def __init__(self, name: str, cost: int, add_cards=0, add_actions=0, add_buys=0,
@@ -28,24 +70,35 @@ class ActionCard(Card):
         self.add_mana = add_mana
         self.op_add_hp = op_add_hp
         self.op_add_mana = op_add_mana
+        self.ops = compile_effects({key: getattr(self, attr) for key, (_op, _field, attr) in EFFECTS.items()})
 
-    def play(self, engine, player_id: str):
-        player = engine.state.players[player_id]
-
-        engine._apply_stat_change(player_id, "actions", self.add_actions)
-        engine._apply_stat_change(player_id, "buys", self.add_buys)
-        engine._apply_stat_change(player_id, "gold", self.add_gold)
-        player["mana"] += self.add_mana
+    @classmethod
+    def from_effects(cls, name: str, cost: int, effects: Dict[str, int]) -> "ActionCard":
+        compile_effects(effects)  # 알 수 없는 키 검사
+        return cls(name, cost, **{EFFECTS[key][2]: amount for key, amount in effects.items()})
 
-        #   체력 조정
-
-        if self.add_hp != 0:
-            # 엔진의 메서드를 호출하여 죽음 판정까지 같이 처리
-            engine.apply_hp_change(player_id, self.add_hp)
+    def play(self, engine, player_id: str):
+        state = engine.state
+        player = state.players[player_id]
+        log_stats = state.log_enabled and state.debug  # STAT 로그는 디버그 전용
 
-        #   드로우
-        if self.add_cards > 0:
-            engine.draw_card(player_id, self.add_cards)
+        for op, field, amount in self.ops:
+            if op == OP_STAT:
+                value = getattr(player, field) + amount
+                setattr(player, field, value)
+                if log_stats:
+                    engine._log("STAT", player_id, field, amount, value, is_debug=True)
+            elif op == OP_DRAW:
+                engine.draw_card(player_id, amount)
+            elif op == OP_HP:
+                # 엔진의 메서드를 호출하여 죽음 판정까지 같이 처리
+                engine.apply_hp_change(player_id, amount)
+            elif op == OP_MANA:
+                player.mana += amount
+            elif op == OP_OP_HP:
+                engine.apply_hp_change(engine.get_opponent_id(player_id), amount)
+            elif op == OP_OP_MANA:
+                state.players[engine.get_opponent_id(player_id)].mana += amount
 
 # --- 재물 카드 ---
 class TreasureCard(Card):
@@ -55,7 +108,7 @@ class TreasureCard(Card):
 
     def play(self, engine, player_id: str):
         player = engine.state.players[player_id]
-        player["gold"] += self.value
+        player.gold += self.value
 
 # --- 승점 카드 ---
 class VictoryCard(Card):
@@ -66,60 +119,331 @@ class VictoryCard(Card):
     def play(self, engine, player_id: str):
         pass # 승점 카드는 사용 효과가 없음
 
-# --- 카드 데이터베이스 ---
-CARD_DB: Dict[str, Card] = {
-    "Copper": TreasureCard("Copper", cost=0, value=1),
-    "Silver": TreasureCard("Silver", 3, 2),
-    "Gold": TreasureCard("Gold", 6, 3),
-    "Estate": VictoryCard("Estate", cost=2, points=1),
-    "Duchy": VictoryCard("Duchy", 5, 3),
-    "Province": VictoryCard("Province", 8, 6),
-
-
-    "Market": ActionCard("Market", 5,
-        add_cards=1, 
-        add_actions=1, 
-        add_buys=1, 
-        add_gold=1
-    ),
-    "Village": ActionCard("Village", 3,
-        add_cards=1,
-        add_actions=2
-    ),
-    "Smithy": ActionCard("Smithy", 4,
-        add_cards=3
-    ),
-
-
-    # 내 피 10을 깎고 카드 3장을 뽑는 '혈액 순환'
-    "BloodDraw": ActionCard("BloodDraw", 3, add_cards=3, add_hp=-10),
-    
-    # 내 피 5를 깎고 상대에게 15 데미지를 주는 '피의 화살'
-    "BloodArrow": ActionCard("BloodArrow", 5, op_add_hp=-15, add_hp=-5),
-    
-    # 내 피 20을 깎는 대신 액션을 3개나 더 얻는 '광기'
-    "Madness": ActionCard("Madness", 4, add_actions=3, add_hp=-20),
-
-    # 반대로 피를 채우는 '치유'
-    "HolyLight": ActionCard("HolyLight", 2, add_hp=15)
-}
+# --- 카드 ID (정수) 테이블 ---
+# 존(hand/deck/discard/play_mat)은 카드 이름 대신 작은 정수 ID를 저장합니다.
+# 카탈로그가 카드를 정의된 순서대로 번호를 매기고, 핫 리로드로 새 카드가 생기면 뒤에 이어서 번호를 붙입니다.
+# 한 번 발급한 ID 는 프로세스가 끝날 때까지 바뀌지 않으므로 이전 카탈로그로 진행 중인 게임과도 섞이지 않습니다.
+# 존은 ID 를 u8 배열(array('B'))에 담으므로 한 프로세스가 발급할 수 있는 ID 는 MAX_CARD_IDS 개까지입니다.
+# 핫 리로드는 새 카드 이름만큼 ID 를 쓰므로, 넘치게 하는 카탈로그는 로딩할 때 거절합니다 (게임 중에 넘치지 않게).
+MAX_CARD_IDS = 256
+CARD_NAMES: List[str] = []
+CARD_IDS: Dict[str, int] = {}
+
+def intern_card(card_name: str) -> int:
+    """카드 이름에 대응하는 정수 ID를 반환합니다 (없으면 새로 발급, ID 가 다 떨어졌으면 ValueError)."""
+    card_id = CARD_IDS.get(card_name)
+    if card_id is None:
+        if len(CARD_NAMES) >= MAX_CARD_IDS:
+            raise ValueError(f"카드 ID 를 더 발급할 수 없습니다 (최대 {MAX_CARD_IDS}종): {card_name}")
+        card_id = len(CARD_NAMES)
+        CARD_NAMES.append(card_name)
+        CARD_IDS[card_name] = card_id
+    return card_id
+
+
+# --- 카드 카탈로그 (shared/card_data.json 에서 로딩) ---
+# JSON 에는 카드 정의(cards), 클래스 데이터(classes), 공동 마켓 초기 재고(supply)가 함께 있습니다.
+# 로딩할 때 한 번만 검증하고(클래스/마켓이 가리키는 카드가 모두 정의되어 있는지 등),
+# 검증을 마친 결과는 원본 옆 __pycache__ 에 컴파일된 형태로 저장해 다음 프로세스는 JSON 을 다시 읽지 않습니다.
+CARD_DATA_PATH = Path(__file__).resolve().parents[3] / "shared" / "card_data.json"
+CARD_TYPES = ("ACTION", "TREASURE", "VICTORY")
+CLASS_STATS = ("hp", "gold", "actions")
+
+# 캐시 형식이 바뀌면 올립니다. (이 파일이 바뀌어도 캐시 키가 달라지므로 카드 클래스 변경은 자동으로 반영)
+CATALOG_CACHE_FORMAT = 3
+
+# 이 프로세스에 살아 있는 카탈로그: (version, digest) → Catalog. 저장된 게임을 원래 카드 데이터에 다시 묶을 때 씀
+_CATALOGS: "weakref.WeakValueDictionary[Tuple[int, str], Catalog]" = weakref.WeakValueDictionary()
+
+
+class CatalogError(ValueError):
+    """카드 데이터 검증 실패. problems 에 찾은 문제를 모두 모아 한 번에 알려 줍니다."""
+
+    def __init__(self, problems: List[str]):
+        super().__init__("카드 데이터가 올바르지 않습니다:\n  - " + "\n  - ".join(problems))
+        self.problems = problems
+
+
+class CatalogWarning(UserWarning):
+    """로딩은 되지만 고쳐야 할 카드 데이터 (개인 마켓이 정의되지 않은 카드를 가리킴 등)"""
+
+
+def build_card(spec: dict) -> Card:
+    """card_data.json 의 카드 항목 하나를 카드 객체로 만듭니다."""
+    name, card_type, cost = spec["name"], spec["type"], spec["cost"]
+    if card_type == "ACTION":
+        try:
+            return ActionCard.from_effects(name, cost, spec.get("effects", {}))
+        except ValueError as e:
+            raise ValueError(f"{name}: {e}") from None
+    if card_type == "TREASURE":
+        return TreasureCard(name, cost, spec["value"])
+    if card_type == "VICTORY":
+        return VictoryCard(name, cost, spec["points"])
+    raise ValueError(f"{name}: 알 수 없는 카드 타입입니다: {card_type}")
+
+
+class Catalog:
+    """
+    검증을 마친 카드/클래스/공동 마켓 데이터와 조회용 인덱스. 만든 뒤에는 바꾸지 않습니다.
+      - cards: 카드 이름 → 카드 (정의 순서), by_id: 카드 ID → 카드
+      - by_type: 카드 타입 → 카드 이름 (정의 순서)
+      - by_cost: (비용, 카드 ID) 정렬 목록 → affordable(gold) 는 bisect 한 번
+      - digest: 원본 데이터의 해시 (같은 version 이라도 내용이 다르면 다른 카탈로그)
+      - warnings: 로딩을 막지는 않은 데이터 문제 (load_catalog 가 CatalogWarning 으로도 알림)
+    게임(GameState)은 만들 때의 카탈로그를 끝까지 쓰므로, 새 버전으로 바꿔도 진행 중인 게임에는 영향이 없습니다.
+    저장/저널에는 (version, digest) 가 남고, 읽을 때 find_catalog 로 같은 카탈로그를 찾아 묶습니다.
+    """
+
+    def __init__(self, version: int, cards: Dict[str, Card], classes: Dict[str, dict], supply: Dict[str, int],
+                 digest: str = "", warnings: Tuple[str, ...] = ()):
+        self.version = version
+        self.cards = cards
+        self.classes = classes
+        self.supply = supply
+        self.digest = digest
+        self.warnings = tuple(warnings)
+        _CATALOGS.setdefault((version, digest), self)  # 같은 내용이 이미 살아 있으면 그쪽을 계속 씀
+        self.by_id: Dict[int, Card] = {intern_card(name): card for name, card in cards.items()}
+        self.by_type: Dict[str, Tuple[str, ...]] = {
+            card_type: tuple(name for name, card in cards.items() if card.card_type == card_type)
+            for card_type in CARD_TYPES
+        }
+        self.by_cost: List[Tuple[int, int]] = sorted((card.cost, CARD_IDS[name]) for name, card in cards.items())
+        self._costs = [cost for cost, _ in self.by_cost]
+
+    def get(self, card_name: str) -> Optional[Card]:
+        return self.cards.get(card_name)
+
+    def of_type(self, card_type: str) -> Tuple[str, ...]:
+        return self.by_type.get(card_type, ())
+
+    def affordable(self, gold: int) -> List[str]:
+        """비용 gold 이하인 카드 이름 (비용 오름차순, 같은 비용은 카드 ID 순)"""
+        return [CARD_NAMES[card_id] for _, card_id in self.by_cost[:bisect_right(self._costs, gold)]]
+
+    def __getstate__(self) -> tuple:
+        # 카드 ID 는 프로세스마다 발급 순서가 다를 수 있으므로 ID 인덱스는 저장하지 않고 읽을 때 다시 만듭니다.
+        return self.version, self.cards, self.classes, self.supply, self.digest, self.warnings
+
+    def __setstate__(self, state: tuple) -> None:
+        self.__init__(*state)
+
+    def __repr__(self) -> str:
+        return f"Catalog(version={self.version}, cards={len(self.cards)}, classes={list(self.classes)})"
+
+
+def _count_table(value: Any, where: str, cards: Dict[str, Card], problems: List[str],
+                 allow_zero: bool, undefined: Optional[List[str]] = None) -> Dict[str, int]:
+    """
+    {카드 이름: 장수} 항목을 검사합니다. 잘못된 장수는 problems 에 모읍니다.
+    정의되지 않은 카드도 problems 에 모으고, undefined 를 주면 대신 그쪽에 모읍니다 (경고로만 알릴 때).
+    """
+    if not isinstance(value, dict):
+        problems.append(f"{where}: {{카드 이름: 장수}} 형태여야 합니다.")
+        return {}
+    for name, count in value.items():
+        if name not in cards:
+            (problems if undefined is None else undefined).append(f"{where}: 정의되지 않은 카드입니다: {name}")
+        if not isinstance(count, int) or count < 0 or (count == 0 and not allow_zero):
+            problems.append(f"{where}: {name} 의 장수가 올바르지 않습니다: {count!r}")
+    return dict(value)
+
+
+def build_catalog(data: dict) -> Catalog:
+    """
+    card_data.json 을 읽은 dict 를 검증해 Catalog 를 만듭니다.
+    문제가 하나라도 있으면 모두 모아 CatalogError 로 알립니다 (구매할 때가 아니라 로딩할 때 실패).
+    """
+    problems: List[str] = []
+    warned: List[str] = []
+    version = data.get("version")
+    if not isinstance(version, int) or not 0 <= version < 2 ** 32:
+        problems.append(f"version 은 0 이상의 정수여야 합니다: {version!r}")
+
+    cards: Dict[str, Card] = {}
+    for n, spec in enumerate(data.get("cards", [])):
+        name = spec.get("name") if isinstance(spec, dict) else None
+        if not isinstance(name, str) or not name:
+            problems.append(f"cards[{n}]: 카드 이름이 없습니다.")
+            continue
+        if name in cards:
+            problems.append(f"카드 이름이 중복되었습니다: {name}")
+            continue
+        if not isinstance(spec.get("cost"), int) or spec["cost"] < 0:
+            problems.append(f"{name}: 비용이 올바르지 않습니다: {spec.get('cost')!r}")
+            continue
+        try:
+            cards[name] = build_card(spec)
+        except KeyError as e:
+            problems.append(f"{name}: 필수 항목이 없습니다: {e.args[0]}")
+        except ValueError as e:
+            problems.append(str(e))
+
+    classes: Dict[str, dict] = {}
+    for class_name, spec in data.get("classes", {}).items():
+        where = f"classes.{class_name}"
+        if not isinstance(spec, dict):
+            problems.append(f"{where}: 클래스 정의가 dict 가 아닙니다.")
+            continue
+        stats = {}
+        for stat in CLASS_STATS:
+            if not isinstance(spec.get(stat), int):
+                problems.append(f"{where}: {stat} 는 정수여야 합니다: {spec.get(stat)!r}")
+            stats[stat] = spec.get(stat)
+        deck = _count_table(spec.get("initial_deck"), f"{where}.initial_deck", cards, problems, allow_zero=False)
+        # 개인 마켓의 정의되지 않은 카드는 살 수 없을 뿐 게임은 진행되므로 경고로만 알립니다.
+        # (카드를 새로 정의할지 마켓에서 뺄지는 밸런스 결정)
+        market = _count_table(spec.get("private_market", {}), f"{where}.private_market", cards, problems,
+                              allow_zero=True, undefined=warned)
+        # 초기 덱은 적힌 순서대로 펼칩니다 (셔플 전 순서가 같아야 같은 시드에서 같은 게임)
+        stats["initial_deck"] = [name for name, count in deck.items() for _ in range(count)]
+        stats["private_market"] = market
+        classes[class_name] = stats
+
+    supply = _count_table(data.get("supply", {}), "supply", cards, problems, allow_zero=True)
+
+    # 이 카탈로그로 새로 발급될 카드 ID (개인 마켓의 정의되지 않은 카드도 게임을 만들 때 ID 를 받음)
+    names = set(cards) | set(supply)
+    for stats in classes.values():
+        names.update(stats["initial_deck"], stats["private_market"])
+    new_ids = len(names - CARD_IDS.keys())
+    if len(CARD_NAMES) + new_ids > MAX_CARD_IDS:
+        problems.append(f"카드 ID 가 부족합니다: 새 카드 {new_ids}종, 남은 ID {MAX_CARD_IDS - len(CARD_NAMES)}개 "
+                        f"(핫 리로드로 쌓인 이름은 프로세스를 다시 시작해야 비워집니다)")
+
+    if problems:
+        raise CatalogError(problems)
+    digest = hashlib.sha1(json.dumps(data, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+    return Catalog(version, cards, classes, supply, digest, tuple(warned))
+
+
+def find_catalog(version: int, digest: str) -> Optional[Catalog]:
+    """이 프로세스가 알고 있는 카탈로그 중 (version, digest) 가 같은 것 (없으면 None)"""
+    current = CATALOG_STORE.current
+    if current.version == version and current.digest == digest:
+        return current
+    return _CATALOGS.get((version, digest))
+
+
+def catalog_cache_path(path) -> Path:
+    """컴파일된 카탈로그 캐시 위치 (원본 옆 __pycache__, .pyc 와 같은 방식)"""
+    path = Path(path)
+    return path.parent / "__pycache__" / f"{path.name}.catalog"
+
+
+def _cache_key(path: Path) -> tuple:
+    source = path.stat()
+    code = Path(__file__).stat()
+    return (CATALOG_CACHE_FORMAT, source.st_mtime_ns, source.st_size, code.st_mtime_ns, code.st_size)
+
+
+def load_catalog(path=CARD_DATA_PATH, use_cache: bool = True, write_cache: bool = False) -> Catalog:
+    """
+    카드 데이터 JSON 을 읽어 검증된 Catalog 를 만듭니다. 카드 추가는 JSON 만 고치면 됩니다.
+    use_cache 면 원본의 (수정 시각, 크기) 가 같은 동안 컴파일된 캐시를 읽어 JSON 파싱/검증을 건너뜁니다.
+    캐시는 write_cache=True (또는 compile_catalog_cache) 일 때만 씁니다: import 나 리로드만으로는 파일을 만들지 않습니다.
+    """
+    path = Path(path)
+    key = _cache_key(path)
+    cache_path = catalog_cache_path(path)
+    if use_cache:
+        try:
+            with open(cache_path, "rb") as f:
+                cached_key, catalog = pickle.load(f)
+            if cached_key == key:
+                return _warn(path, catalog)
+        except Exception:  # 캐시가 없거나 깨졌거나 형식이 다르면 원본에서 다시 만듦
+            pass
+
+    with open(path, encoding="utf-8") as f:
+        catalog = build_catalog(json.load(f))
+    if write_cache:
+        _write_cache(cache_path, key, catalog)
+    return _warn(path, catalog)
+
+
+def compile_catalog_cache(path=CARD_DATA_PATH) -> bool:
+    """
+    컴파일된 카탈로그 캐시를 미리 써 둡니다 (서버 시작 / 배포 단계에서 명시적으로 호출).
+    검증에 실패하면 CatalogError, 쓸 수 없는 위치면 False 를 반환합니다.
+    """
+    path = Path(path)
+    key = _cache_key(path)
+    with open(path, encoding="utf-8") as f:
+        catalog = build_catalog(json.load(f))
+    return _write_cache(catalog_cache_path(path), key, catalog)
+
+
+def _write_cache(cache_path: Path, key: tuple, catalog: Catalog) -> bool:
+    # 임시 파일에 쓴 뒤 os.replace 로 바꾸므로 여러 워커가 동시에 시작해도 깨진 캐시를 읽지 않습니다.
+    try:
+        cache_path.parent.mkdir(exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=cache_path.parent, prefix=cache_path.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((key, catalog), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, cache_path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except OSError:
+        return False  # 읽기 전용 배포 등: 캐시 없이 동작
+    return True
+
+
+def _warn(path: Path, catalog: Catalog) -> Catalog:
+    for note in catalog.warnings:
+        warnings.warn(f"{path.name}: {note}", CatalogWarning, stacklevel=3)
+    return catalog
+
+
+def load_cards(path=CARD_DATA_PATH) -> Dict[str, Card]:
+    """카드 정의 JSON 을 읽어 {카드 이름: 카드} 를 만듭니다."""
+    return load_catalog(path).cards
+
+
+# --- 현재 카탈로그 (핫 리로드) ---
+class CatalogStore:
+    """
+    서버가 지금 쓰는 카탈로그 하나를 가리키는 참조.
+    reload() 는 새 파일을 락 밖에서 읽고 검증한 뒤 참조만 바꿉니다 (진행 중인 게임은 멈추지 않음).
+    새로 만드는 게임만 새 카탈로그를 쓰고, 검증에 실패하면 CatalogError 를 내고 기존 카탈로그를 그대로 둡니다.
+    """
+
+    def __init__(self, catalog: Catalog):
+        self._current = catalog
+        self._lock = threading.Lock()  # 동시에 들어온 reload 끼리의 순서만 정함
+        self.reloads = 0
+        # 지금까지 쓴 카탈로그 (그 버전의 방이 다른 워커로 갔다가 돌아와도 다시 묶을 수 있게 붙잡아 둠)
+        self.history: List[Catalog] = [catalog]
+
+    @property
+    def current(self) -> Catalog:
+        return self._current
+
+    def reload(self, path=CARD_DATA_PATH, use_cache: bool = True) -> Catalog:
+        catalog = load_catalog(path, use_cache)
+        with self._lock:
+            self._current = catalog
+            self.history.append(catalog)
+            self.reloads += 1
+        return catalog
+
+
+CATALOG_STORE = CatalogStore(load_catalog())
+
+
+def current_catalog() -> Catalog:
+    return CATALOG_STORE.current
+
+
+def reload_catalog(path=CARD_DATA_PATH) -> Catalog:
+    """새 카탈로그로 바꿉니다. 이후 만드는 게임부터 적용됩니다."""
+    return CATALOG_STORE.reload(path)
+
 
-# --- 클래스 데이터베이스 ---
-
-CLASS_DB = {
-    "Warrior": {
-        "hp": 40, "gold": 0, "actions": 1, 
-        "initial_deck": ["Copper"] * 7 + ["Estate"] * 3,
-        "private_market": {"BloodArrow": 5}  # 전사 전용 공격 카드
-    },
-    "Mage": {
-        "hp": 25, "gold": 0, "actions": 1,
-        "initial_deck": ["Copper"] * 6 + ["Estate"] * 3 + ["Madness"] * 3,
-        "private_market": {"BloodDraw": 3, "ManaPotion": 5} # 마법사 전용 드로우/마나 카드
-    },
-    "Priest": {
-        "hp": 30, "gold": 2, "actions": 1,
-        "initial_deck": ["Copper"] * 7 + ["HolyLight"] * 3,
-        "private_market": {"HolyLight": 10} # 사제는 힐 카드가 마켓에 많음
-    }
-}
\ No newline at end of file
+# --- 카드 / 클래스 데이터베이스 (부팅 시 카탈로그) ---
+# 핫 리로드를 따라가야 하는 코드는 current_catalog() 나 게임에 고정된 GameState.catalog 를 씁니다.
+CARD_DB: Dict[str, Card] = CATALOG_STORE.current.cards
+CLASS_DB: Dict[str, dict] = CATALOG_STORE.current.classes
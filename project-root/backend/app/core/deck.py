@@ -2,62 +2,65 @@
 
 # project-root/backend/app/core/deck.py
 import random
-from typing import List, Dict, Any
+from typing import Iterable, Optional
+
+from .player import PlayerState
 
 class DeckManager:
-    def __init__(self, player_state: Dict[str, Any]):
+    def __init__(self, player_state: PlayerState, rng: Optional[random.Random] = None):
         """
         GameState 내부의 특정 플레이어 데이터를 참조로 받아 직접 수정합니다.
-        player_state: { "hand": [], "deck": [], "discard": [], ... }
+        player_state: PlayerState (hand/deck/discard/play_mat 존은 카드 ID 배열)
+        rng: 게임 전용 난수 생성기 (GameState.rng). 생략하면 전역 random 을 씁니다.
         """
         self.state = player_state
+        self.rng = rng if rng is not None else random
 
     def shuffle_discard_into_deck(self) -> None:
         """버림패를 섞어서 덱으로 만듭니다."""
-        if not self.state["discard"]:
+        p = self.state
+        if not p.discard:
             return
-            
-        new_deck = self.state["discard"][:]
-        random.shuffle(new_deck)
-        self.state["deck"] = new_deck
-        self.state["discard"] = []
+
+        # 배열 존은 ID 배열을 맞바꾸고 제자리에서 섞고, 장수 존은 장수 배열만 넘겨받습니다.
+        p.deck.refill_from(p.discard, self.rng)
 
     def draw(self, count: int = 1) -> int:
         """카드를 뽑아 핸드로 옮기고, 실제 뽑은 장수를 반환합니다."""
         drawn_count = 0
-        for _ in range(count):
-            if not self.state["deck"]:
+        while drawn_count < count:
+            if not self.state.deck:
                 self.shuffle_discard_into_deck()
-                
-            if not self.state["deck"]: # 셔플 후에도 없으면 중단
+
+            deck = self.state.deck
+            if not deck: # 셔플 후에도 없으면 중단
                 break
-                
-            card = self.state["deck"].pop()
-            self.state["hand"].append(card)
-            drawn_count += 1
+
+            # 덱 맨 위(배열 끝)부터 한 장씩 pop 하는 것과 같은 순서로 한꺼번에 옮깁니다.
+            # (장수 존이면 남은 장수에 비례해 뽑습니다)
+            taken = deck.take(count - drawn_count, self.rng)
+            self.state.hand.ids.extend(taken)
+            drawn_count += len(taken)
         return drawn_count
 
     def discard_hand(self) -> None:
         """손패의 모든 카드를 버림패로 옮깁니다."""
-        self.state["discard"].extend(self.state["hand"])
-        self.state["hand"] = []
+        self.state.discard.extend(self.state.hand)
+        self.state.hand.clear()
 
     def add_to_discard(self, card_name: str) -> None:
         """구매하거나 획득한 카드를 버림패에 추가합니다."""
-        self.state["discard"].append(card_name)
+        self.state.discard.append(card_name)
 
     def add_to_play_mat(self, card_name: str) -> None:
         """플레이매트에 카드를 추가합니다."""
-        self.state["play_mat"].append(card_name)
+        self.state.play_mat.append(card_name)
 
-    def discard_pile(self, cards: List[str]) -> None:
+    def discard_pile(self, cards: Iterable[str]) -> None:
         """여러 장의 카드(핸드나 매트 전체)를 한꺼번에 버림패로 이동"""
-        self.state["discard"].extend(cards)
+        self.state.discard.extend(cards)
 
     def initialize_deck(self) -> None:
         """게임 시작 시 구리 7장, 사유지 3장으로 초기 덱 구성"""
-        starting_cards = ["Copper"] * 7 + ["Estate"] * 3
-        random.shuffle(starting_cards)
-        self.state["deck"] = starting_cards
-
-        
\ No newline at end of file
+        self.state["deck"] = ["Copper"] * 7 + ["Estate"] * 3
+        self.state.deck.shuffle(self.rng)
@@ -0,0 +1,97 @@
+# 명령 단위 상태 변경분(delta) logic
+
+# project-root/backend/app/core/delta.py
+from typing import Any, Dict, List
+
+# delta 에 담기는 스탯 / 진행 정보 필드 (_stats, _game 의 순서와 같음)
+STAT_FIELDS = ("actions", "buys", "gold", "victory_points", "hp", "mana")
+GAME_FIELDS = ("phase", "turn", "owner", "over", "winner")
+
+
+def _stats(p) -> tuple:
+    return (p.actions, p.buys, p.gold, p.victory_points, p.hp, p.mana)
+
+
+def _game(state) -> tuple:
+    return (state.phase.name, state.turn_count, state.turn_owner, state.is_game_over, state.winner)
+
+
+class DeltaBuilder:
+    """
+    명령 하나가 실행되는 동안 바뀐 것만 모읍니다.
+      - 스탯/진행 정보: 명령 전후 값을 비교 (플레이어당 정수 6개)
+      - 카드 이동: 엔진이 이동할 때마다 move() 로 직접 기록
+      - 마켓 재고: 엔진이 구매할 때 supply()/market() 로 직접 기록
+    """
+    __slots__ = ("state", "stats_before", "game_before", "moves", "supply_counts", "market_counts", "touched")
+
+    def __init__(self, state):
+        self.state = state
+        self.stats_before = {pid: _stats(p) for pid, p in state.players.items()}
+        self.game_before = _game(state)
+        self.moves: List[list] = []
+        self.supply_counts: Dict[str, int] = {}
+        self.market_counts: Dict[str, Dict[str, int]] = {}
+        self.touched = set()  # 존 크기가 바뀐 플레이어
+
+    def move(self, player_id: str, src: str, dst: str, cards) -> None:
+        """카드 이동 기록. cards 는 카드 이름 리스트 (덱 셔플처럼 내용이 비공개면 장수)"""
+        self.moves.append([player_id, src, dst, cards])
+        self.touched.add(player_id)
+
+    def supply(self, card_name: str, count: int) -> None:
+        self.supply_counts[card_name] = count
+
+    def market(self, player_id: str, card_name: str, count: int) -> None:
+        self.market_counts.setdefault(player_id, {})[card_name] = count
+
+    def build(self, version: int, command: list) -> Dict[str, Any]:
+        """바뀐 항목만 담은 JSON 직렬화 가능한 dict 를 만듭니다."""
+        state = self.state
+        delta: Dict[str, Any] = {"v": version, "cmd": command}
+
+        stats = {}
+        for pid, p in state.players.items():
+            after = _stats(p)
+            before = self.stats_before[pid]
+            if after != before:
+                stats[pid] = {STAT_FIELDS[i]: v for i, v in enumerate(after) if before[i] != v}
+        if stats:
+            delta["stats"] = stats
+
+        if self.moves:
+            delta["moves"] = self.moves
+            # 클라이언트가 검증할 수 있도록 이동 후 존 크기를 함께 보냅니다.
+            delta["sizes"] = {
+                pid: {"hand": len(p.hand.ids), "deck": len(p.deck),
+                      "discard": len(p.discard), "play_mat": len(p.play_mat.ids)}
+                for pid, p in state.players.items() if pid in self.touched
+            }
+        if self.supply_counts:
+            delta["supply"] = self.supply_counts
+        if self.market_counts:
+            delta["market"] = self.market_counts
+
+        game = _game(state)
+        if game != self.game_before:
+            delta["game"] = {GAME_FIELDS[i]: v for i, v in enumerate(game) if self.game_before[i] != v}
+        return delta
+
+
+def full_state(state) -> Dict[str, Any]:
+    """재동기화(resync)용 전체 상태. delta 와 같은 필드 이름을 씁니다."""
+    return {
+        "v": state.version,
+        "players": {
+            pid: {
+                **dict(zip(STAT_FIELDS, _stats(p))),
+                "hand": list(p.hand), "deck": len(p.deck),  # 덱 순서는 보내지 않음
+                "discard": list(p.discard),
+                "play_mat": list(p.play_mat), "private_market": p.private_market.copy(),
+            }
+            for pid, p in state.players.items()
+        },
+        "supply": dict(state.supply),
+        "game": dict(zip(GAME_FIELDS, _game(state))),
+    }
+
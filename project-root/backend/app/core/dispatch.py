@@ -0,0 +1,144 @@
+# 방별 명령 큐(asyncio) logic
+
+# project-root/backend/app/core/dispatch.py
+#
+# Engine 은 동기 코드이고 한 번에 한 호출자만 있다고 가정합니다. 소켓 핸들러 여러 개가 같은 방에 동시에
+# 명령을 보내도 엔진 안에 락을 두지 않도록, 방마다 크기 제한 대기열 하나와 소비 태스크 하나로 직렬화합니다.
+#   - 같은 방의 명령은 들어온 순서대로 하나씩 실행, 다른 방은 명령 하나마다 번갈아 실행 (한 이벤트 루프)
+#   - 대기열이 가득 차면 CommandRejected 로 바로 거절 (밀린 명령이 끝없이 쌓이지 않음)
+#   - 대기열 맨 뒤와 같은 키를 준 작업은 새로 넣지 않고 그 결과를 함께 받음. 키는 진짜 중복(같은 메시지의 재전송,
+#     멱등 명령)에만 주어야 합니다: 내용이 같은 명령이라도 두 번 보냈으면 두 번 실행해야 하므로 기본은 키 없음
+#   - 소비 태스크는 대기열이 빌 때 끝나므로, 쉬는 방은 태스크도 대기열도 없습니다.
+# 결과는 Future 로 돌려주며, 기다리던 쪽이 취소돼도 이미 받은 명령은 실행됩니다.
+import asyncio
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+# 방 하나에 실행을 기다릴 수 있는 명령 수 (실행 중인 명령 제외)
+COMMAND_QUEUE_LIMIT = 32
+
+
+class CommandRejected(RuntimeError):
+    """대기열이 가득 차 명령을 받지 않았을 때"""
+
+
+class _RoomQueue:
+    """방 하나의 대기열. items 는 (키, 작업, Future) 이고 task 는 이 방의 유일한 소비자입니다."""
+    __slots__ = ("items", "task")
+
+    def __init__(self):
+        self.items: Deque[Tuple[Any, Callable[[], Any], "asyncio.Future"]] = deque()
+        self.task: Optional[asyncio.Task] = None
+
+
+# ──────────────────────────────────────────────────────────────
+# 1️⃣ 디스패처
+# ──────────────────────────────────────────────────────────────
+class RoomDispatcher:
+    """
+    GameManager(또는 같은 모양의 ShardRouter) 앞에 두는 asyncio 파사드.
+    소켓 핸들러는 `ok, msg = await dispatcher.execute(room_id, "buy_card", pid, "Silver")` 만 부르면 됩니다.
+    검증까지 한 번에 직렬화해야 하면 call() 로 동기 함수 자체를 대기열에 넣습니다 (GameChannel 이 이렇게 씀).
+    """
+
+    def __init__(self, manager, queue_limit: int = COMMAND_QUEUE_LIMIT):
+        self.manager = manager
+        self.queue_limit = queue_limit
+        self._rooms: Dict[str, _RoomQueue] = {}
+        self.submitted = 0
+        self.executed = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self.max_depth = 0
+
+    # ──────────────────────────────────────────────────────────
+    # 명령 넣기
+    # ──────────────────────────────────────────────────────────
+    def submit_call(self, room_id: str, key: Any, job: Callable[[], Any]) -> "asyncio.Future":
+        """
+        job() 을 방 대기열에 넣고 그 반환값(또는 예외)을 받을 Future 를 반환합니다. (이벤트 루프 안에서 호출)
+        key 가 대기열 맨 뒤 명령의 key 와 같으면 넣지 않고 그 Future 를 그대로 돌려줍니다 (None 이면 합치지 않음).
+        가득 차 있으면 CommandRejected 를 냅니다.
+        """
+        queue = self._rooms.get(room_id)
+        if queue is None:
+            queue = self._rooms[room_id] = _RoomQueue()
+        items = queue.items
+        if key is not None and items and items[-1][0] == key:
+            self.coalesced += 1
+            return items[-1][2]
+        if len(items) >= self.queue_limit:
+            self.rejected += 1
+            raise CommandRejected(f"명령이 너무 많이 밀려 있습니다. 잠시 후 다시 시도하세요. ({room_id})")
+        future = asyncio.get_running_loop().create_future()
+        items.append((key, job, future))
+        self.submitted += 1
+        if len(items) > self.max_depth:
+            self.max_depth = len(items)
+        if queue.task is None:
+            queue.task = asyncio.get_running_loop().create_task(self._consume(room_id, queue))
+        return future
+
+    def submit(self, room_id: str, command: str, *args, key: Any = None) -> "asyncio.Future":
+        """
+        manager.execute(room_id, command, *args) 를 대기열에 넣습니다.
+        key 를 준 경우에만 대기열 맨 뒤의 같은 key 명령과 합칩니다 (재전송된 메시지 id 등, 기본은 합치지 않음).
+        """
+        return self.submit_call(room_id, key, lambda: self.manager.execute(room_id, command, *args))
+
+    async def call(self, room_id: str, key: Any, job: Callable[[], Any]) -> Any:
+        return await asyncio.shield(self.submit_call(room_id, key, job))
+
+    async def execute(self, room_id: str, command: str, *args, key: Any = None) -> Any:
+        return await asyncio.shield(self.submit(room_id, command, *args, key=key))
+
+    # ──────────────────────────────────────────────────────────
+    # 소비 태스크
+    # ──────────────────────────────────────────────────────────
+    async def _consume(self, room_id: str, queue: _RoomQueue) -> None:
+        items = queue.items
+        try:
+            while items:
+                # 실행 전에 꺼내므로, 실행 중인 명령에는 새 명령이 합쳐지지 않습니다.
+                _key, job, future = items.popleft()
+                if not future.cancelled():
+                    try:
+                        future.set_result(job())
+                    except Exception as e:
+                        future.set_exception(e)
+                self.executed += 1
+                await asyncio.sleep(0)  # 다른 방 차례
+        finally:
+            queue.task = None
+            while items:  # 취소됐을 때만 남아 있음
+                future = items.popleft()[2]
+                if not future.done():
+                    future.cancel()
+            if self._rooms.get(room_id) is queue:
+                del self._rooms[room_id]
+
+    async def drain(self) -> None:
+        """지금 대기열에 있는 명령이 모두 실행될 때까지 기다립니다."""
+        while self._rooms:
+            tasks = [queue.task for queue in self._rooms.values() if queue.task is not None]
+            if not tasks:
+                break
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def close(self) -> None:
+        """소비 태스크를 멈추고 아직 실행되지 않은 명령의 Future 를 취소합니다."""
+        tasks = [queue.task for queue in self._rooms.values() if queue.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "rooms": len(self._rooms),
+            "queued": sum(len(queue.items) for queue in self._rooms.values()),
+            "submitted": self.submitted,
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "rejected": self.rejected,
+            "max_depth": self.max_depth,
+        }
@@ -1,10 +1,20 @@
+from collections import deque
 from enum import Enum
-from typing import List, Dict, Any, Tuple
+from typing import Any, Callable, List, Dict, NamedTuple, Optional, Tuple
+import functools
+import itertools
+import operator
 import random
 
 # 외부 모듈 참조 (앞서 만든 파일들)
-from .card import CARD_DB, CLASS_DB, ActionCard, TreasureCard
+from .card import CARD_IDS, CARD_NAMES, ActionCard, Catalog, TreasureCard, current_catalog
+from .delta import DeltaBuilder, full_state
 from .deck import DeckManager
+from .event_log import DEFAULT_LOG_CAPACITY, EventLog, render_snapshot
+from .market_index import CostIndex
+from .player import STATS, ZONES, Market, PlayerState
+from .snapshot import SnapshotTracker, capture_full, to_snapshot_tuple
+from .view import ViewCache, redacted_state
 
 # ──────────────────────────────────────────────────────────────
 # 1️⃣ 게임 단계 정의
@@ -15,58 +25,159 @@ class Phase(Enum):
     CLEAN_UP = 3 # 정리 단계 (손패 재정비 - 엔진 내부에서 자동 처리)
 
 
+# 클래스 선택 전 기본 개인 마켓 (게임마다 dict를 새로 만들지 않고 재고 배열만 복사)
+DEFAULT_PRIVATE_MARKET = Market({
+    "BloodDraw": 5,
+    "BloodArrow": 5,
+    "Madness": 2,
+    "HolyLight": 10
+})
+
+
 # ──────────────────────────────────────────────────────────────
 # 2️⃣ 전체 게임 상태 객체 (순수 데이터)
 # ──────────────────────────────────────────────────────────────
 class GameState:
-    def __init__(self, player_ids: List[str], debug: bool = False):
+    def __init__(self, player_ids: List[str], debug: bool = False, log_enabled: bool = True,
+                 log_capacity: Optional[int] = DEFAULT_LOG_CAPACITY, log_spill_path: Optional[str] = None,
+                 snapshot_mode: str = "diff", record_deltas: bool = False,
+                 seed: Optional[int] = None, record_actions: bool = True, zone_mode: str = "array",
+                 catalog: Optional[Catalog] = None):
         self.player_ids = player_ids
         self.phase: Phase = Phase.ACTION
         self.turn_owner: str = player_ids[0]
         self.debug: bool = debug
+        self.log_enabled: bool = log_enabled  # False면 로그를 전혀 남기지 않음 (대량 시뮬레이션용)
         self.turn_count = 1  # 현재 게임의 총 턴 수
 
         self.is_game_over = False 
         self.winner = None
 
+        # 상태 버전: delta 를 기록하는 동안 받아들여진 명령마다 1씩 증가 (delta 의 "v")
+        self.version = 0
+        self.record_deltas: bool = record_deltas  # True면 명령마다 delta 를 만듦 (소켓으로 중계하는 방)
+
+        # 게임 전용 난수 생성기 (셔플은 모두 여기서). seed 를 생략하면 전역 random 에서 하나 뽑습니다.
+        # 저장 포맷이 u64 로 담으므로 0 이상 2**64 미만의 정수만 받습니다.
+        if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool) or not 0 <= seed < 2 ** 64):
+            raise ValueError(f"seed 는 0 이상 2**64 미만의 정수여야 합니다: {seed!r}")
+        self.seed: int = random.getrandbits(63) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.player_classes: Dict[str, str] = {}  # setup_game 에서 정해진 클래스 (리플레이용)
+        # 받아들여진 명령 기록 [(명령, 인자...), ...]. seed + 클래스 + 이 목록이면 게임을 다시 만들 수 있습니다.
+        self.actions: Optional[List[tuple]] = [] if record_actions else None
+
+
+        # 카드/클래스 데이터: 게임을 만들 때의 카탈로그를 끝까지 씁니다 (핫 리로드는 새 게임부터 적용, fork 는 공유)
+        self.catalog: Catalog = current_catalog() if catalog is None else catalog
 
         # 중앙 공급처 수량
-        self.supply: Dict[str, int] = {
-            "Copper": 60, "Silver": 40, "Gold": 30,
-            "Estate": 24, "Duchy": 12, "Province": 12,
-            "Village": 10, "Smithy": 10, "Market": 10
+        self.supply: Dict[str, int] = dict(self.catalog.supply)
+
+
+
+        # 덱/버림패 표현 ("array": 순서 있는 카드 배열, "counts": 카드별 장수 + 뽑을 때 표본 추출)
+        if zone_mode not in ("array", "counts"):
+            raise ValueError(f"알 수 없는 존 모드입니다: {zone_mode}")
+        self.zone_mode = zone_mode
+
+        # 플레이어별 가변 상태 (슬롯 기반, player["gold"] 처럼 dict 방식으로도 접근 가능)
+        # 초기 승점 3은 사유지 3장의 점수
+        self.players: Dict[str, PlayerState] = {
+            pid: PlayerState(hp=20, mana=10, victory_points=3, private_market=DEFAULT_PRIVATE_MARKET,
+                             counted=zone_mode == "counts")
+            for pid in player_ids
         }
 
+        # 구조화 로그 (링 버퍼, 문구는 읽을 때 렌더링)
+        self.logs: EventLog = EventLog(log_capacity, log_spill_path)
 
+        # 디버그 스냅샷 방식 ("diff": 바뀐 필드만, "full": 전체) 과 diff 추적기 (첫 스냅샷 때 생성)
+        if snapshot_mode not in ("diff", "full"):
+            raise ValueError(f"알 수 없는 스냅샷 모드입니다: {snapshot_mode}")
+        self.snapshot_mode = snapshot_mode
+        self.snapshots: Optional[SnapshotTracker] = None
 
-        # 플레이어별 가변 상태
-        self.players: Dict[str, Dict[str, Any]] = {
-            pid: {
-                "hand": [],      # 손패 (카드 이름 리스트)
-                "deck": [],      # 덱
-                "discard": [],   # 버림패
-                "play_mat": [],  # 플레이 매트 (사용한 카드들)
-                "actions": 1,    # 남은 액션 횟수
-                "buys": 1,       # 남은 구매 횟수
-                "gold": 0,       # 이번 턴에 발생한 구매력
-                "victory_points": 3, # 초기 사유지 3장의 점수
-                "hp" : 20,
-                "mana": 10,
+    def fork(self, rng: Optional[random.Random] = None) -> "GameState":
+        """
+        탐색(MCTS rollout 등)용 사본을 만듭니다. 원본은 전혀 바뀌지 않습니다.
+          - 개인 마켓 재고는 copy-on-write 로 공유, 존/공동 마켓은 작은 배열/dict 라 바로 복사
+          - 로그, 디버그 스냅샷, delta, 액션 기록은 모두 끈 상태
+          - rng 를 주면 그 난수 생성기를 쓰고, 생략하면 원본 RNG 상태를 복제합니다 (같은 셔플 결과)
+        """
+        clone = GameState.__new__(GameState)
+        clone.__dict__.update(self.__dict__)  # 턴/페이즈 등 불변 값과 player_ids, player_classes 는 공유
+        clone.debug = False
+        clone.log_enabled = False
+        clone.record_deltas = False
+        clone.actions = None
+        clone.logs = _FORK_LOG
+        clone.snapshots = None
+        clone.supply = dict(self.supply)
+        clone.players = {pid: p.fork() for pid, p in self.players.items()}
+        if rng is None:
+            rng = random.Random()
+            rng.setstate(self.rng.getstate())
+        clone.rng = rng
+        return clone
 
 
-                "private_market": {
-                    "BloodDraw": 5, 
-                    "BloodArrow": 5, 
-                    "Madness": 2,
-                    "HolyLight": 10
-                                },
+# fork 한 상태가 공유하는 빈 로그 (log_enabled=False 라 기록되지 않음)
+_FORK_LOG = EventLog(0)
 
 
+# 엔진이 기억하는 최근 delta 개수 (이보다 오래 끊겼던 클라이언트는 전체 상태로 재동기화)
+DELTA_HISTORY = 256
 
-            } for pid in player_ids
-        }
 
-        self.logs: List[str] = []
+class LegalMoves(NamedTuple):
+    play: List[str]  # 지금 사용할 수 있는 손패 카드 (손패 순서, 중복 제거)
+    buy: List[str]   # 지금 살 수 있는 카드 (개인 마켓 → 공동 마켓, 각각 비용 오름차순)
+
+
+# delta 를 만드는 엔진 명령: delta 의 "cmd" 이름 → 메서드 이름
+COMMAND_METHODS = {"play_card": "play_card", "buy_card": "buy_card",
+                   "next_phase": "next_phase", "end_turn": "_end_turn", "batch": "apply_batch"}
+
+# apply_batch 가 받는 명령과 인자 개수 (플레이어 ID 는 apply_batch 인자로 채움)
+BATCH_COMMANDS = {"play_card": 1, "buy_card": 1, "play_treasures": 0, "next_phase": 0, "end_turn": 0}
+
+
+_get_zones = operator.attrgetter(*ZONES)
+_get_stats = operator.attrgetter(*STATS)
+
+
+class _BatchLog:
+    """묶음 명령 동안 로그 레코드를 모아 두는 버퍼 (성공하면 한 번에 EventLog 로 옮김)"""
+    __slots__ = ("records", "next_seq")
+
+    def __init__(self, next_seq: int):
+        self.records: List[tuple] = []
+        self.next_seq = next_seq
+
+    def append(self, code: str, player_id: Optional[str], args: tuple = (), debug: bool = False) -> int:
+        self.records.append((code, player_id, args, debug))
+        self.next_seq += 1
+        return self.next_seq - 1
+
+
+class _RngGuard:
+    """덱 매니저가 처음 난수를 쓰기 직전에만 RNG 상태를 저장합니다 (셔플이 없는 묶음은 저장 비용이 없음)."""
+    __slots__ = ("rng", "saved")
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.saved = None
+
+    def shuffle(self, x) -> None:
+        if self.saved is None:
+            self.saved = self.rng.getstate()
+        self.rng.shuffle(x)
+
+    def randrange(self, *args) -> int:  # 장수 존(CountZone)의 뽑기
+        if self.saved is None:
+            self.saved = self.rng.getstate()
+        return self.rng.randrange(*args)
 
 
 # ──────────────────────────────────────────────────────────────
@@ -75,11 +186,136 @@ class GameState:
 class Engine:
     def __init__(self, game_state: GameState):
         self.state = game_state
+        self.cards = game_state.catalog.cards  # 이 게임에 고정된 카드 데이터 (이름 → 카드)
         # 플레이어별 덱 매니저 연결 (참조 전달)
         self.deck_managers = {
-            pid: DeckManager(self.state.players[pid]) 
+            pid: DeckManager(self.state.players[pid], self.state.rng)
             for pid in self.state.player_ids
         }
+        # 명령 단위 delta (소켓 계층은 delta_listeners 로 구독하거나 deltas_since 로 조회)
+        self._in_command = False
+        self._batching = False  # apply_batch 실행 중 (디버그 스냅샷은 끝에서 한 번만)
+        self._delta: Optional[DeltaBuilder] = None
+        self.deltas: deque = deque(maxlen=DELTA_HISTORY)
+        self.delta_listeners: List[Callable[[Dict[str, Any]], None]] = []
+        # 비용 순 마켓 인덱스 (legal_moves / AI 가 처음 쓸 때 생성, 재고가 0이 되면 갱신)
+        self._supply_index: Optional[CostIndex] = None
+        self._private_index: Dict[str, CostIndex] = {}
+        self._views: Optional[ViewCache] = None  # 플레이어별 가린 상태 (view() 를 처음 부를 때 생성)
+        if game_state.record_deltas:
+            # 기록이 꺼진 엔진(시뮬레이션 등)은 래퍼 호출 비용도 내지 않도록 인스턴스에만 씌웁니다.
+            for name, attr in COMMAND_METHODS.items():
+                setattr(self, attr, self._recorded(name, attr))
+
+    def _recorded(self, name: str, attr: str) -> Callable:
+        """
+        명령 메서드를 감쌉니다. 가장 바깥 호출에서만 DeltaBuilder 를 열고,
+        명령이 받아들여지면 버전을 올려 delta 를 발행합니다.
+        (명령 안에서 다른 명령을 부르면 바깥 명령의 delta 에 합쳐집니다.)
+        클래스 메서드는 호출할 때 찾으므로, 계측(metrics.enable) 이 나중에 바꿔 끼워도 따라갑니다.
+        """
+        cls = type(self)
+
+        @functools.wraps(getattr(cls, attr))
+        def wrapper(*args):
+            method = getattr(cls, attr)
+            if self._in_command:
+                return method(self, *args)
+            self._in_command = True
+            self._delta = DeltaBuilder(self.state)
+            try:
+                result = method(self, *args)
+            finally:
+                self._in_command = False
+                builder, self._delta = self._delta, None
+            if result is None or result[0]:
+                self._commit(name, args, builder)
+            return result
+        return wrapper
+
+    def _commit(self, name: str, args: tuple, builder: DeltaBuilder) -> None:
+        """받아들여진 명령 하나를 마무리합니다: 버전 증가 + delta 발행"""
+        state = self.state
+        state.version += 1
+        delta = builder.build(state.version, [name, *args])
+        self.deltas.append(delta)
+        for listener in self.delta_listeners:
+            listener(delta)
+
+    def deltas_since(self, version: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        version 이후의 delta 목록을 반환합니다.
+        이미 버려진 구간이 필요하면 None (클라이언트는 full_state 로 재동기화해야 함)
+        """
+        if version >= self.state.version:
+            return []
+        if not self.deltas or self.deltas[0]["v"] > version + 1:
+            return None
+        return list(itertools.islice(self.deltas, version + 1 - self.deltas[0]["v"], None))
+
+    def full_state(self) -> Dict[str, Any]:
+        """재동기화용 전체 상태 (덱은 장수만)"""
+        return full_state(self.state)
+
+    def view(self, viewer: Optional[str] = None) -> Dict[str, Any]:
+        """
+        viewer 에게 보낼 상태: 자기 손패만 공개, 남의 손패와 덱은 장수만 (viewer=None 이면 관전자).
+        delta 를 기록하는 엔진은 delta 가 건드린 부분만 다시 만들고, 돌려준 dict 는 공유되므로 고치면 안 됩니다.
+        """
+        if not self.state.record_deltas:
+            return redacted_state(self.state, viewer)
+        if self._views is None:
+            self._views = ViewCache(self)
+        return self._views.view(viewer)
+
+    def fork(self, rng: Optional[random.Random] = None) -> "Engine":
+        """GameState.fork() 위에 새 엔진을 붙입니다 (delta 래퍼 없이, 덱 매니저는 사본의 존을 가리킴)."""
+        return Engine(self.state.fork(rng))
+
+    # ──────────────────────────────────────────────────────────
+    # 가능한 수 (실패 메시지 없이 미리 계산)
+    # ──────────────────────────────────────────────────────────
+    def market_index(self, player_id: str) -> Tuple[CostIndex, CostIndex]:
+        """(플레이어 개인 마켓 인덱스, 공동 마켓 인덱스)"""
+        if self._supply_index is None:
+            self._supply_index = CostIndex(self.state.supply.items(), self.cards)
+        private = self._private_index.get(player_id)
+        if private is None:
+            private = CostIndex(self.state.players[player_id].private_market.items(), self.cards)
+            self._private_index[player_id] = private
+        return private, self._supply_index
+
+    def invalidate_market_index(self) -> None:
+        """마켓 재고를 엔진 밖에서 직접 고쳤다면 호출하세요 (다음 조회 때 다시 만듭니다)."""
+        self._supply_index = None
+        self._private_index.clear()
+
+    def legal_moves(self, player_id: str) -> LegalMoves:
+        """play_card / buy_card 가 지금 받아들일 카드 목록"""
+        state = self.state
+        if state.is_game_over or state.turn_owner != player_id or state.phase not in (Phase.ACTION, Phase.BUY):
+            return LegalMoves([], [])
+        player = state.players[player_id]
+
+        play = []
+        by_id = state.catalog.by_id
+        can_act = state.phase == Phase.ACTION and player.actions > 0
+        for card_id in dict.fromkeys(player.hand.ids):
+            card = by_id.get(card_id)
+            if card is not None and (card.card_type == "TREASURE" or (can_act and card.card_type == "ACTION")):
+                play.append(card.name)
+
+        buy = []
+        if state.phase == Phase.BUY and player.buys > 0:
+            private, supply = self.market_index(player_id)
+            stock, gold = player.private_market.stock, player.gold
+            # 인덱스는 엔진 안의 구매만 따라가므로 재고를 한 번 더 확인합니다.
+            buy = [CARD_NAMES[i] for i in private.affordable_ids(gold) if stock[i] > 0]
+            # 개인 마켓에 있는 카드는 (재고가 0이어도) 개인 마켓에서만 살 수 있습니다.
+            counts = state.supply
+            buy += [CARD_NAMES[i] for i in supply.affordable_ids(gold)
+                    if (i >= len(stock) or stock[i] < 0) and counts.get(CARD_NAMES[i], 0) > 0]
+        return LegalMoves(play, buy)
     # 플레이어 상대방 ID 반환
     def get_opponent_id(self, player_id: str) -> str:
         """현재 플레이어를 제외한 상대방의 ID를 반환합니다."""
@@ -87,42 +323,49 @@ class Engine:
         return [pid for pid in self.state.player_ids if pid != player_id][0]
     
     # [초기화] 게임 시작 세팅
-    def setup_game(self, player_classes: dict):
+    def setup_game(self, player_classes: dict = None):
         for pid in self.state.player_ids:
-            class_name = player_classes.get(pid, "Warrior") # 기본값은 전사
-            class_data = CLASS_DB.get(class_name)
+            class_name = (player_classes or {}).get(pid, "Warrior") # 기본값은 전사
+            class_data = self.state.catalog.classes.get(class_name)
+            self.state.player_classes[pid] = class_name
             
             p = self.state.players[pid]
             
             # 1. 스탯 초기화
-            p["hp"] = class_data["hp"]
-            p["gold"] = class_data["gold"]
-            p["actions"] = class_data["actions"]
-            p["private_market"] = class_data["private_market"].copy()
+            p.hp = class_data["hp"]
+            p.gold = class_data["gold"]
+            p.actions = class_data["actions"]
+            p["private_market"] = class_data["private_market"]  # Market으로 변환되며 복사됨
             
             # 2. 클래스별 초기 덱 구성
             # 기존에는 모두 똑같이 Copper 7, Estate 3이었지만 이제 클래스에 따라 다름
-            p["deck"] = class_data["initial_deck"].copy()
-            import random
-            random.shuffle(p["deck"])
+            p["deck"] = class_data["initial_deck"]
+            p.deck.shuffle(self.state.rng)
             
             # 3. 초기 핸드 드로우 (5장)
             self.draw_card(pid, 5)
 
-        self.log_success("SYSTEM", "각 플레이어의 클래스에 맞춰 초기 세팅이 완료되었습니다.")
+        self.invalidate_market_index()
+        self._log("SETUP_DONE", "SYSTEM")
 
 
+    def _log(self, code: str, player_id: str, *args, is_debug: bool = False) -> None:
+        """
+        이벤트 코드와 인자만 기록합니다 (문구는 event_log.EVENT_TEXT 로 읽을 때 렌더링).
+        꺼진 로그/디버그 전용 로그는 레코드조차 만들지 않습니다.
+        """
+        state = self.state
+        if not state.log_enabled or (is_debug and not state.debug):
+            return
+        state.logs.append(code, player_id, args, is_debug)
+
+        # 조건: 디버그 모드 ON + 자잘한 로그 아님 + 게임 셋업 완료 후(turn_count > 0)
+        if state.debug and not is_debug and state.turn_count > 0:
+            snapshot_type = "GAME_OVER_FINAL" if state.is_game_over else "EVENT_OCCURRED"
+            self._print_debug_snapshot(action_type=snapshot_type)
+
     def log_success(self, player_id: str, message: str, is_debug: bool = False) -> Tuple[bool, str]:
-        if not is_debug or self.state.debug:
-            prefix = "[Debug] " if is_debug else ""
-            self.state.logs.append(f"{prefix}✨ {player_id}: {message}")
-            
-            # 조건: 디버그 모드 ON + 자잘한 로그 아님 + 게임 셋업 완료 후(turn_count > 0)
-            if self.state.debug and not is_debug and self.state.turn_count > 0:
-                snapshot_type = "GAME_OVER_FINAL" if self.state.is_game_over else "EVENT_OCCURRED"
-                self._print_debug_snapshot(action_type=snapshot_type)
-                
-                
+        self._log("MSG", player_id, message, is_debug=is_debug)
         return True, "성공"
 
     def log_fail(self, player_id: str, message: str) -> Tuple[bool, str]:
@@ -130,7 +373,9 @@ class Engine:
         실패 사유를 로그에 남기고 (False, 에러메시지)를 반환합니다.
         실패는 수치 변화가 없으므로 스냅샷을 찍지 않습니다.
         """
-        self.state.logs.append(f"❌ {player_id}: {message}")
+        if not self.state.log_enabled:
+            return False, message
+        self.state.logs.append("FAIL", player_id, (message,))
         return False, message
 
         
@@ -138,7 +383,7 @@ class Engine:
     def play_card(self, player_id: str, card_name: str) -> Tuple[bool, str]:
         """플레이어가 핸드에서 카드를 클릭했을 때 실행되는 핵심 함수"""
         player = self.state.players[player_id]
-        card = CARD_DB.get(card_name)
+        card = self.cards.get(card_name)
         errors = []
 
         # ----------------------------------------------------------
@@ -148,7 +393,9 @@ class Engine:
         if self.state.turn_owner != player_id:
             errors.append("현재 본인의 턴이 아닙니다.")
         
-        if card_name not in player["hand"]:
+        card_id = CARD_IDS.get(card_name)
+        hand_ids = player.hand.ids
+        if card_id is None or card_id not in hand_ids:
             errors.append(f"손패에 {card_name} 카드가 없습니다.")
 
         if not card:
@@ -158,7 +405,7 @@ class Engine:
             if isinstance(card, ActionCard):
                 if self.state.phase != Phase.ACTION:
                     errors.append("액션 페이즈가 아닙니다.")
-                if player["actions"] <= 0:
+                if player.actions <= 0:
                     errors.append("사용 가능한 액션 횟수가 없습니다.")
             
             elif isinstance(card, TreasureCard):
@@ -183,19 +430,23 @@ class Engine:
 
         # 자원 차감 및 페이즈 전환
         if isinstance(card, ActionCard):
-            player["actions"] -= 1
+            player.actions -= 1
         elif isinstance(card, TreasureCard):
             if self.state.phase == Phase.ACTION:
                 self.state.phase = Phase.BUY
-                self.log_success(player_id, "재물을 사용하며 구매 페이즈로 전환합니다.", is_debug=True)
+                self._log("TREASURE_TO_BUY", player_id, is_debug=True)
         
 
-        self.log_success(player_id, f"{card_name} 카드를 사용합니다.")
+        self._log("CARD_PLAYING", player_id, card_name)
         # 효과 실행
-        player["hand"].remove(card_name)
-        self.deck_managers[player_id].add_to_play_mat(card_name)
+        hand_ids.remove(card_id)
+        player.play_mat.ids.append(card_id)
+        if self._delta is not None:
+            self._delta.move(player_id, "hand", "play_mat", [card_name])
         card.play(self, player_id) 
-        self.log_success(player_id, f"{card_name} 카드를 사용했습니다.")
+        self._log("CARD_PLAYED", player_id, card_name)
+        if self.state.actions is not None:
+            self.state.actions.append(("play_card", player_id, card_name))
 
 
 
@@ -207,26 +458,29 @@ class Engine:
     # [구매] 카드 구매 로직
     def buy_card(self, player_id: str, card_name: str) -> Tuple[bool, str]:
         player = self.state.players[player_id]
-        card = CARD_DB.get(card_name)
+        card = self.cards.get(card_name)
         errors = []
 
+        if self.state.turn_owner != player_id:
+            errors.append("현재 본인의 턴이 아닙니다.")
+
         if self.state.phase != Phase.BUY:
             errors.append("구매 페이즈가 아닙니다.")
         
-        if player["buys"] <= 0:
+        if player.buys <= 0:
             errors.append("남은 구매 횟수가 없습니다.")
         
         if not card:
             errors.append("존재하지 않는 카드입니다.")
-        elif player["gold"] < card.cost: # 카드가 있을 때만 가격 비교 가능
-            errors.append(f"골드가 부족합니다 (필요: {card.cost}, 보유: {player['gold']})")
+        elif player.gold < card.cost: # 카드가 있을 때만 가격 비교 가능
+            errors.append(f"골드가 부족합니다 (필요: {card.cost}, 보유: {player.gold})")
 
         # 마켓 및 재고 체크 (카드가 존재할 때만 실행)
         if card:
-            is_private = card_name in player["private_market"]
+            is_private = card_name in player.private_market
             is_common = card_name in self.state.supply
             
-            if is_private and player["private_market"][card_name] <= 0:
+            if is_private and player.private_market[card_name] <= 0:
                 errors.append(f"개인 마켓에 {card_name} 재고가 없습니다.")
             elif is_common and self.state.supply[card_name] <= 0:
                 errors.append(f"공동 마켓에 {card_name} 재고가 없습니다.")
@@ -238,16 +492,28 @@ class Engine:
             full_error_msg = " | ".join(errors) # "골드 부족 | 재고 없음" 식으로 합침
             return self.log_fail(player_id, full_error_msg)
         # 2. 처리 시작
-        player["buys"] -= 1
-        player["gold"] -= card.cost
+        player.buys -= 1
+        player.gold -= card.cost
 
-        # [수정 포인트] 여기서 return 하지 말고 로그 메시지만 변수에 담습니다.
+        # [수정 포인트] 여기서 return 하지 말고 로그 코드만 변수에 담습니다.
         if is_private:
-            player["private_market"][card_name] -= 1
-            log_msg = f"🎁 '개인 마켓'에서 {card_name}을(를) 구매했습니다."
+            player.private_market[card_name] -= 1
+            log_code = "BUY_PRIVATE"
+            if player.private_market[card_name] == 0 and player_id in self._private_index:
+                self._private_index[player_id].discard(card_name)
         else:
             self.state.supply[card_name] -= 1
-            log_msg = f"🛒 '공동 마켓'에서 {card_name}을(를) 구매했습니다."
+            log_code = "BUY_COMMON"
+            if self.state.supply[card_name] == 0 and self._supply_index is not None:
+                self._supply_index.discard(card_name)
+
+        if self._delta is not None:
+            if is_private:
+                self._delta.market(player_id, card_name, player.private_market[card_name])
+                self._delta.move(player_id, "private_market", "discard", [card_name])
+            else:
+                self._delta.supply(card_name, self.state.supply[card_name])
+                self._delta.move(player_id, "supply", "discard", [card_name])
 
         # 이제 이 아래 코드들이 정상적으로 실행됩니다!
         # 덱 매니저 처리
@@ -256,12 +522,15 @@ class Engine:
         # 승점 업데이트
         if card.card_type == "VICTORY":
             points = getattr(card, 'points', 0)
-            player["victory_points"] += points
+            player.victory_points += points
             # 승점 획득 상세 정보는 디버그 로그로 남기면 깔끔합니다.
-            self.log_success(player_id, f"승점 획득: +{points}", is_debug=True)
+            self._log("VP_GAIN", player_id, points, is_debug=True)
 
         # 3. 마지막에 한 번만 성공 리턴
-        return self.log_success(player_id, log_msg)
+        self._log(log_code, player_id, card_name)
+        if self.state.actions is not None:
+            self.state.actions.append(("buy_card", player_id, card_name))
+        return True, "성공"
     
 
     def _apply_stat_change(self, player_id: str, stat_name: str, amount: int, is_debug: bool = True):
@@ -269,50 +538,161 @@ class Engine:
         if amount == 0: return
         
         player = self.state.players[player_id]
-        player[stat_name] += amount
+        current = getattr(player, stat_name) + amount
+        setattr(player, stat_name, current)
         
-        # 아이콘 매핑
-        icons = {"buys": "🛒", "actions": "⚡", "gold": "💰", "mana": "🔮", "hp": "🩸"}
-        icon = icons.get(stat_name, "✨")
-        
-        # 우리가 만든 통합 로그 시스템 활용 (기본적으로 디버그 로그로 처리)
-        msg = f"{icon} {stat_name} {amount:+} (현재: {player[stat_name]})"
-        self.log_success(player_id, msg, is_debug=is_debug)
+        # 통합 로그 시스템 활용 (기본적으로 디버그 로그, 아이콘/문구는 읽을 때 렌더링)
+        self._log("STAT", player_id, stat_name, amount, current, is_debug=is_debug)
 
 
     # [페이즈] 다음 단계로 전환
     def next_phase(self) -> None:
         """유저가 '페이즈 종료' 버튼을 눌렀을 때 호출"""
+        if self.state.actions is not None:
+            self.state.actions.append(("next_phase",))
         if self.state.phase == Phase.ACTION:
             self.state.phase = Phase.BUY
-            self.log_success("SYSTEM", "➡️ 구매 페이즈로 넘어갑니다.")
+            self._log("PHASE_BUY", "SYSTEM")
         elif self.state.phase == Phase.BUY:
             # 구매 종료 시 정리 단계는 자동으로 수행 후 다음 플레이어 턴으로
-            self._end_turn()
+            self._cleanup_turn()
             self.state.phase = Phase.ACTION
 
-# [턴 종료] 내부 정리 로직
     def _end_turn(self) -> None:
+        """페이즈와 상관없이 바로 턴을 끝냅니다 (스크립트/테스트용 명령)"""
+        if self.state.actions is not None:
+            self.state.actions.append(("end_turn",))
+        self._cleanup_turn()
+
+    # [묶음] 한 번에 검증/적용하는 명령 목록
+    def apply_batch(self, player_id: str, commands: List[list]) -> Tuple[bool, str]:
+        """
+        [["play_treasures"], ["buy_card", "Silver"], ["next_phase"]] 같은 명령 목록을 순서대로 적용합니다.
+        하나라도 실패하면 전부 되돌리고 (False, "i번째 명령: 사유") 를 반환합니다 (all-or-nothing).
+          - 로그 레코드는 모아 두었다가 성공했을 때 한 번에 기록, 디버그 스냅샷도 끝에서 한 번
+          - delta 를 기록하는 엔진이면 묶음 전체가 delta 하나 (cmd = ["batch", player_id, commands])
+          - 액션 기록에는 개별 명령이 그대로 남으므로 리플레이는 그대로 동작합니다.
+        play_treasures 는 손패의 재물 카드를 모두 냅니다.
+        """
+        state = self.state
+        if state.is_game_over:
+            return self.log_fail(player_id, "게임이 이미 끝났습니다.")
+        if state.turn_owner != player_id:
+            return self.log_fail(player_id, "현재 본인의 턴이 아닙니다.")
+        for i, command in enumerate(commands):
+            if (not isinstance(command, (list, tuple)) or not command or not isinstance(command[0], str)
+                    or BATCH_COMMANDS.get(command[0]) != len(command) - 1):
+                return self.log_fail(player_id, f"{i + 1}번째 명령: 허용되지 않은 명령입니다: {command}")
+
+        checkpoint = self._checkpoint()
+        real_log = state.logs
+        buffer = _BatchLog(real_log.next_seq) if state.log_enabled else real_log  # 꺼진 로그는 쌓이지 않음
+        guards: Dict[int, _RngGuard] = {}  # 덱 매니저들이 같은 RNG 를 쓰면 가드도 하나
+        managers = list(self.deck_managers.values())
+        for manager in managers:
+            manager.rng = guards.setdefault(id(manager.rng), _RngGuard(manager.rng))
+        state.logs = buffer
+        self._batching = True
+        error = "예외"  # 중간에 예외가 나도 되돌리도록
+        try:
+            error = None
+            for i, (name, *args) in enumerate(commands):
+                if state.is_game_over:
+                    break  # 게임이 끝나면 남은 명령은 버리고 여기까지를 적용
+                error = self._batch_step(player_id, name, args)
+                if error is not None:
+                    error = f"{i + 1}번째 명령: {error}"
+                    break
+        finally:
+            self._batching = False
+            state.logs = real_log
+            for manager in managers:
+                manager.rng = manager.rng.rng
+            if error is not None:
+                self._restore(checkpoint, [(g.rng, g.saved) for g in guards.values() if g.saved is not None])
+
+        if error is not None:
+            return self.log_fail(player_id, error)
+        if buffer is not real_log:
+            for record in buffer.records:
+                real_log.append(*record)
+            if state.debug:
+                self._print_debug_snapshot(action_type="BATCH")
+        return True, "성공"
+
+    def _batch_step(self, player_id: str, name: str, args: list) -> Optional[str]:
+        """명령 하나를 실행하고, 실패하면 사유를 반환합니다."""
+        state = self.state
+        if state.turn_owner != player_id:
+            return "현재 본인의 턴이 아닙니다."
+        if name == "play_treasures":
+            hand = state.players[player_id].hand
+            for card_name in [c for c in hand if getattr(self.cards.get(c), "card_type", None) == "TREASURE"]:
+                ok, message = self.play_card(player_id, card_name)
+                if not ok:
+                    return message
+            return None
+        if name == "next_phase":
+            self.next_phase()
+            return None
+        if name == "end_turn":
+            self._end_turn()
+            return None
+        ok, message = getattr(self, name)(player_id, *args)
+        return None if ok else message
+
+    def _checkpoint(self) -> tuple:
+        """묶음 명령이 실패했을 때 되돌릴 상태 (존은 memcpy, 개인 마켓은 copy-on-write 사본)"""
+        state = self.state
+        players = [(p, [zone.fork() for zone in _get_zones(p)], _get_stats(p), p.private_market.fork())
+                   for p in state.players.values()]
+        game = (state.phase, state.turn_count, state.turn_owner, state.is_game_over, state.winner)
+        actions = None if state.actions is None else len(state.actions)
+        return players, dict(state.supply), game, actions
+
+    def _restore(self, checkpoint: tuple, rng_states: List[tuple]) -> None:
+        state = self.state
+        players, supply, game, actions = checkpoint
+        for p, zones, stats, market in players:
+            for name, zone in zip(ZONES, zones):
+                setattr(p, name, zone)
+            for stat, value in zip(STATS, stats):
+                setattr(p, stat, value)
+            p.private_market = market
+        state.supply = supply
+        state.phase, state.turn_count, state.turn_owner, state.is_game_over, state.winner = game
+        if actions is not None:
+            del state.actions[actions:]
+        for rng, saved in rng_states:
+            rng.setstate(saved)
+        self.invalidate_market_index()
+
+# [턴 종료] 내부 정리 로직
+    def _cleanup_turn(self) -> None:
         pid = self.state.turn_owner
         player = self.state.players[pid]
         
         # 1. 정리(Clean-up) 시작 알림
-        # log_success를 사용하면 스냅샷이 찍히므로, 정리 전 상태를 볼 수 있습니다.
-        self.log_success("SYSTEM", f"🧹 {pid}님의 필드와 손패를 정리합니다.")
+        # 디버그 로그가 아니므로 스냅샷이 찍혀, 정리 전 상태를 볼 수 있습니다.
+        self._log("CLEANUP", "SYSTEM", pid)
         
         # 2. 카드 이동 (Play Mat + Hand -> Discard)
-        # 이번 턴에 사용한 카드와 남은 손패를 리스트로 합칩니다.
-        all_to_discard = list(player["play_mat"]) + list(player["hand"])
-        
-        if all_to_discard:
-            self.deck_managers[pid].discard_pile(all_to_discard)
+        # 이번 턴에 사용한 카드, 남은 손패 순서로 버림패에 쌓습니다.
+        deck_manager = self.deck_managers[pid]
+        if self._delta is not None:
+            if player.play_mat.ids:
+                self._delta.move(pid, "play_mat", "discard", list(player.play_mat))
+            if player.hand.ids:
+                self._delta.move(pid, "hand", "discard", list(player.hand))
+        deck_manager.discard_pile(player.play_mat)
+        deck_manager.discard_pile(player.hand)
         
         # 3. 공간 및 자원 초기화
-        player["play_mat"] = []
-        player["hand"] = []
-        player["actions"] = 1
-        player["buys"] = 1
-        player["gold"] = 0
+        player.play_mat.clear()
+        player.hand.clear()
+        player.actions = 1
+        player.buys = 1
+        player.gold = 0
         
         # 4. 새 카드 드로우 (5장)
         self.draw_card(pid, 5)
@@ -334,36 +714,41 @@ class Engine:
         self.state.phase = Phase.ACTION
 
         # 7. 다음 턴 시작 알림
-        self.log_success("SYSTEM", f"=== 턴 {self.state.turn_count}: {self.state.turn_owner}의 차례 ===")
+        self._log("TURN_START", "SYSTEM", self.state.turn_count, self.state.turn_owner)
 
     # [드로우] 로그 출력을 포함한 드로우 대행 (카드 효과 등에서 호출)
     def draw_card(self, player_id: str, count: int = 1) -> None:
-        actual_drawn = self.deck_managers[player_id].draw(count)
+        delta = self._delta
+        if delta is None:
+            actual_drawn = self.deck_managers[player_id].draw(count)
+        else:
+            player = self.state.players[player_id]
+            discard_before = len(player.discard)
+            actual_drawn = self.deck_managers[player_id].draw(count)
+            if discard_before and len(player.discard) < discard_before:
+                delta.move(player_id, "discard", "deck", discard_before)  # 셔플: 순서 비공개, 장수만
+            if actual_drawn > 0:
+                delta.move(player_id, "deck", "hand", [CARD_NAMES[i] for i in player.hand.ids[-actual_drawn:]])
         if actual_drawn > 0:
-            self.log_success(player_id, f"🎴 {actual_drawn}장의 카드를 뽑았습니다.", is_debug=False)
+            self._log("DRAW", player_id, actual_drawn)
 
     def apply_hp_change(self, target_id: str, amount: int):
         target = self.state.players[target_id]
         
         # 1. 수치 변경
-        target["hp"] += amount 
-        
-        # 2. 로그 메시지 구성
-        action_type = "회복" if amount > 0 else "데미지를 입"
-        msg = f"🩸 {abs(amount)}만큼 {action_type}었습니다. (남은 HP: {target['hp']})"
+        target.hp += amount
         
-        # 3. [변경] append 대신 log_success 호출 (자동 스냅샷 트리거)
-        self.log_success(target_id, msg)
+        # 2. 로그 기록 (자동 스냅샷 트리거, 문구는 읽을 때 렌더링)
+        self._log("HP", target_id, amount, target.hp)
 
         # 4. 사망 판정
-        if target["hp"] <= 0:
+        if target.hp <= 0:
             self.state.is_game_over = True
             winner_id = self.get_opponent_id(target_id)
             self.state.winner = winner_id
             
-            # [변경] 사망 로그도 log_success로 기록하여 최종 상태 스냅샷 남기기
-            death_msg = f"💀 체력이 0이 되어 사망했습니다! 최종 승자: {winner_id}"
-            self.log_success(target_id, death_msg)
+            # [변경] 사망 로그도 일반 로그로 기록하여 최종 상태 스냅샷 남기기
+            self._log("DEATH", target_id, winner_id)
 
 
     def apply_damage(self, opponent_id: str, damage: int):
@@ -374,65 +759,39 @@ class Engine:
         """로그를 추가하는 내부 메서드. 개발자 모드일 때만 상세 로그를 남깁니다."""
         if is_debug and not self.state.debug:
             return  # 디버그 로그인데 개발자 모드가 아니면 무시
-        self.state.logs.append(message)
+        if self.state.log_enabled:
+            self.state.logs.append("RAW", None, (message,), is_debug)
     
     def _print_debug_snapshot(self, action_type: str = "STATE"):
         """
-        현재 게임의 모든 물리적 수치와 논리적 상태를 시각적으로 출력합니다.
-        데이터가 없는 경우에도 안전하게 처리하여 에러를 방지합니다.
+        디버그 스냅샷을 로그에 남깁니다.
+          - "diff" 모드(기본): 직전 스냅샷 이후 바뀐 필드만 SNAPSHOT_DIFF 레코드로 기록
+          - "full" 모드: 모든 플레이어/마켓의 원시 값을 통째로 SNAPSHOT 레코드로 기록
+        어느 쪽이든 문자열은 로그를 읽을 때 만들어집니다. 전체 상태는 debug_snapshot()으로 복원합니다.
         """
-        if not self.state.debug:
+        if not (self.state.debug and self.state.log_enabled) or self._batching:
             return
 
-        lines = [f"\n🔍 [DEBUG SNAPSHOT: {action_type}] {'='*40}"]
+        state = self.state
+        if state.snapshot_mode == "diff":
+            if state.snapshots is None:
+                state.snapshots = SnapshotTracker()
+            diff = state.snapshots.capture(state.logs.next_seq, state)
+            if diff:
+                state.logs.append("SNAPSHOT_DIFF", None, (action_type, diff), True)
+            return
 
-        for pid in self.state.player_ids:
-            # [핵심] 플레이어 객체가 없거나 불완전해도 죽지 않도록 방어
-            p = self.state.players.get(pid)
-            if not p: continue 
-
-            # 모든 필드를 .get(키, 기본값)으로 가져옵니다.
-            hp = p.get("hp", 0)
-            gold = p.get("gold", 0)
-            mana = p.get("mana", 0)
-            actions = p.get("actions", 1)
-            buys = p.get("buys", 1)
-            vp = p.get("victory_points", 0)
-            
-            # 리스트 데이터 안전하게 가져오기
-            hand = p.get("hand", [])
-            play_mat = p.get("play_mat", [])
-            deck = p.get("deck", [])
-            discard = p.get("discard", [])
+        state.logs.append("SNAPSHOT", None, (action_type, capture_full(state)), True)
 
-            turn_mark = "▶️ " if self.state.turn_owner == pid else "   "
-            
-            lines.append(f"{turn_mark}PLAYER: {pid}")
-            lines.append(f"   ❤️  HP: {hp:<3} | 💰 GOLD: {gold:<3} | ⚡ ACT: {actions:<3} | 🛒 BUY: {buys:<3}")
-            lines.append(f"   🏆 VP: {vp:<3} | 🔮 MANA: {mana:<3}")
-            
-            # 핸드 출력 (리스트가 확실하므로 안전함)
-            hand_str = ', '.join(hand) if hand else 'Empty'
-            lines.append(f"   🃏 HAND ({len(hand)}): {hand_str}")
-            
-            # 플레이매트 출력
-            mat_str = ', '.join(play_mat) if play_mat else 'Empty'
-            lines.append(f"   🎭 PLAY MAT: {mat_str}")
-            
-            lines.append(f"   📚 DECK: {len(deck):<2} | 🗑️  DISCARD: {len(discard):<2}")
-            
-            # 개인 마켓
-            private_market = p.get("private_market", {})
-            if private_market:
-                market_items = [f"{k}({v})" for k, v in private_market.items()]
-                lines.append(f"   🎁 PRIVATE MARKET: {', '.join(market_items)}")
-            lines.append("-" * 50)
-
-        # 공동 마켓
-        supply_items = [f"{k}:{v}" for k, v in self.state.supply.items() if v > 0]
-        lines.append(f"🏪 COMMON SUPPLY: {', '.join(supply_items)}")
-        
-        lines.append(f"🚩 PHASE: {self.state.phase.name} | TURN: {self.state.turn_count} | OVER: {self.state.is_game_over}")
-        lines.append("=" * 65 + "\n")
-
-        self.state.logs.append("\n".join(lines))
\ No newline at end of file
+    def debug_snapshot(self, seq: Optional[int] = None, action_type: str = "STATE") -> str:
+        """
+        전체 스냅샷 문자열을 만듭니다.
+        seq 를 주면 그 로그 일련번호 시점(마지막 diff 스냅샷 기준)의 상태를 키프레임 + diff 로 복원합니다.
+        """
+        state = self.state
+        if seq is None:
+            return render_snapshot(action_type, capture_full(state))
+        if state.snapshots is None:
+            raise ValueError("기록된 diff 스냅샷이 없습니다. (debug=True, snapshot_mode='diff' 필요)")
+        full = state.snapshots.rebuild(seq)
+        return render_snapshot(action_type, to_snapshot_tuple(full, state.player_ids))
@@ -0,0 +1,294 @@
+# 구조화 이벤트 로그 (링 버퍼 + 지연 렌더링) logic
+
+# project-root/backend/app/core/event_log.py
+import asyncio
+import itertools
+import json
+from array import array
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from .card import CARD_NAMES
+from .snapshot import render_diff
+
+DEFAULT_LOG_CAPACITY = 10000  # 한 게임이 메모리에 들고 있는 최대 로그 개수
+
+
+class LogRecord(NamedTuple):
+    seq: int             # 게임 내 일련번호 (0부터 단조 증가)
+    code: str            # 이벤트 코드 (EVENT_TEXT 의 키)
+    player_id: Optional[str]
+    args: Tuple[Any, ...]
+    debug: bool = False  # 디버그 전용 로그 여부
+
+
+class LogPage(NamedTuple):
+    records: List[LogRecord]
+    cursor: int   # 다음 조회에 넘길 커서 (= 이번에 살펴본 마지막 seq + 1)
+    missed: int   # 커서 이후인데 이미 버퍼에서 밀려나 돌려주지 못한 레코드 수 (spilled_records 로 읽을 수 있음)
+    more: bool    # limit 에 걸려 아직 남은 레코드가 있는지
+
+
+# ──────────────────────────────────────────────────────────────
+# 1️⃣ 이벤트 코드 → 문구
+#    문자열은 str.format(*args), 함수는 fn(*args) 로 렌더링합니다.
+# ──────────────────────────────────────────────────────────────
+STAT_ICONS = {"buys": "🛒", "actions": "⚡", "gold": "💰", "mana": "🔮", "hp": "🩸"}
+
+
+def _render_stat(stat_name: str, amount: int, current: int) -> str:
+    return f"{STAT_ICONS.get(stat_name, '✨')} {stat_name} {amount:+} (현재: {current})"
+
+
+def _render_hp(amount: int, current: int) -> str:
+    action_type = "회복" if amount > 0 else "데미지를 입"
+    return f"🩸 {abs(amount)}만큼 {action_type}었습니다. (남은 HP: {current})"
+
+
+def _names(ids) -> List[str]:
+    return [CARD_NAMES[i] for i in bytes(ids)]
+
+
+def render_snapshot(action_type: str, snapshot: tuple) -> str:
+    """capture 시점의 원시 값 튜플로부터 디버그 스냅샷 문자열을 만듭니다."""
+    players, supply, phase_name, turn_count, is_game_over = snapshot
+    lines = [f"\n🔍 [DEBUG SNAPSHOT: {action_type}] {'='*40}"]
+
+    for (pid, is_turn_owner, hp, gold, mana, actions, buys, vp,
+         hand, play_mat, deck_len, discard_len, market) in players:
+        hand = _names(hand)
+        play_mat = _names(play_mat)
+        turn_mark = "▶️ " if is_turn_owner else "   "
+
+        lines.append(f"{turn_mark}PLAYER: {pid}")
+        lines.append(f"   ❤️  HP: {hp:<3} | 💰 GOLD: {gold:<3} | ⚡ ACT: {actions:<3} | 🛒 BUY: {buys:<3}")
+        lines.append(f"   🏆 VP: {vp:<3} | 🔮 MANA: {mana:<3}")
+
+        hand_str = ', '.join(hand) if hand else 'Empty'
+        lines.append(f"   🃏 HAND ({len(hand)}): {hand_str}")
+
+        mat_str = ', '.join(play_mat) if play_mat else 'Empty'
+        lines.append(f"   🎭 PLAY MAT: {mat_str}")
+
+        lines.append(f"   📚 DECK: {deck_len:<2} | 🗑️  DISCARD: {discard_len:<2}")
+
+        stock = array("h")
+        stock.frombytes(bytes(market))
+        market_items = [f"{CARD_NAMES[i]}({n})" for i, n in enumerate(stock) if n >= 0]
+        if market_items:
+            lines.append(f"   🎁 PRIVATE MARKET: {', '.join(market_items)}")
+        lines.append("-" * 50)
+
+    supply_items = [f"{k}:{v}" for k, v in supply if v > 0]
+    lines.append(f"🏪 COMMON SUPPLY: {', '.join(supply_items)}")
+
+    lines.append(f"🚩 PHASE: {phase_name} | TURN: {turn_count} | OVER: {is_game_over}")
+    lines.append("=" * 65 + "\n")
+    return "\n".join(lines)
+
+
+EVENT_TEXT: Dict[str, Union[str, Callable[..., str]]] = {
+    "MSG": "{0}",    # log_success 로 전달된 자유 문구
+    "RAW": "{0}",    # 접두어 없이 그대로 남기는 문구 (debug_log)
+    "FAIL": "{0}",   # 검증 실패 사유 (" | " 로 합쳐진 문자열)
+    "SETUP_DONE": "각 플레이어의 클래스에 맞춰 초기 세팅이 완료되었습니다.",
+    "TREASURE_TO_BUY": "재물을 사용하며 구매 페이즈로 전환합니다.",
+    "CARD_PLAYING": "{0} 카드를 사용합니다.",
+    "CARD_PLAYED": "{0} 카드를 사용했습니다.",
+    "BUY_PRIVATE": "🎁 '개인 마켓'에서 {0}을(를) 구매했습니다.",
+    "BUY_COMMON": "🛒 '공동 마켓'에서 {0}을(를) 구매했습니다.",
+    "VP_GAIN": "승점 획득: +{0}",
+    "STAT": _render_stat,
+    "PHASE_BUY": "➡️ 구매 페이즈로 넘어갑니다.",
+    "CLEANUP": "🧹 {0}님의 필드와 손패를 정리합니다.",
+    "TURN_START": "=== 턴 {0}: {1}의 차례 ===",
+    "DRAW": "🎴 {0}장의 카드를 뽑았습니다.",
+    "HP": _render_hp,
+    "DEATH": "💀 체력이 0이 되어 사망했습니다! 최종 승자: {0}",
+    "SNAPSHOT": render_snapshot,
+    "SNAPSHOT_DIFF": render_diff,
+}
+
+_UNPREFIXED = frozenset({"RAW", "SNAPSHOT", "SNAPSHOT_DIFF"})
+
+
+def render(record: LogRecord) -> str:
+    """레코드를 사람이 읽는 한 줄(또는 여러 줄) 문자열로 변환합니다."""
+    template = EVENT_TEXT[record.code]
+    text = template(*record.args) if callable(template) else template.format(*record.args)
+
+    if record.code in _UNPREFIXED:
+        return text
+    if record.code == "FAIL":
+        return f"❌ {record.player_id}: {text}"
+    prefix = "[Debug] " if record.debug else ""
+    return f"{prefix}✨ {record.player_id}: {text}"
+
+
+def _json_default(value):
+    if isinstance(value, (bytes, bytearray, array)):
+        return list(bytes(value))
+    if isinstance(value, (tuple, set, frozenset)):
+        return list(value)
+    raise TypeError(f"{type(value).__name__} 은(는) 로그로 저장할 수 없습니다.")
+
+
+# ──────────────────────────────────────────────────────────────
+# 2️⃣ 링 버퍼 로그
+# ──────────────────────────────────────────────────────────────
+class EventLog:
+    """
+    게임 로그 저장소. 문자열 대신 LogRecord 를 최대 capacity 개까지 보관하고,
+    넘치는 오래된 레코드는 버리거나(spill_path 지정 시) JSON Lines 파일로 내보냅니다.
+    문구는 읽는 시점(for log in state.logs, state.logs[i])에만 만들어집니다.
+
+    클라이언트(재접속, 로그 뷰어)는 전체를 다시 읽지 않고 커서로 새 레코드만 받습니다.
+      - since(cursor, limit): cursor 이후 레코드 한 페이지 (버퍼에서 가까운 쪽 끝부터 찾으므로 새 레코드 수에 비례)
+      - follow(cursor): 새 레코드가 생길 때마다 페이지를 내보내는 async 구독
+    """
+
+    def __init__(self, capacity: Optional[int] = DEFAULT_LOG_CAPACITY, spill_path: Optional[str] = None):
+        # 내부 저장은 (seq, code, player_id, args, debug) 일반 튜플 (LogRecord 생성 비용 절약)
+        self._records: deque = deque(maxlen=capacity)
+        self.capacity = capacity
+        self.spill_path = spill_path
+        self._spill_file = None
+        self.next_seq = 0  # 다음 레코드에 붙을 일련번호
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []  # follow() 로 기다리는 구독자
+
+    @property
+    def dropped(self) -> int:
+        """버퍼에서 밀려난 레코드 수 (일련번호가 연속이므로 계산으로 구함)"""
+        return self.next_seq - len(self._records)
+
+    def append(self, code: str, player_id: Optional[str], args: tuple = (), debug: bool = False) -> int:
+        """레코드를 추가하고 그 일련번호를 반환합니다. 문자열 포매팅은 하지 않습니다."""
+        records = self._records
+        if self.spill_path is not None and len(records) == self.capacity:
+            self._spill(records[0])
+        seq = self.next_seq
+        records.append((seq, code, player_id, args, debug))
+        self.next_seq = seq + 1
+        if self._waiters:
+            self._notify()
+        return seq
+
+    def _spill(self, record: tuple) -> None:
+        record = LogRecord._make(record)
+        if self._spill_file is None:
+            self._spill_file = open(self.spill_path, "a", encoding="utf-8")
+        self._spill_file.write(json.dumps(record._asdict(), ensure_ascii=False, default=_json_default) + "\n")
+
+    def close(self) -> None:
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
+    # --- 조회 ---
+    def records(self) -> Iterator[LogRecord]:
+        """버퍼에 남아 있는 원시 레코드"""
+        return map(LogRecord._make, self._records)
+
+    def since(self, cursor: int = 0, limit: Optional[int] = None, debug: bool = True) -> LogPage:
+        """
+        seq 가 cursor 이상인 레코드를 최대 limit 개 돌려줍니다. debug=False 면 디버그 전용 레코드(스냅샷 등)는 건너뜁니다.
+        다음 페이지는 돌려받은 page.cursor 로 조회합니다.
+        """
+        records = self._records
+        first = self.next_seq - len(records)
+        cursor = min(max(cursor, 0), self.next_seq)
+        missed = max(first - cursor, 0)
+        index = max(cursor, first) - first
+        if index * 2 <= len(records):
+            pending = itertools.islice(records, index, None)
+        else:  # 끝에 가까우면 뒤에서부터 새 레코드만 꺼냄
+            pending = list(itertools.islice(reversed(records), len(records) - index))
+            pending.reverse()
+
+        page: List[LogRecord] = []
+        end = max(cursor, first)
+        for record in pending:
+            if limit is not None and len(page) >= limit:
+                break
+            end = record[0] + 1
+            if debug or not record[4]:
+                page.append(LogRecord._make(record))
+        return LogPage(page, end, missed, end < self.next_seq)
+
+    async def follow(self, cursor: int = 0, limit: Optional[int] = None,
+                     debug: bool = True) -> AsyncIterator[LogPage]:
+        """
+        cursor 이후 레코드를 페이지로 계속 내보냅니다. 따라잡으면 append 될 때까지 기다립니다 (폴링 없음).
+        다른 스레드에서 append 해도 구독자의 이벤트 루프에서 깨어납니다.
+        limit 은 1 이상이어야 합니다 (0 이면 커서가 나아가지 않아 끝없이 돕니다).
+        """
+        if limit is not None and limit < 1:
+            raise ValueError(f"limit 은 1 이상이어야 합니다: {limit}")
+        while True:
+            page = self.since(cursor, limit, debug)
+            cursor = page.cursor
+            if page.records or page.missed:
+                yield page
+            elif cursor >= self.next_seq:
+                await self._wait(cursor)
+
+    async def _wait(self, cursor: int) -> None:
+        loop = asyncio.get_running_loop()
+        waiter = (loop, loop.create_future())
+        self._waiters.append(waiter)  # 등록한 뒤에 다시 확인해야 다른 스레드의 append 를 놓치지 않음
+        try:
+            if self.next_seq <= cursor:
+                await waiter[1]
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def _notify(self) -> None:
+        waiters, self._waiters = self._waiters, []
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_wake, future)
+
+    def spilled_records(self) -> Iterator[LogRecord]:
+        """디스크로 내보낸 레코드를 다시 읽어옵니다."""
+        if self.spill_path is None:
+            return
+        if self._spill_file is not None:
+            self._spill_file.flush()
+        try:
+            with open(self.spill_path, encoding="utf-8") as f:
+                for line in f:
+                    d = json.loads(line)
+                    yield LogRecord(d["seq"], d["code"], d["player_id"], tuple(d["args"]), d["debug"])
+        except FileNotFoundError:
+            return
+
+    # --- 기존 List[str] 와 같은 읽기 인터페이스 (읽을 때 렌더링) ---
+    def __iter__(self) -> Iterator[str]:
+        return map(render, self.records())
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [render(LogRecord._make(r)) for r in list(self._records)[index]]
+        return render(LogRecord._make(self._records[index]))
+
+    def __bool__(self) -> bool:
+        return bool(self._records)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def clear(self) -> None:
+        self._records.clear()
+
+    def __repr__(self) -> str:
+        return f"EventLog(len={len(self)}, next_seq={self.next_seq}, dropped={self.dropped})"
+
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
@@ -0,0 +1,318 @@
+# 방 명령 선행 기록(WAL) / 크래시 복구 logic
+
+# project-root/backend/app/core/journal.py
+#
+# 방마다 추가 전용 저널 파일 하나 (<디렉터리>/<방 ID>.wal, JSON Lines)
+#   1행: 헤더 {"format", "room_id", "seed", "player_ids", "classes", "catalog": [version, digest], "options"}
+#   이후: 받아들여진 매니저 명령 하나당 한 줄 {"v": 상태 버전, "a": [["play_card", "User_A", "Village"], ...]}
+#         (a 는 GameState.actions 에 새로 붙은 항목. apply_batch 는 한 줄이므로 잘린 줄을 버리면 배치 전체가 빠짐)
+#
+# 기록은 GameState.actions 의 새 항목만 메모리 버퍼에 붙이고(명령 처리 스레드 비용은 리스트 슬라이스),
+# 플러셔 스레드가 fsync_interval 마다 모든 방의 버퍼를 한꺼번에 쓰고 fsync 합니다 (그룹 커밋).
+# 클릭마다 fsync 하지 않는 대신 크래시 시 최대 fsync_interval 만큼의 명령을 잃을 수 있습니다.
+# 꼭 디스크에 닿은 뒤 응답해야 하는 곳은 record() 가 돌려준 번호로 wait_durable() 하면 됩니다.
+#
+# 복구는 저널마다 (시드 + 클래스 + 명령 목록) 을 리플레이해 GameState 를 다시 만듭니다.
+# 방끼리는 독립이므로 프로세스 풀에서 병렬로 리플레이하고, 결과는 persist 바이너리로 받아옵니다.
+# 리플레이는 헤더의 카탈로그로 합니다. 이 프로세스가 모르는 카탈로그면 그 방은 실패로 남깁니다 (새 카드로 바꾸지 않음).
+import json
+import os
+import threading
+from concurrent.futures import BrokenExecutor, Executor, Future, ProcessPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import quote
+
+from . import persist
+from .card import find_catalog
+from .engine import GameState
+from .replay import replay
+
+JOURNAL_FORMAT = 2  # v2: 헤더에 카탈로그 (version, digest)
+SUFFIX = ".wal"
+
+# 리플레이할 때 끄는 옵션 (상태에는 영향이 없고 느리기만 함). 복원할 때 원래 값으로 되돌립니다.
+_REPLAY_OVERRIDES = {"debug": False, "log_enabled": False}
+
+
+class JournalError(RuntimeError):
+    """저널을 쓸 수 없는 방 (액션 기록이 꺼져 있음 등)"""
+
+
+def _encode(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+# ──────────────────────────────────────────────────────────────
+# 1️⃣ 기록 (그룹 커밋)
+# ──────────────────────────────────────────────────────────────
+class Journal:
+    """
+    GameManager(journal=...) 에 넘기면 방 생성/명령/삭제 때 자동으로 기록합니다.
+    fsync_interval=None 이면 플러셔 스레드 없이 commit() 을 직접 부를 때만 씁니다 (테스트/도구용).
+    """
+
+    def __init__(self, directory: str, fsync_interval: Optional[float] = 0.05, fsync: bool = True):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.fsync_interval = fsync_interval
+        self.fsync = fsync
+        self._lock = threading.Lock()                 # 버퍼/커서 (명령 처리 스레드와 공유, 짧게만 잡음)
+        self._commit_lock = threading.Lock()          # 파일 쓰기 직렬화 (잠금 순서: _commit_lock → _lock)
+        self._durable_changed = threading.Condition(self._lock)
+        self._pending: Dict[str, List[Any]] = {}      # 방 ID → 아직 안 쓴 줄 (헤더 dict 또는 {"v", "a"})
+        self._cursors: Dict[str, int] = {}            # 방 ID → 기록한 actions 개수
+        self._files: Dict[str, Any] = {}
+        self._seq = 0                                 # 지금까지 record/open 한 횟수
+        self._durable = 0                             # 디스크에 닿은 마지막 번호
+        self.commits = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if fsync_interval is not None:
+            self._thread = threading.Thread(target=self._run, name="journal-flusher", daemon=True)
+            self._thread.start()
+
+    def path(self, room_id: str) -> str:
+        return os.path.join(self.directory, quote(room_id, safe="") + SUFFIX)
+
+    def open(self, room_id: str, state: GameState, options: Optional[Dict[str, Any]] = None) -> int:
+        """새 방의 헤더와 (이미 있다면) 지금까지의 명령을 기록합니다. setup_game 을 마친 상태를 넘기세요."""
+        if state.actions is None:
+            raise JournalError(f"액션 기록이 꺼진 방은 저널에 남길 수 없습니다: {room_id}")
+        options = {k: v for k, v in (options or {}).items() if k != "seed"}
+        header = {"format": JOURNAL_FORMAT, "room_id": room_id, "seed": state.seed,
+                  "player_ids": list(state.player_ids), "classes": dict(state.player_classes),
+                  "catalog": [state.catalog.version, state.catalog.digest], "options": options}
+        _encode(header)  # 직렬화할 수 없는 옵션이면 여기서 바로 실패
+        with self._lock:
+            self._cursors[room_id] = 0
+            self._pending[room_id] = [header]
+            self._seq += 1
+        return self.record(room_id, state)
+
+    def resume(self, room_id: str, state: GameState) -> None:
+        """복구한 방을 이어서 기록합니다 (파일에는 이미 state.actions 까지 들어 있음)."""
+        if state.actions is None:
+            raise JournalError(f"액션 기록이 꺼진 방은 저널에 남길 수 없습니다: {room_id}")
+        with self._lock:
+            self._cursors[room_id] = len(state.actions)
+
+    def record(self, room_id: str, state: GameState) -> int:
+        """state.actions 중 아직 기록하지 않은 항목을 한 줄로 버퍼에 붙이고 그 순번을 반환합니다 (디스크 쓰기는 나중에)."""
+        actions = state.actions
+        with self._lock:
+            cursor = self._cursors.get(room_id)
+            if cursor is None:
+                return self._seq  # 저널에 없는 방 (open 전 / discard 후)
+            if len(actions) > cursor:
+                self._pending.setdefault(room_id, []).append({"v": state.version, "a": actions[cursor:]})
+                self._cursors[room_id] = len(actions)
+                self._seq += 1
+            return self._seq
+
+    def discard(self, room_id: str) -> None:
+        """방이 사라졌으므로 저널도 지웁니다 (복구 대상에서 빠짐)."""
+        with self._commit_lock:
+            with self._lock:
+                self._cursors.pop(room_id, None)
+                self._pending.pop(room_id, None)
+            f = self._files.pop(room_id, None)
+            if f is not None:
+                f.close()
+            try:
+                os.remove(self.path(room_id))
+            except FileNotFoundError:
+                pass
+
+    # ──────────────────────────────────────────────────────────
+    # 커밋
+    # ──────────────────────────────────────────────────────────
+    def commit(self) -> int:
+        """밀린 기록을 모든 방 파일에 쓰고 fsync 합니다. 디스크에 닿은 마지막 순번을 반환합니다."""
+        with self._commit_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                seq = self._seq
+            created = False
+            touched = []
+            for room_id, items in batch.items():
+                f = self._files.get(room_id)
+                if f is None:
+                    path = self.path(room_id)
+                    created = created or not os.path.exists(path)
+                    f = self._files[room_id] = open(path, "a", encoding="utf-8")
+                f.write("".join(map(_encode, items)))
+                f.flush()
+                touched.append(f)
+            if self.fsync:
+                for f in touched:
+                    os.fsync(f.fileno())
+                if created:
+                    _fsync_directory(self.directory)
+            if batch:
+                self.commits += 1
+            with self._lock:
+                self._durable = max(self._durable, seq)
+                self._durable_changed.notify_all()
+            return seq
+
+    @property
+    def last_seq(self) -> int:
+        """마지막으로 버퍼에 붙인 기록의 순번 (wait_durable 에 넘길 값)"""
+        return self._seq
+
+    def wait_durable(self, seq: int, timeout: Optional[float] = None) -> bool:
+        """순번 seq 까지 디스크에 닿을 때까지 기다립니다. (플러셔 스레드가 없으면 직접 commit)"""
+        if self._thread is None:
+            self.commit()
+        with self._lock:
+            return self._durable_changed.wait_for(lambda: self._durable >= seq, timeout)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.fsync_interval):
+            self.commit()
+
+    def close(self) -> None:
+        """플러셔를 멈추고 남은 기록을 모두 쓴 뒤 파일을 닫습니다."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.commit()
+        with self._commit_lock:
+            for f in self._files.values():
+                f.close()
+            self._files.clear()
+
+    def __enter__(self) -> "Journal":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _fsync_directory(directory: str) -> None:
+    """새 파일의 디렉터리 항목까지 디스크에 남깁니다 (지원하지 않는 OS 는 건너뜀)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+# ──────────────────────────────────────────────────────────────
+# 2️⃣ 읽기 / 복구
+# ──────────────────────────────────────────────────────────────
+def read_journal(path: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """(헤더, 명령 줄 목록). 크래시로 잘린 마지막 줄은 버립니다."""
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().split("\n")
+    # 마지막 원소는 개행 뒤의 나머지 (정상이면 빈 문자열, 잘렸으면 쓰다 만 줄)
+    records = []
+    for line in lines[:-1]:
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            break
+    if not records or not isinstance(records[0], dict) or records[0].get("format") != JOURNAL_FORMAT:
+        raise JournalError(f"저널 헤더를 읽을 수 없습니다: {path}")
+    return records[0], records[1:]
+
+
+def _actions(lines: List[Dict[str, Any]]) -> List[list]:
+    return [action for line in lines for action in line["a"]]
+
+
+def _replay_dump(header: Dict[str, Any], lines: List[Dict[str, Any]]) -> bytes:
+    """(프로세스 풀 워커) 저널 하나를 리플레이해 persist 바이너리로 반환"""
+    record = {"seed": header["seed"], "player_ids": header["player_ids"],
+              "classes": header["classes"], "actions": _actions(lines)}
+    version, digest = header["catalog"]
+    catalog = find_catalog(version, digest)
+    if catalog is None:
+        raise persist.StateFormatError(f"저널의 카드 데이터(version {version}, {digest or '-'})를 이 프로세스가 모릅니다.")
+    options = dict(header["options"], catalog=catalog, **_REPLAY_OVERRIDES)
+    return persist.dump(replay(record, **options).state)
+
+
+class Recovery(NamedTuple):
+    states: Dict[str, GameState]   # 방 ID → 복구한 상태
+    failed: Dict[str, str]         # 방 ID(또는 파일 경로) → 실패 이유 (파일은 그대로 남겨 둠)
+
+
+def recover(directory: str, manager=None, workers: Optional[int] = None,
+            executor: Optional[Executor] = None) -> Recovery:
+    """
+    디렉터리의 저널을 모두 리플레이합니다. workers 개 프로세스로 병렬 처리하며 workers=1 이면 현재 프로세스에서 합니다.
+    manager 를 주면 복구한 방을 manager.add_room 으로 등록하고, manager 의 저널이 이어서 기록합니다.
+    방 하나가 어떤 예외로 실패해도 그 방만 failed 에 넣고 나머지는 계속 복구합니다.
+    프로세스 풀이 깨지면(워커가 죽는 등) 아직 결과를 못 받은 방은 현재 프로세스에서 다시 리플레이합니다.
+    """
+    journals = []
+    failed: Dict[str, str] = {}
+    if os.path.isdir(directory):
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith(SUFFIX):
+                continue
+            path = os.path.join(directory, name)
+            try:
+                journals.append(read_journal(path))
+            except (OSError, JournalError) as e:
+                failed[path] = str(e)
+
+    results: Dict[str, Any] = {}
+    own_executor = executor is None and workers != 1 and len(journals) > 1
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures: Dict[str, Future] = {}
+        if executor is not None:
+            try:
+                for header, actions in journals:
+                    futures[header["room_id"]] = executor.submit(_replay_dump, header, actions)
+            except BrokenExecutor:
+                pass  # 제출하지 못한 방은 아래에서 현재 프로세스로
+        for header, actions in journals:
+            room_id = header["room_id"]
+            future = futures.get(room_id)
+            try:
+                if future is not None:
+                    try:
+                        results[room_id] = future.result()
+                        continue
+                    except BrokenExecutor:
+                        pass  # 풀이 깨짐: 이 방은 현재 프로세스에서 다시
+                results[room_id] = _replay_dump(header, actions)
+            except Exception as e:
+                failed[room_id] = _reason(e)
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+    states: Dict[str, GameState] = {}
+    for header, actions in journals:
+        room_id = header["room_id"]
+        data = results.get(room_id)
+        if data is None:
+            continue
+        try:
+            state = persist.load(data, **header["options"])
+            state.actions = [tuple(action) for action in _actions(actions)]
+            if actions:
+                state.version = actions[-1]["v"]  # 배치는 명령 여러 개가 버전 하나
+            if manager is not None:
+                manager.add_room(room_id, state)
+        except Exception as e:
+            failed[room_id] = _reason(e)
+            continue
+        states[room_id] = state
+    return Recovery(states, failed)
+
+
+def _reason(error: Exception) -> str:
+    # 메시지가 빈 예외도 있으므로 타입 이름을 붙입니다.
+    return f"{type(error).__name__}: {error}" if str(error) else type(error).__name__
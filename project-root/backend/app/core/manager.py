@@ -1 +1,216 @@
-# [추가] 실시간 게임 세션(방) 관리 (DB 역할 대체)
\ No newline at end of file
+# 게임 방(Room) 생성/조회/정리 logic
+
+# project-root/backend/app/core/manager.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+from .card import CARD_DATA_PATH, CATALOG_STORE, Catalog
+from .engine import Engine, GameState
+
+# 외부(소켓 등)에서 execute 로 호출할 수 있는 엔진 명령
+COMMANDS = frozenset({"play_card", "buy_card", "next_phase", "apply_batch"})
+
+
+class Room:
+    """방 하나 = GameState + Engine + 활동 시각"""
+    __slots__ = ("room_id", "state", "engine", "created_at", "last_active")
+
+    def __init__(self, room_id: str, state: GameState, engine: Engine, now: float):
+        self.room_id = room_id
+        self.state = state
+        self.engine = engine
+        self.created_at = now
+        self.last_active = now
+
+
+class _Shard:
+    """락 하나와 방 목록(LRU 순서) 하나. 서로 다른 샤드의 방은 락을 공유하지 않습니다."""
+    __slots__ = ("lock", "rooms", "commands", "created", "evicted")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.rooms: "OrderedDict[str, Room]" = OrderedDict()  # 앞쪽일수록 오래 쉰 방
+        self.commands = 0
+        self.created = 0
+        self.evicted = 0
+
+
+class GameManager:
+    """
+    게임 방을 O(1)로 생성/조회/삭제하는 인-프로세스 매니저.
+    방 ID 해시로 샤드(락 스트라이프)를 고르므로, 다른 샤드에 있는 방의 명령은 서로 기다리지 않습니다.
+    오래 쉰 방은 TTL(ttl 초) 또는 샤드별 최대 방 수(max_rooms) 초과 시 LRU 순서로 정리합니다.
+    journal(core.journal.Journal) 을 주면 방 생성/명령/삭제를 방별 저널에 남겨 크래시 후 recover() 로 되살릴 수 있습니다.
+    """
+
+    def __init__(self, shards: int = 64, ttl: Optional[float] = 1800.0, max_rooms: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic, on_evict: Optional[Callable[[Room], None]] = None,
+                 journal=None):
+        self._shards: List[_Shard] = [_Shard() for _ in range(shards)]
+        self.ttl = ttl
+        self._max_per_shard = None if max_rooms is None else max(1, max_rooms // shards)
+        self._clock = clock
+        self.on_evict = on_evict  # 정리된 방을 넘겨받는 콜백 (저장/통계 등)
+        self.journal = journal
+        self._started_at = clock()
+        self._last_stats = (self._started_at, 0)
+
+    def _shard(self, room_id: str) -> _Shard:
+        return self._shards[hash(room_id) % len(self._shards)]
+
+    # ──────────────────────────────────────────────────────────
+    # 방 생성 / 조회 / 삭제
+    # ──────────────────────────────────────────────────────────
+    def create_room(self, room_id: str, player_ids: List[str], player_classes: Optional[dict] = None,
+                    **state_options) -> Room:
+        """GameState/Engine 을 만들고 setup_game 까지 마친 방을 등록합니다. (소켓 중계용 delta 기록이 기본)"""
+        state_options.setdefault("record_deltas", True)
+        state = GameState(list(player_ids), **state_options)
+        engine = Engine(state)
+        engine.setup_game(player_classes)
+        return self._register(room_id, state, engine, state_options)
+
+    def add_room(self, room_id: str, state: GameState) -> Room:
+        """이미 만들어진 상태(복구/이전한 방)를 등록합니다. 저널은 state.actions 뒤부터 이어서 기록합니다."""
+        return self._register(room_id, state, Engine(state), None)
+
+    def _register(self, room_id: str, state: GameState, engine: Engine, journal_options: Optional[dict]) -> Room:
+        shard = self._shard(room_id)
+        evicted = []
+        with shard.lock:
+            if room_id in shard.rooms:
+                raise ValueError(f"이미 존재하는 방입니다: {room_id}")
+            if self.journal is not None:
+                if journal_options is None:
+                    self.journal.resume(room_id, state)
+                else:
+                    self.journal.open(room_id, state, journal_options)
+            room = Room(room_id, state, engine, self._clock())
+            shard.rooms[room_id] = room
+            shard.created += 1
+            if self._max_per_shard is not None:
+                while len(shard.rooms) > self._max_per_shard:
+                    evicted.append(shard.rooms.popitem(last=False)[1])
+                    shard.evicted += 1
+        self._notify_evicted(evicted)
+        return room
+
+    def get_room(self, room_id: str) -> Optional[Room]:
+        shard = self._shard(room_id)
+        with shard.lock:
+            return shard.rooms.get(room_id)
+
+    def remove_room(self, room_id: str) -> Optional[Room]:
+        shard = self._shard(room_id)
+        with shard.lock:
+            room = shard.rooms.pop(room_id, None)
+        if room is not None and self.journal is not None:
+            self.journal.discard(room_id)
+        return room
+
+    def room_ids(self) -> List[str]:
+        rooms = []
+        for shard in self._shards:
+            with shard.lock:
+                rooms.extend(shard.rooms)
+        return rooms
+
+    def __contains__(self, room_id: str) -> bool:
+        return self.get_room(room_id) is not None
+
+    def __len__(self) -> int:
+        return sum(len(shard.rooms) for shard in self._shards)
+
+    # ──────────────────────────────────────────────────────────
+    # 명령 실행
+    # ──────────────────────────────────────────────────────────
+    def execute(self, room_id: str, command: str, *args):
+        """
+        방의 엔진 명령(play_card/buy_card/next_phase/apply_batch)을 샤드 락 안에서 실행하고 결과를 그대로 반환합니다.
+        같은 방에 대한 명령은 직렬화되고, 방의 LRU 순서가 갱신됩니다.
+        """
+        if command not in COMMANDS:
+            raise ValueError(f"허용되지 않은 명령입니다: {command}")
+        shard = self._shard(room_id)
+        with shard.lock:
+            room = shard.rooms.get(room_id)
+            if room is None:
+                raise KeyError(room_id)
+            result = getattr(room.engine, command)(*args)
+            if self.journal is not None:
+                self.journal.record(room_id, room.state)
+            room.last_active = self._clock()
+            shard.rooms.move_to_end(room_id)
+            shard.commands += 1
+        return result
+
+    # ──────────────────────────────────────────────────────────
+    # 카드 카탈로그
+    # ──────────────────────────────────────────────────────────
+    def reload_catalog(self, path=CARD_DATA_PATH) -> Catalog:
+        """
+        카드 데이터를 다시 읽어 이 프로세스의 카탈로그를 바꿉니다. 방 락은 잡지 않습니다.
+        진행 중인 방은 자기 카탈로그(GameState.catalog)를 계속 쓰고, 이후 create_room 부터 새 버전이 적용됩니다.
+        검증에 실패하면 CatalogError 를 내고 아무것도 바꾸지 않습니다.
+        """
+        return CATALOG_STORE.reload(path)
+
+    def catalog_versions(self) -> Dict[int, int]:
+        """카탈로그 버전 → 그 버전으로 진행 중인 방 수 (이전 버전 방이 모두 끝났는지 확인용)"""
+        versions: Dict[int, int] = {}
+        for shard in self._shards:
+            with shard.lock:
+                for room in shard.rooms.values():
+                    versions[room.state.catalog.version] = versions.get(room.state.catalog.version, 0) + 1
+        return versions
+
+    # ──────────────────────────────────────────────────────────
+    # 정리 / 통계
+    # ──────────────────────────────────────────────────────────
+    def evict_idle(self, now: Optional[float] = None) -> List[str]:
+        """ttl 초 이상 명령이 없던 방을 정리하고 그 ID 목록을 반환합니다 (주기적으로 호출)."""
+        if self.ttl is None:
+            return []
+        deadline = (self._clock() if now is None else now) - self.ttl
+        evicted = []
+        for shard in self._shards:
+            with shard.lock:
+                rooms = shard.rooms
+                # LRU 순서이므로 앞에서부터 만료되지 않은 방을 만나면 멈춥니다.
+                while rooms:
+                    room = next(iter(rooms.values()))
+                    if room.last_active > deadline:
+                        break
+                    evicted.append(rooms.popitem(last=False)[1])
+                    shard.evicted += 1
+        self._notify_evicted(evicted)
+        return [room.room_id for room in evicted]
+
+    def _notify_evicted(self, rooms: List[Room]) -> None:
+        if self.journal is not None:
+            for room in rooms:
+                self.journal.discard(room.room_id)
+        if self.on_evict is not None:
+            for room in rooms:
+                self.on_evict(room)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        live_rooms, 누적 명령 수, 직전 stats() 호출 이후의 초당 명령 처리량 등을 반환합니다.
+        카운터는 샤드별로 따로 올리고 여기서만 합산합니다.
+        """
+        now = self._clock()
+        commands = sum(shard.commands for shard in self._shards)
+        last_time, last_commands = self._last_stats
+        elapsed = now - last_time
+        self._last_stats = (now, commands)
+        return {
+            "live_rooms": len(self),
+            "rooms_created": sum(shard.created for shard in self._shards),
+            "rooms_evicted": sum(shard.evicted for shard in self._shards),
+            "commands_total": commands,
+            "commands_per_sec": (commands - last_commands) / elapsed if elapsed > 0 else 0.0,
+            "uptime_sec": now - self._started_at,
+        }
@@ -0,0 +1,67 @@
+# 비용 순 마켓 인덱스 logic
+
+# project-root/backend/app/core/market_index.py
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .card import CARD_DB, CARD_IDS, CARD_NAMES, Card
+
+
+class CostIndex:
+    """
+    한 마켓(공동 또는 개인)에서 재고가 남은 카드를 (비용, 카드 ID) 순으로 정렬해 둔 인덱스.
+    '골드 g 로 살 수 있는 카드'는 bisect 한 번으로 찾습니다.
+    재고가 0이 되면 엔진이 discard() 로 빼고, 다시 채워지면 add() 로 넣습니다.
+    cards 는 비용을 읽을 카드 데이터 (엔진은 게임에 고정된 카탈로그를 넘김, 생략하면 부팅 시 CARD_DB).
+    """
+    __slots__ = ("keys", "costs", "cards")
+
+    def __init__(self, items: Iterable[Tuple[str, int]] = (), cards: Optional[Dict[str, Card]] = None):
+        self.cards = CARD_DB if cards is None else cards
+        # 카드 데이터에 없는 카드는 살 수 없으므로 넣지 않습니다.
+        self.keys: List[Tuple[int, int]] = sorted(
+            (self.cards[name].cost, CARD_IDS[name]) for name, count in items if count > 0 and name in self.cards
+        )
+        self.costs: List[int] = [cost for cost, _ in self.keys]
+
+    def add(self, card_name: str) -> None:
+        card = self.cards.get(card_name)
+        if card is None:
+            return
+        key = (card.cost, CARD_IDS[card_name])
+        i = bisect_left(self.keys, key)
+        if i == len(self.keys) or self.keys[i] != key:
+            self.keys.insert(i, key)
+            self.costs.insert(i, key[0])
+
+    def discard(self, card_name: str) -> None:
+        card = self.cards.get(card_name)
+        if card is None:
+            return
+        key = (card.cost, CARD_IDS[card_name])
+        i = bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            del self.keys[i]
+            del self.costs[i]
+
+    def affordable_ids(self, gold: int) -> List[int]:
+        """비용 gold 이하인 카드 ID (비용 오름차순, 같은 비용은 카드 ID 순)"""
+        return [card_id for _, card_id in self.keys[:bisect_right(self.costs, gold)]]
+
+    def affordable(self, gold: int) -> List[str]:
+        """비용 gold 이하인 카드 이름 (비용 오름차순, 같은 비용은 카드 ID 순)"""
+        return [CARD_NAMES[card_id] for _, card_id in self.keys[:bisect_right(self.costs, gold)]]
+
+    def best(self, gold: int) -> Optional[str]:
+        """비용 gold 이하 중 가장 비싼 카드 (같은 비용이면 카드 ID 가 작은 것)"""
+        i = bisect_right(self.costs, gold)
+        if i == 0:
+            return None
+        first = bisect_left(self.costs, self.costs[i - 1])
+        return CARD_NAMES[self.keys[first][1]]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __repr__(self) -> str:
+        return f"CostIndex({[(CARD_NAMES[i], cost) for cost, i in self.keys]})"
@@ -0,0 +1,222 @@
+# 엔진 핫패스 계측 (호출 수 / 지연 히스토그램) logic
+
+# project-root/backend/app/core/metrics.py
+#
+# enable() 을 부르면 엔진 진입점(play_card, buy_card, next_phase, _end_turn, draw_card)과
+# 카드 클래스의 play() 를 시간 재는 래퍼로 바꿔 끼우고, disable() 하면 원래 함수로 되돌립니다.
+# 꺼져 있을 때는 래퍼 자체가 없으므로 추가 비용이 0 입니다.
+#
+# 집계 단위
+#   - newgame_engine_op_seconds{op, card|phase}   엔진 명령 (카드 명령은 카드별, 페이즈 명령은 페이즈별)
+#   - newgame_card_play_seconds{card}             카드 효과 실행
+# card 라벨은 그 게임 카탈로그에 있는 이름만 쓰고, 나머지(클라이언트가 보낸 없는 이름)는 모두 "_invalid" 하나로 모읍니다.
+# 라벨 값 종류가 카드 수로 묶여 있어야 아무 문자열이나 보내는 클라이언트가 시계열을 끝없이 늘리지 못합니다.
+# render() 는 Prometheus 텍스트 포맷(0.0.4)으로 내보냅니다.
+import threading
+from bisect import bisect_left
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .card import CARD_DB
+from .engine import Engine
+
+# 히스토그램 구간 상한 (초). 마지막 +Inf 구간은 자동으로 붙습니다.
+DEFAULT_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 5e-3, 1e-2)
+
+# 계측하는 엔진 메서드 → 라벨 이름 ("card": 두 번째 인자, "phase": 호출 시점의 페이즈, None: 라벨 없음)
+ENGINE_OPS = {
+    "play_card": "card",
+    "buy_card": "card",
+    "next_phase": "phase",
+    "_end_turn": "phase",
+    "draw_card": None,
+}
+
+# 카탈로그에 없는 카드 이름 대신 쓰는 라벨 값
+INVALID_CARD_LABEL = "_invalid"
+
+# (op, 라벨 이름, 라벨 값). 카드 효과는 op 가 "card_play"
+Key = Tuple[str, Optional[str], str]
+
+
+class Histogram:
+    """누적이 아닌 구간별 개수로 저장하고, 내보낼 때 누적합으로 바꿉니다."""
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, size: int):
+        self.counts: List[int] = [0] * size
+        self.sum = 0.0
+        self.count = 0
+
+
+class Instrumentation:
+    """프로세스 전역 계측기. 기본 인스턴스는 모듈의 enable()/disable()/render() 로 씁니다."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, prefix: str = "newgame"):
+        self.buckets = tuple(buckets)
+        self.prefix = prefix
+        self.histograms: Dict[Key, Histogram] = {}
+        self._lock = threading.Lock()  # GameManager 는 샤드마다 다른 스레드에서 명령을 실행합니다.
+        self._originals: Dict[Tuple[type, str], Callable] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._originals)
+
+    # ──────────────────────────────────────────────────────────
+    # 1️⃣ 수집
+    # ──────────────────────────────────────────────────────────
+    def observe(self, key: Key, seconds: float) -> None:
+        with self._lock:
+            hist = self.histograms.get(key)
+            if hist is None:
+                hist = self.histograms[key] = Histogram(len(self.buckets) + 1)
+            hist.counts[bisect_left(self.buckets, seconds)] += 1
+            hist.sum += seconds
+            hist.count += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.histograms.clear()
+
+    # ──────────────────────────────────────────────────────────
+    # 2️⃣ 켜기 / 끄기 (메서드 교체)
+    # ──────────────────────────────────────────────────────────
+    def enable(self) -> None:
+        """엔진 메서드와 카드 play() 를 계측 래퍼로 교체합니다. 이미 켜져 있으면 아무 일도 하지 않습니다."""
+        if self.enabled:
+            return
+        for op, label in ENGINE_OPS.items():
+            self._patch(Engine, op, self._engine_wrapper(op, label, getattr(Engine, op)))
+        # 카드 정의가 쓰는 클래스마다 한 번씩 (같은 클래스의 카드는 self.name 으로 구분)
+        for card_class in {type(card) for card in CARD_DB.values()}:
+            self._patch(card_class, "play", self._card_wrapper(card_class.play))
+
+    def disable(self) -> None:
+        """원래 메서드로 되돌립니다. 모아 둔 수치는 reset() 전까지 남습니다."""
+        for (owner, name), original in self._originals.items():
+            if original is None:
+                delattr(owner, name)
+            else:
+                setattr(owner, name, original)
+        self._originals.clear()
+
+    def _patch(self, owner: type, name: str, wrapper: Callable) -> None:
+        # 부모 클래스에서 물려받은 메서드면 되돌릴 때 지우기만 하면 됩니다.
+        self._originals[(owner, name)] = owner.__dict__.get(name)
+        setattr(owner, name, wrapper)
+
+    def _engine_wrapper(self, op: str, label: Optional[str], method: Callable) -> Callable:
+        observe = self.observe
+
+        if label == "card":
+            def timed(engine, player_id, card_name, *args):
+                card = card_name if isinstance(card_name, str) and card_name in engine.cards else INVALID_CARD_LABEL
+                started = perf_counter()
+                try:
+                    return method(engine, player_id, card_name, *args)
+                finally:
+                    observe((op, "card", card), perf_counter() - started)
+        elif label == "phase":
+            def timed(engine, *args):
+                phase = engine.state.phase.name
+                started = perf_counter()
+                try:
+                    return method(engine, *args)
+                finally:
+                    observe((op, "phase", phase), perf_counter() - started)
+        else:
+            def timed(engine, *args):
+                started = perf_counter()
+                try:
+                    return method(engine, *args)
+                finally:
+                    observe((op, None, ""), perf_counter() - started)
+
+        timed.__name__ = method.__name__
+        timed.__doc__ = method.__doc__
+        timed.__wrapped__ = method
+        return timed
+
+    def _card_wrapper(self, method: Callable) -> Callable:
+        observe = self.observe
+
+        def timed(card, engine, player_id):
+            started = perf_counter()
+            try:
+                return method(card, engine, player_id)
+            finally:
+                observe(("card_play", "card", card.name), perf_counter() - started)
+
+        timed.__name__ = method.__name__
+        timed.__doc__ = method.__doc__
+        timed.__wrapped__ = method
+        return timed
+
+    # ──────────────────────────────────────────────────────────
+    # 3️⃣ 내보내기
+    # ──────────────────────────────────────────────────────────
+    def snapshot(self) -> Dict[Key, Tuple[List[int], float, int]]:
+        """{키: (구간별 개수, 합계 초, 호출 수)} 사본"""
+        with self._lock:
+            return {key: (list(h.counts), h.sum, h.count) for key, h in self.histograms.items()}
+
+    def render(self) -> str:
+        """Prometheus 텍스트 포맷"""
+        families = {
+            "engine_op": (f"{self.prefix}_engine_op_seconds", "엔진 명령 처리 시간"),
+            "card_play": (f"{self.prefix}_card_play_seconds", "카드 효과 실행 시간"),
+        }
+        rows: Dict[str, List[str]] = {family: [] for family in families}
+        bounds = [_format_float(b) for b in self.buckets] + ["+Inf"]
+
+        for (op, label, value), (counts, total, count) in sorted(self.snapshot().items(),
+                                                                key=lambda item: _sort_key(item[0])):
+            if op == "card_play":
+                family, labels = "card_play", f'card="{_escape(value)}"'
+            else:
+                family, labels = "engine_op", f'op="{op}"' + (f',{label}="{_escape(value)}"' if label else "")
+            name = families[family][0]
+            lines = rows[family]
+            running = 0
+            for bound, n in zip(bounds, counts):
+                running += n
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {running}')
+            lines.append(f"{name}_sum{{{labels}}} {_format_float(total)}")
+            lines.append(f"{name}_count{{{labels}}} {count}")
+
+        out = []
+        for family, (name, help_text) in families.items():
+            out.append(f"# HELP {name} {help_text}")
+            out.append(f"# TYPE {name} histogram")
+            out.extend(rows[family])
+        return "\n".join(out) + "\n"
+
+
+def _sort_key(key: Key) -> Tuple[str, str, str]:
+    op, label, value = key
+    return op, label or "", value
+
+
+def _format_float(value: float) -> str:
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# 프로세스 전역 기본 계측기
+INSTRUMENTATION = Instrumentation()
+
+
+def enable() -> None:
+    INSTRUMENTATION.enable()
+
+
+def disable() -> None:
+    INSTRUMENTATION.disable()
+
+
+def render() -> str:
+    return INSTRUMENTATION.render()
@@ -0,0 +1,262 @@
+# GameState 바이너리 저장/복원 logic
+
+# project-root/backend/app/core/persist.py
+#
+# 크래시 복구, 워커 간 방 이전, 테스트 픽스처용 압축 바이너리 포맷입니다.
+# 모든 정수는 리틀 엔디언이며, 문자열은 (u8 길이 + UTF-8) 입니다.
+#
+#   매직 b"NGS" + u8 포맷 버전
+#   카드 이름 테이블   u16 바이트 길이 + 이름들 (저장 시점의 카드 ID → 이름)
+#   헤더              u8 플래그, u8 페이즈, u32 턴 수, u32 상태 버전, u64 시드, 스냅샷 모드,
+#                     u8 턴 주인 인덱스, u8 승자 인덱스 (255 = 없음)
+#   카탈로그          u32 카탈로그 version + 8바이트 digest (이 게임이 묶인 카드 데이터)
+#   플레이어          u8 인원 + [ID, 클래스, i32 스탯 6개, u16 존 장수 4개 + u16 개인 마켓 길이,
+#                     존 4개의 카드 ID 바이트, 개인 마켓 i16 재고 배열 (카드 ID 가 인덱스, -1 = 없음)]
+#   공동 마켓         u16 개수 + (u16 카드 ID, i32 재고) 쌍
+#   RNG              u8 유무 (+ u8 버전, u32 x 625 내부 상태, u8 + f64 gauss_next)
+#
+# 로그 / 디버그 스냅샷 / delta / 액션 기록은 상태가 아니므로 저장하지 않습니다.
+# (v2: 시드와 플레이어 클래스 추가. v3: 카탈로그 version/digest 추가. 이전 버전 데이터는 읽지 않습니다.)
+# 읽을 때는 같은 카탈로그에 다시 묶습니다. 이 프로세스가 그 카탈로그를 모르면 StateFormatError 를 냅니다
+# (핫 리로드 뒤 이전/복구된 방이 말없이 새 카드 데이터로 바뀌지 않도록).
+import random
+import struct
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from .card import CARD_NAMES, find_catalog, intern_card
+from .engine import GameState, Phase
+from .player import STATS, ZONES, ZONE_TYPECODE
+
+MAGIC = b"NGS"
+FORMAT_VERSION = 3
+
+_NO_PLAYER = 255
+
+# 헤더 플래그 비트
+_DEBUG = 1
+_LOG_ENABLED = 2
+_GAME_OVER = 4
+_RECORD_DELTAS = 8
+_RECORD_ACTIONS = 16
+_COUNT_ZONES = 32  # 덱/버림패가 장수 존 (저장은 카드 ID 순으로 펼친 배열)
+
+_U8 = struct.Struct("<B")
+_U16 = struct.Struct("<H")
+_HEADER = struct.Struct("<BBIIQ")
+_OWNERS = struct.Struct("<BB")
+_CATALOG = struct.Struct("<I8s")
+_PLAYER = struct.Struct("<" + "i" * len(STATS) + "H" * (len(ZONES) + 1))
+_GAUSS = struct.Struct("<Bd")
+
+# 이름 테이블 인코딩/해석 결과 캐시 (CARD_NAMES 는 늘어나기만 하므로 길이가 곧 버전)
+_name_table_cache: Tuple[int, bytes] = (-1, b"")
+_remap_cache: Dict[bytes, Tuple[List[int], Optional[bytes]]] = {}
+
+
+class StateFormatError(ValueError):
+    """저장 데이터가 손상됐거나 지원하지 않는 버전일 때"""
+
+
+def _str(text: str) -> bytes:
+    raw = text.encode("utf-8")
+    if len(raw) > 255:
+        raise ValueError(f"저장할 수 있는 문자열 길이를 넘었습니다: {text[:20]}...")
+    return _U8.pack(len(raw)) + raw
+
+
+# ──────────────────────────────────────────────────────────────
+# 1️⃣ 저장
+# ──────────────────────────────────────────────────────────────
+def dump(state: GameState) -> bytes:
+    """GameState 를 바이트열로 인코딩합니다. (상태 크기에 비례, 카드 존은 memcpy)"""
+    supply = [(intern_card(name), n) for name, n in state.supply.items()]  # 이름 테이블보다 먼저 ID 발급
+    parts: List[bytes] = [MAGIC, _U8.pack(FORMAT_VERSION)]
+
+    parts.append(_name_table())
+
+    player_ids = list(state.player_ids)
+    index = {pid: i for i, pid in enumerate(player_ids)}
+    flags = ((_DEBUG if state.debug else 0) | (_LOG_ENABLED if state.log_enabled else 0)
+             | (_GAME_OVER if state.is_game_over else 0) | (_RECORD_DELTAS if state.record_deltas else 0)
+             | (_RECORD_ACTIONS if state.actions is not None else 0)
+             | (_COUNT_ZONES if state.zone_mode == "counts" else 0))
+    parts.append(_HEADER.pack(flags, state.phase.value, state.turn_count, state.version, state.seed))
+    parts.append(_str(state.snapshot_mode))
+    parts.append(_OWNERS.pack(index[state.turn_owner], index.get(state.winner, _NO_PLAYER)))
+    parts.append(_CATALOG.pack(state.catalog.version, bytes.fromhex(state.catalog.digest)))
+
+    parts.append(_U8.pack(len(player_ids)))
+    for pid in player_ids:
+        p = state.players[pid]
+        parts.append(_str(pid))
+        parts.append(_str(state.player_classes.get(pid, "")))
+        zones = [getattr(p, zone).ids for zone in ZONES]
+        stock = p.private_market.stock
+        parts.append(_PLAYER.pack(*[getattr(p, stat) for stat in STATS], *map(len, zones), len(stock)))
+        parts.extend(ids.tobytes() for ids in zones)
+        parts.append(stock.tobytes())
+
+    parts.append(_U16.pack(len(supply)))
+    parts.append(struct.pack("<" + "Hi" * len(supply), *[x for item in supply for x in item]))
+
+    rng: Optional[random.Random] = getattr(state, "rng", None)
+    if rng is None:
+        parts.append(_U8.pack(0))
+    else:
+        version, internal, gauss_next = rng.getstate()
+        parts.append(_U8.pack(1))
+        parts.append(_U8.pack(version))
+        parts.append(_U16.pack(len(internal)))
+        parts.append(array("I", internal).tobytes())
+        parts.append(_GAUSS.pack(gauss_next is not None, gauss_next or 0.0))
+
+    return b"".join(parts)
+
+
+def _name_table() -> bytes:
+    global _name_table_cache
+    count, table = _name_table_cache
+    if count != len(CARD_NAMES):
+        names = b"".join(_str(name) for name in CARD_NAMES)
+        table = _U16.pack(len(names)) + names
+        _name_table_cache = (len(CARD_NAMES), table)
+    return table
+
+
+def _remap(names: bytes) -> Tuple[List[int], Optional[bytes]]:
+    """저장된 이름 테이블 → (저장 ID → 현재 ID 목록, 존 바이트 변환표 또는 None)"""
+    cached = _remap_cache.get(names)
+    if cached is not None:
+        return cached
+    remap = []
+    pos = 0
+    while pos < len(names):
+        size = names[pos]
+        remap.append(intern_card(names[pos + 1:pos + 1 + size].decode("utf-8")))
+        pos += 1 + size
+    identity = all(saved == current for saved, current in enumerate(remap))
+    # 존 바이트는 bytes.translate 한 번으로 ID 를 바꿉니다.
+    table = None if identity else bytes(remap + [0] * (256 - len(remap)))
+    if len(_remap_cache) < 64:
+        _remap_cache[names] = (remap, table)
+    return remap, table
+
+
+# ──────────────────────────────────────────────────────────────
+# 2️⃣ 복원
+# ──────────────────────────────────────────────────────────────
+def load(data: bytes, **state_options) -> GameState:
+    """
+    dump 로 만든 바이트열에서 GameState 를 복원합니다.
+    카드 ID 는 저장 시점의 이름 테이블로 현재 프로세스의 ID 에 다시 매핑합니다.
+    state_options 는 GameState 생성 인자(log_capacity 등)를 덮어씁니다.
+    """
+    try:
+        return _load(bytes(data), state_options)
+    except StateFormatError:
+        raise
+    except (struct.error, ValueError, IndexError) as e:  # 잘린 데이터, 잘못된 페이즈 값 등
+        raise StateFormatError(f"저장 데이터를 읽을 수 없습니다: {e}") from e
+
+
+def _load(data: bytes, state_options: dict) -> GameState:
+    if data[:len(MAGIC)] != MAGIC:
+        raise StateFormatError("GameState 저장 데이터가 아닙니다.")
+    pos = len(MAGIC)
+    if data[pos] != FORMAT_VERSION:
+        raise StateFormatError(f"지원하지 않는 포맷 버전입니다: {data[pos]}")
+
+    (size,) = _U16.unpack_from(data, pos + 1)
+    pos += 3 + size
+    remap, table = _remap(data[pos - size:pos])
+
+    flags, phase, turn_count, state_version, seed = _HEADER.unpack_from(data, pos)
+    pos += _HEADER.size
+    size = data[pos]
+    snapshot_mode = data[pos + 1:pos + 1 + size].decode("utf-8")
+    pos += 1 + size
+    owner, winner = _OWNERS.unpack_from(data, pos)
+    catalog_version, raw_digest = _CATALOG.unpack_from(data, pos + _OWNERS.size)
+    pos += _OWNERS.size + _CATALOG.size
+    player_count = data[pos]
+    pos += 1
+    digest = raw_digest.hex() if any(raw_digest) else ""  # 직접 만든 Catalog 는 digest 가 비어 있음
+    catalog = state_options.get("catalog") or find_catalog(catalog_version, digest)
+    if catalog is None or (catalog.version, catalog.digest) != (catalog_version, digest):
+        raise StateFormatError(f"저장된 게임의 카드 데이터(version {catalog_version}, {digest or '-'})를 "
+                               f"이 프로세스가 모릅니다. 같은 카탈로그를 먼저 불러오세요.")
+
+    player_ids = []
+    classes = {}
+    rows = []
+    for _ in range(player_count):
+        size = data[pos]
+        pid = data[pos + 1:pos + 1 + size].decode("utf-8")
+        player_ids.append(pid)
+        pos += 1 + size
+        size = data[pos]
+        if size:
+            classes[pid] = data[pos + 1:pos + 1 + size].decode("utf-8")
+        pos += 1 + size
+        *stats, hand, deck, discard, play_mat, market = _PLAYER.unpack_from(data, pos)
+        pos += _PLAYER.size
+        zones = []
+        for size in (hand, deck, discard, play_mat):
+            zones.append(data[pos:pos + size] if table is None else data[pos:pos + size].translate(table))
+            pos += size
+        rows.append((stats, zones, data[pos:pos + 2 * market]))
+        pos += 2 * market
+
+    options = {"debug": bool(flags & _DEBUG), "log_enabled": bool(flags & _LOG_ENABLED),
+               "snapshot_mode": snapshot_mode, "record_deltas": bool(flags & _RECORD_DELTAS),
+               "record_actions": bool(flags & _RECORD_ACTIONS), "seed": seed,
+               "zone_mode": "counts" if flags & _COUNT_ZONES else "array", "catalog": catalog}
+    options.update(state_options)
+    state = GameState(player_ids, **options)
+    state.player_classes = classes
+    state.phase = Phase(phase)
+    state.turn_count = turn_count
+    state.version = state_version
+    state.turn_owner = player_ids[owner]
+    state.is_game_over = bool(flags & _GAME_OVER)
+    state.winner = None if winner == _NO_PLAYER else player_ids[winner]
+
+    for pid, (stats, zones, market) in zip(player_ids, rows):
+        p = state.players[pid]
+        for stat, value in zip(STATS, stats):
+            setattr(p, stat, value)
+        p.hand.ids, p.deck.ids, p.discard.ids, p.play_mat.ids = (array(ZONE_TYPECODE, raw) for raw in zones)
+        saved = array("h", market)
+        if table is None and len(saved) == len(CARD_NAMES):
+            stock = saved
+        else:
+            stock = array("h", [-1]) * len(CARD_NAMES)
+            for card_id, n in enumerate(saved):
+                if n >= 0:
+                    stock[remap[card_id]] = n
+        p.private_market.stock = stock
+
+    (count,) = _U16.unpack_from(data, pos)
+    items = struct.unpack_from("<" + "Hi" * count, data, pos + 2)
+    pos += 2 + 6 * count
+    state.supply = {CARD_NAMES[remap[items[i]]]: items[i + 1] for i in range(0, 2 * count, 2)}
+
+    has_rng = data[pos]
+    pos += 1
+    if has_rng:
+        rng_version = data[pos]
+        (count,) = _U16.unpack_from(data, pos + 1)
+        pos += 3
+        internal = array("I")
+        internal.frombytes(data[pos:pos + count * internal.itemsize])
+        pos += count * internal.itemsize
+        has_gauss, gauss = _GAUSS.unpack_from(data, pos)
+        pos += _GAUSS.size
+        rng = random.Random()
+        rng.setstate((rng_version, tuple(internal), gauss if has_gauss else None))
+        state.rng = rng
+
+    if pos != len(data):
+        raise StateFormatError("저장 데이터 길이가 맞지 않습니다.")
+    return state
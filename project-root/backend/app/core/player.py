@@ -0,0 +1,410 @@
+# 플레이어 상태 (슬롯 기반 컴팩트 저장소) logic
+
+# project-root/backend/app/core/player.py
+from array import array
+from collections.abc import Mapping, MutableMapping, MutableSequence
+from typing import Dict, Iterable, List
+
+from .card import CARD_IDS, CARD_NAMES, intern_card
+
+# 카드 ID는 255종 이하이므로 부호 없는 1바이트 배열에 저장합니다.
+ZONE_TYPECODE = "B"
+# 장수 존(CountZone)의 카드 ID별 장수
+COUNT_TYPECODE = "I"
+
+ZONES = ("hand", "deck", "discard", "play_mat")
+STATS = ("actions", "buys", "gold", "victory_points", "hp", "mana")
+FIELDS = ZONES + STATS + ("private_market",)
+
+_ZONE_SET = frozenset(ZONES)
+_STAT_SET = frozenset(STATS)
+_FIELD_SET = frozenset(FIELDS)
+
+
+def _to_ids(cards: Iterable) -> array:
+    """카드 이름 목록(또는 Zone)을 카드 ID 배열로 변환합니다."""
+    if isinstance(cards, Zone):
+        return array(ZONE_TYPECODE, cards.ids)
+    return array(ZONE_TYPECODE, [intern_card(name) for name in cards])
+
+
+# ──────────────────────────────────────────────────────────────
+# 1️⃣ 카드 존 (hand / deck / discard / play_mat)
+# ──────────────────────────────────────────────────────────────
+class Zone(MutableSequence):
+    """
+    카드 ID 배열을 감싸서 '카드 이름 리스트'처럼 보여주는 뷰입니다.
+    엔진 내부는 .ids(정수 배열)를 직접 다루고, 카드 효과/테스트 스크립트는 기존처럼
+    이름으로 append/remove/in/for 를 사용할 수 있습니다.
+    """
+    __slots__ = ("ids",)
+
+    def __init__(self, cards: Iterable = ()):
+        self.ids = _to_ids(cards) if cards else array(ZONE_TYPECODE)
+
+    # --- 시퀀스 기본 연산 ---
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [CARD_NAMES[i] for i in self.ids[index]]
+        return CARD_NAMES[self.ids[index]]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            self.ids[index] = _to_ids(value)
+        else:
+            self.ids[index] = intern_card(value)
+
+    def __delitem__(self, index):
+        del self.ids[index]
+
+    def insert(self, index: int, card_name: str) -> None:
+        self.ids.insert(index, intern_card(card_name))
+
+    def __iter__(self):
+        return map(CARD_NAMES.__getitem__, self.ids)
+
+    def __contains__(self, card_name) -> bool:
+        card_id = CARD_IDS.get(card_name)
+        return card_id is not None and card_id in self.ids
+
+    # --- 자주 쓰는 연산은 정수 배열에서 바로 처리 ---
+    def append(self, card_name: str) -> None:
+        card_id = CARD_IDS.get(card_name)
+        self.ids.append(intern_card(card_name) if card_id is None else card_id)
+
+    def extend(self, cards: Iterable) -> None:
+        self.ids.extend(cards.ids if isinstance(cards, Zone) else _to_ids(cards))
+
+    def remove(self, card_name: str) -> None:
+        try:
+            self.ids.remove(CARD_IDS[card_name])
+        except (KeyError, ValueError):
+            raise ValueError(f"{card_name} is not in zone") from None
+
+    def pop(self, index: int = -1) -> str:
+        return CARD_NAMES[self.ids.pop(index)]
+
+    def clear(self) -> None:
+        del self.ids[:]
+
+    def count(self, card_name: str) -> int:
+        card_id = CARD_IDS.get(card_name)
+        return 0 if card_id is None else self.ids.count(card_id)
+
+    # --- 덱 연산 (DeckManager 가 씀, CountZone 이 같은 이름으로 재정의) ---
+    def take(self, count: int, rng) -> array:
+        """맨 위(배열 끝)부터 count 장을 꺼내 뽑는 순서대로 반환합니다."""
+        ids = self.ids
+        n = min(count, len(ids))
+        taken = ids[len(ids) - n:]
+        taken.reverse()
+        del ids[len(ids) - n:]
+        return taken
+
+    def refill_from(self, other: "Zone", rng) -> None:
+        """other 의 카드를 모두 가져와 섞습니다 (배열을 맞바꾸고 제자리에서 셔플, 기존 카드는 버림)."""
+        self.ids, other.ids = other.ids, self.ids
+        other.clear()
+        self.shuffle(rng)
+
+    def shuffle(self, rng) -> None:
+        rng.shuffle(self.ids)
+
+    def fork(self) -> "Zone":
+        clone = Zone.__new__(Zone)
+        clone.ids = self.ids[:]
+        return clone
+
+    # --- 리스트 호환 ---
+    def copy(self) -> List[str]:
+        return list(self)
+
+    def __add__(self, other) -> List[str]:
+        return list(self) + list(other)
+
+    def __radd__(self, other) -> List[str]:
+        return list(other) + list(self)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Zone):
+            return self.ids == other.ids
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+class CountZone(Zone):
+    """
+    순서가 없는 카드 존 (덱 / 버림패 전용, GameState(zone_mode="counts") 일 때).
+    카드 ID별 장수 배열만 들고 있어서 포함 여부/추가/제거가 O(1)이고,
+    셔플은 장수 배열을 넘겨받는 것으로 끝납니다 (카드 종류 수에만 비례).
+    뽑기는 남은 장수에 비례해 무작위로 고르므로 '섞은 뒤 위에서부터 뽑기'와 분포가 같습니다.
+    .ids 는 카드 ID 순으로 펼친 사본입니다 (저장/표시용, 대입하면 장수를 다시 셉니다).
+    """
+    __slots__ = ("counts", "size")
+
+    def __init__(self, cards: Iterable = ()):
+        self.counts = array(COUNT_TYPECODE, bytes(4 * len(CARD_NAMES)))
+        self.size = 0
+        if cards:
+            self.ids = _to_ids(cards)
+
+    @property
+    def ids(self) -> array:
+        ids = array(ZONE_TYPECODE)
+        for card_id, n in enumerate(self.counts):
+            if n:
+                ids.extend(array(ZONE_TYPECODE, (card_id,)) * n)
+        return ids
+
+    @ids.setter
+    def ids(self, ids) -> None:
+        counts = array(COUNT_TYPECODE, bytes(4 * max(len(CARD_NAMES), max(ids, default=-1) + 1)))
+        for card_id in ids:
+            counts[card_id] += 1
+        self.counts = counts
+        self.size = len(ids)
+
+    def _grow(self, card_id: int) -> None:
+        if card_id >= len(self.counts):
+            self.counts.extend(array(COUNT_TYPECODE, bytes(4 * (card_id + 1 - len(self.counts)))))
+
+    # --- O(1) 연산 ---
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, card_name) -> bool:
+        card_id = CARD_IDS.get(card_name)
+        return card_id is not None and card_id < len(self.counts) and self.counts[card_id] > 0
+
+    def count(self, card_name: str) -> int:
+        card_id = CARD_IDS.get(card_name)
+        return 0 if card_id is None or card_id >= len(self.counts) else self.counts[card_id]
+
+    def append(self, card_name: str) -> None:
+        card_id = intern_card(card_name)
+        self._grow(card_id)
+        self.counts[card_id] += 1
+        self.size += 1
+
+    def extend(self, cards: Iterable) -> None:
+        ids = cards.ids if isinstance(cards, Zone) else _to_ids(cards)
+        if ids:
+            self._grow(max(ids))
+        counts = self.counts
+        for card_id in ids:
+            counts[card_id] += 1
+        self.size += len(ids)
+
+    def remove(self, card_name: str) -> None:
+        if card_name not in self:
+            raise ValueError(f"{card_name} is not in zone")
+        self.counts[CARD_IDS[card_name]] -= 1
+        self.size -= 1
+
+    def clear(self) -> None:
+        self.counts = array(COUNT_TYPECODE, bytes(4 * len(self.counts)))
+        self.size = 0
+
+    # --- 위치 기반 연산은 펼친 사본에서 처리 (순서가 없으므로 드물게만 쓰임) ---
+    def __setitem__(self, index, value):
+        ids = self.ids
+        ids[index] = _to_ids(value) if isinstance(index, slice) else intern_card(value)
+        self.ids = ids
+
+    def __delitem__(self, index):
+        ids = self.ids
+        del ids[index]
+        self.ids = ids
+
+    def insert(self, index: int, card_name: str) -> None:
+        self.append(card_name)
+
+    def pop(self, index: int = -1) -> str:
+        card_name = self[index]
+        self.remove(card_name)
+        return card_name
+
+    # --- 덱 연산 ---
+    def take(self, count: int, rng) -> array:
+        """
+        남은 장수에 비례해 한 장씩 비복원 추출합니다 (셔플 후 위에서 뽑기와 같은 분포).
+        비용은 (남은 카드 종류 수 x 뽑는 장수) 에 비례하고 덱 장수와는 무관합니다.
+        """
+        counts = self.counts
+        kinds = [card_id for card_id, n in enumerate(counts) if n]
+        taken = array(ZONE_TYPECODE)
+        size = self.size
+        for _ in range(min(count, size)):
+            r = rng.randrange(size)
+            for card_id in kinds:
+                r -= counts[card_id]
+                if r < 0:
+                    break
+            counts[card_id] -= 1
+            size -= 1
+            taken.append(card_id)
+        self.size = size
+        return taken
+
+    def refill_from(self, other: "Zone", rng) -> None:
+        if isinstance(other, CountZone):
+            # 장수 배열만 맞바꾸면 셔플이 끝납니다.
+            self.counts, self.size = other.counts, other.size
+            other.counts = array(COUNT_TYPECODE, bytes(4 * len(self.counts)))
+            other.size = 0
+        else:
+            self.ids = other.ids
+            other.clear()
+
+    def shuffle(self, rng) -> None:
+        pass  # 순서가 없으므로 섞을 것이 없습니다.
+
+    def fork(self) -> "CountZone":
+        clone = CountZone.__new__(CountZone)
+        clone.counts = self.counts[:]
+        clone.size = self.size
+        return clone
+
+
+# ──────────────────────────────────────────────────────────────
+# 2️⃣ 개인 마켓 (카드 ID별 재고 배열)
+# ──────────────────────────────────────────────────────────────
+_ABSENT = -1  # 마켓에 등록되지 않은 카드 (재고 0과 구분)
+
+
+class Market(MutableMapping):
+    """
+    카드 ID를 인덱스로 쓰는 재고 배열을 '{카드 이름: 재고}' dict처럼 보여주는 뷰입니다.
+    fork() 로 만든 사본과 원본은 재고 배열을 공유하다가, 어느 쪽이든 처음 쓸 때 복사합니다.
+    """
+    __slots__ = ("stock", "shared")
+
+    def __init__(self, items=None):
+        self.shared = False  # True면 stock 을 다른 Market 과 공유 중 (쓰기 전에 복사)
+        if isinstance(items, Market):
+            self.stock = array("h", items.stock)  # 템플릿 복사는 memcpy 한 번
+            return
+        self.stock = array("h", [_ABSENT]) * len(CARD_NAMES)
+        if items:
+            for card_name, count in dict(items).items():
+                self[card_name] = count
+
+    def __getitem__(self, card_name: str) -> int:
+        card_id = CARD_IDS.get(card_name)
+        if card_id is None or card_id >= len(self.stock) or self.stock[card_id] == _ABSENT:
+            raise KeyError(card_name)
+        return self.stock[card_id]
+
+    def __setitem__(self, card_name: str, count: int) -> None:
+        card_id = intern_card(card_name)
+        if self.shared:
+            self.stock = array("h", self.stock)
+            self.shared = False
+        if card_id >= len(self.stock):
+            self.stock.extend([_ABSENT] * (card_id + 1 - len(self.stock)))
+        self.stock[card_id] = count
+
+    def __delitem__(self, card_name: str) -> None:
+        self[card_name]  # 없으면 KeyError
+        self[card_name] = _ABSENT
+
+    def __contains__(self, card_name) -> bool:
+        card_id = CARD_IDS.get(card_name)
+        return card_id is not None and card_id < len(self.stock) and self.stock[card_id] != _ABSENT
+
+    def __iter__(self):
+        return (CARD_NAMES[i] for i, n in enumerate(self.stock) if n != _ABSENT)
+
+    def __len__(self) -> int:
+        return len(self.stock) - self.stock.count(_ABSENT)
+
+    def copy(self) -> Dict[str, int]:
+        return dict(self.items())
+
+    def fork(self) -> "Market":
+        """재고 배열을 공유하는 사본 (copy-on-write)"""
+        clone = Market.__new__(Market)
+        clone.stock = self.stock
+        clone.shared = self.shared = True
+        return clone
+
+    def __repr__(self) -> str:
+        return repr(self.copy())
+
+
+# ──────────────────────────────────────────────────────────────
+# 3️⃣ 플레이어 상태
+# ──────────────────────────────────────────────────────────────
+class PlayerState(Mapping):
+    """
+    한 플레이어의 가변 상태. 엔진은 속성(player.gold)으로 바로 접근하고,
+    카드 효과/테스트 스크립트는 기존 dict 방식(player["gold"])으로도 읽고 쓸 수 있습니다.
+    """
+    __slots__ = FIELDS
+
+    def __init__(self, hp: int = 20, mana: int = 10, victory_points: int = 3, private_market=None,
+                 counted: bool = False):
+        # counted=True 면 덱/버림패를 순서 없는 장수 존(CountZone)으로 둡니다.
+        pile = CountZone if counted else Zone
+        self.hand = Zone()      # 손패
+        self.deck = pile()      # 덱
+        self.discard = pile()   # 버림패
+        self.play_mat = Zone()  # 플레이 매트 (사용한 카드들)
+        self.actions = 1        # 남은 액션 횟수
+        self.buys = 1           # 남은 구매 횟수
+        self.gold = 0           # 이번 턴에 발생한 구매력
+        self.victory_points = victory_points
+        self.hp = hp
+        self.mana = mana
+        self.private_market = Market(private_market)
+
+    # --- dict 호환 뷰 ---
+    def __getitem__(self, key: str):
+        if key not in _FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value) -> None:
+        if key in _STAT_SET:
+            setattr(self, key, value)
+        elif key in _ZONE_SET:
+            # 리스트 대입과 같은 의미: 같은 종류의 새 존으로 교체 (기존 참조는 영향을 받지 않음)
+            setattr(self, key, type(getattr(self, key))(value))
+        elif key == "private_market":
+            self.private_market = Market(value)
+        else:
+            raise KeyError(key)
+
+    def __iter__(self):
+        return iter(FIELDS)
+
+    def __len__(self) -> int:
+        return len(FIELDS)
+
+    def fork(self) -> "PlayerState":
+        """
+        시뮬레이션용 사본. 개인 마켓은 copy-on-write 로 공유하고,
+        존은 수십 바이트짜리 ID 배열이라 매 접근마다 공유 여부를 확인하는 대신 바로 복사합니다.
+        """
+        clone = PlayerState.__new__(PlayerState)
+        for zone in ZONES:
+            setattr(clone, zone, getattr(self, zone).fork())
+        for stat in STATS:
+            setattr(clone, stat, getattr(self, stat))
+        clone.private_market = self.private_market.fork()
+        return clone
+
+    def to_dict(self) -> Dict:
+        """기존 dict-of-lists 형태의 사본을 만듭니다 (직렬화/디버깅용)."""
+        return {key: (list(v) if isinstance(v, Zone) else v.copy() if isinstance(v, Market) else v)
+                for key, v in self.items()}
+
+    def __repr__(self) -> str:
+        return f"PlayerState({self.to_dict()!r})"
@@ -0,0 +1,50 @@
+# 시드 + 액션 기록으로 게임 재현 logic
+
+# project-root/backend/app/core/replay.py
+#
+# 게임 한 판은 (seed, 플레이어 ID, 클래스, 받아들여진 명령 목록) 만으로 다시 만들 수 있습니다.
+# 셔플은 모두 GameState.rng 에서 나오므로 같은 명령을 같은 순서로 실행하면 같은 상태가 됩니다.
+# (스크립트가 state 를 직접 고친 부분은 명령이 아니므로 기록되지 않습니다.)
+from typing import Any, Dict, Iterable, Optional
+
+from .engine import COMMAND_METHODS, Engine, GameState
+
+
+class ReplayError(RuntimeError):
+    """기록된 명령이 리플레이 중 거절됨 (기록과 규칙/카드 데이터가 어긋남)"""
+
+
+def game_record(state: GameState) -> Dict[str, Any]:
+    """JSON 으로 저장할 수 있는 게임 기록을 만듭니다."""
+    if state.actions is None:
+        raise ValueError("액션 기록이 꺼진 게임입니다 (record_actions=False).")
+    return {
+        "seed": state.seed,
+        "player_ids": list(state.player_ids),
+        "classes": dict(state.player_classes),
+        "actions": [list(action) for action in state.actions],
+    }
+
+
+def apply_actions(engine: Engine, actions: Iterable) -> Engine:
+    """명령 목록을 순서대로 실행합니다. 거절되는 명령이 있으면 ReplayError"""
+    for index, (name, *args) in enumerate(actions):
+        method = COMMAND_METHODS.get(name)
+        if method is None:
+            raise ReplayError(f"{index}번째 액션: 알 수 없는 명령입니다: {name}")
+        result = getattr(engine, method)(*args)
+        if result is not None and not result[0]:
+            raise ReplayError(f"{index}번째 액션 {name}{tuple(args)} 이(가) 재현되지 않습니다: {result[1]}")
+    return engine
+
+
+def replay(record: Dict[str, Any], upto: Optional[int] = None, **state_options) -> Engine:
+    """
+    게임 기록에서 엔진을 다시 만듭니다. upto 를 주면 앞의 upto 개 명령까지만 실행합니다.
+    state_options 는 GameState 생성 인자 (예: debug=True 로 버그 재현 시 전체 로그 보기)
+    """
+    state = GameState(list(record["player_ids"]), seed=record["seed"], **state_options)
+    engine = Engine(state)
+    engine.setup_game(record["classes"])
+    actions = record["actions"] if upto is None else record["actions"][:upto]
+    return apply_actions(engine, actions)
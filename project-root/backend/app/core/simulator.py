@@ -0,0 +1,207 @@
+# 헤드리스 셀프 플레이 시뮬레이터 logic
+
+# project-root/backend/app/core/simulator.py
+#
+# 사용 예 (project-root 에서 실행):
+#   python -m backend.app.core.simulator --games 100000 --workers 8 --out results.jsonl
+import argparse
+import itertools
+import json
+import multiprocessing
+import random
+import sys
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from .ai import POLICIES, play_turn
+from .card import CLASS_DB
+from .engine import Engine, GameState
+
+PLAYER_IDS = ["User_A", "User_B"]
+
+
+# ──────────────────────────────────────────────────────────────
+# 1️⃣ 결과 데이터
+# ──────────────────────────────────────────────────────────────
+class GameResult(NamedTuple):
+    game_index: int
+    seed: int
+    classes: Tuple[str, str]   # (User_A 클래스, User_B 클래스)
+    policies: Tuple[str, str]  # (User_A 정책, User_B 정책)
+    winner: Optional[str]      # 승자 ID (무승부면 None)
+    turns: int                 # 종료 시점의 턴 수
+    hp: Tuple[int, int]        # 종료 시점의 HP
+
+
+class MatchupStats:
+    """클래스 매치업 (A 클래스, B 클래스) 별 승/패/무 누적 집계"""
+
+    def __init__(self):
+        # (class_a, class_b) -> [A 승, B 승, 무승부]
+        self.table: Dict[Tuple[str, str], List[int]] = {}
+        self.games = 0
+
+    def record(self, result: GameResult) -> None:
+        row = self.table.setdefault(result.classes, [0, 0, 0])
+        if result.winner == PLAYER_IDS[0]:
+            row[0] += 1
+        elif result.winner == PLAYER_IDS[1]:
+            row[1] += 1
+        else:
+            row[2] += 1
+        self.games += 1
+
+    def win_rates(self) -> Dict[Tuple[str, str], Dict[str, float]]:
+        rates = {}
+        for matchup, (a, b, d) in self.table.items():
+            total = a + b + d
+            rates[matchup] = {"games": total, "a_win": a / total, "b_win": b / total, "draw": d / total}
+        return rates
+
+    def class_win_rates(self) -> Dict[str, float]:
+        """클래스별 전체 승률 (무승부는 분모에만 포함)"""
+        wins: Dict[str, int] = {}
+        played: Dict[str, int] = {}
+        for (class_a, class_b), (a, b, d) in self.table.items():
+            total = a + b + d
+            for cls, w in ((class_a, a), (class_b, b)):
+                wins[cls] = wins.get(cls, 0) + w
+                played[cls] = played.get(cls, 0) + total
+        return {cls: wins[cls] / played[cls] for cls in played}
+
+    def format_table(self) -> str:
+        lines = [f"{'A 클래스':<10} {'B 클래스':<10} {'게임':>8} {'A 승률':>8} {'B 승률':>8} {'무승부':>8}"]
+        for (class_a, class_b), r in sorted(self.win_rates().items()):
+            lines.append(
+                f"{class_a:<10} {class_b:<10} {r['games']:>8} "
+                f"{r['a_win']:>8.1%} {r['b_win']:>8.1%} {r['draw']:>8.1%}"
+            )
+        return "\n".join(lines)
+
+
+# ──────────────────────────────────────────────────────────────
+# 2️⃣ 한 판 진행
+# ──────────────────────────────────────────────────────────────
+def play_game(classes: Sequence[str], policies: Sequence[str] = ("smart", "smart"),
+              max_turns: int = 20, seed: Optional[int] = None, game_index: int = 0,
+              zone_mode: str = "array") -> GameResult:
+    """로그를 끈 상태로 한 판을 끝까지 진행하고 결과만 돌려줍니다. (zone_mode 는 GameState 인자)"""
+    if seed is not None:
+        random.seed(seed)  # 정책(random)용. 셔플은 게임 전용 RNG 를 씁니다.
+
+    state = GameState(list(PLAYER_IDS), debug=False, log_enabled=False, seed=seed, record_actions=False,
+                      zone_mode=zone_mode)
+    engine = Engine(state)
+    engine.setup_game(player_classes=dict(zip(PLAYER_IDS, classes)))
+    policy_fns = {pid: POLICIES[name] for pid, name in zip(PLAYER_IDS, policies)}
+
+    while not state.is_game_over and state.turn_count <= max_turns:
+        play_turn(engine, state.turn_owner, policy_fns[state.turn_owner])
+
+    return GameResult(
+        game_index=game_index,
+        seed=seed,
+        classes=tuple(classes),
+        policies=tuple(policies),
+        winner=state.winner,
+        turns=min(state.turn_count, max_turns),
+        hp=tuple(state.players[pid]["hp"] for pid in PLAYER_IDS),
+    )
+
+
+# ──────────────────────────────────────────────────────────────
+# 3️⃣ 멀티 프로세스 실행
+# ──────────────────────────────────────────────────────────────
+def _iter_jobs(games: int, classes: Optional[Sequence[str]], policies: Sequence[str],
+               max_turns: int, seed: int) -> Iterator[tuple]:
+    """게임별 (인덱스, 시드, 클래스, 정책, 최대 턴) 작업을 만듭니다.
+    클래스를 지정하지 않으면 시드로 정해지는 무작위 매치업을 사용합니다."""
+    class_names = sorted(CLASS_DB.keys())
+    picker = random.Random(seed)
+    for i in range(games):
+        matchup = tuple(classes) if classes else (picker.choice(class_names), picker.choice(class_names))
+        yield (i, seed + i, matchup, tuple(policies), max_turns)
+
+
+def _run_chunk(jobs: List[tuple]) -> List[GameResult]:
+    return [play_game(matchup, policies, max_turns, game_seed, i)
+            for i, game_seed, matchup, policies, max_turns in jobs]
+
+
+def _chunked(iterable, size: int) -> Iterator[list]:
+    it = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_games(games: int, workers: Optional[int] = None, classes: Optional[Sequence[str]] = None,
+              policies: Sequence[str] = ("smart", "smart"), max_turns: int = 20,
+              seed: int = 0, chunk_size: int = 256) -> Iterator[GameResult]:
+    """
+    게임을 프로세스 풀에 나눠 실행하고, 끝나는 순서대로 결과를 흘려보냅니다(streaming).
+    IPC 비용을 줄이기 위해 chunk_size 판씩 묶어서 워커에 전달합니다.
+    workers=1 이면 현재 프로세스에서 순차 실행합니다.
+    """
+    for name in policies:
+        if name not in POLICIES:
+            raise ValueError(f"알 수 없는 정책입니다: {name}")
+
+    jobs = _chunked(_iter_jobs(games, classes, policies, max_turns, seed), chunk_size)
+
+    if workers == 1:
+        for chunk in jobs:
+            yield from _run_chunk(chunk)
+        return
+
+    with multiprocessing.Pool(processes=workers) as pool:
+        for results in pool.imap_unordered(_run_chunk, jobs):
+            yield from results
+
+
+def simulate(games: int, **kwargs) -> MatchupStats:
+    """run_games 결과를 매치업별 통계로 모아서 반환합니다."""
+    stats = MatchupStats()
+    for result in run_games(games, **kwargs):
+        stats.record(result)
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="헤드리스 셀프 플레이 시뮬레이터")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("--classes", default=None, help="고정 매치업, 예: Warrior,Mage")
+    parser.add_argument("--policies", default="smart,smart", help=f"정책 이름 ({', '.join(POLICIES)})")
+    parser.add_argument("--max-turns", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=None, help="게임별 결과를 JSON Lines로 기록할 파일 ('-'는 stdout)")
+    args = parser.parse_args(argv)
+
+    classes = args.classes.split(",") if args.classes else None
+    policies = args.policies.split(",")
+    out = None
+    if args.out == "-":
+        out = sys.stdout
+    elif args.out:
+        out = open(args.out, "w", encoding="utf-8")
+
+    stats = MatchupStats()
+    try:
+        for result in run_games(args.games, workers=args.workers, classes=classes, policies=policies,
+                                max_turns=args.max_turns, seed=args.seed):
+            stats.record(result)
+            if out:
+                out.write(json.dumps(result._asdict(), ensure_ascii=False) + "\n")
+    finally:
+        if out and out is not sys.stdout:
+            out.close()
+
+    print(stats.format_table(), file=sys.stderr)
+    for cls, rate in sorted(stats.class_win_rates().items()):
+        print(f"{cls:<10} 전체 승률 {rate:.1%}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+# 증분(diff) 디버그 스냅샷 logic
+
+# project-root/backend/app/core/snapshot.py
+from array import array
+from bisect import bisect_right
+from collections import deque
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from .card import CARD_NAMES
+
+# 스냅샷은 게임 상태를 (키, 값) 평면 필드로 다룹니다. 값은 문자열이 아닌 원시 값입니다.
+#   (pid, "hp") ... : 정수 스탯
+#   (pid, "hand"), (pid, "play_mat") : 카드 ID bytes
+#   (pid, "deck"), (pid, "discard") : 장수 (순서는 공개하지 않음)
+#   (pid, "private_market") : 재고 배열 bytes
+#   ("supply", 카드 이름) : 공동 마켓 재고
+#   ("phase",), ("turn",), ("owner",), ("over",)
+
+# 스냅샷에 담기는 플레이어 필드 (_player_row 의 순서와 같음)
+PLAYER_FIELDS = ("hp", "gold", "mana", "actions", "buys", "victory_points",
+                 "hand", "play_mat", "deck", "discard", "private_market")
+
+Key = Tuple[Hashable, ...]
+Diff = Tuple[Tuple[Key, Any], ...]
+
+
+def _player_row(p) -> tuple:
+    return (p.hp, p.gold, p.mana, p.actions, p.buys, p.victory_points,
+            bytes(p.hand.ids), bytes(p.play_mat.ids), len(p.deck), len(p.discard),
+            p.private_market.stock.tobytes())
+
+
+def _game_row(state) -> tuple:
+    return (state.phase.name, state.turn_count, state.turn_owner, state.is_game_over)
+
+
+_GAME_KEYS = (("phase",), ("turn",), ("owner",), ("over",))
+
+
+class SnapshotTracker:
+    """
+    마지막 스냅샷 이후 바뀐 필드만 (seq, diff) 로 기록합니다.
+    keyframe_interval 개의 diff 마다 전체 상태를 키프레임으로 보관하므로,
+    임의의 seq 시점 전체 스냅샷은 '가장 가까운 키프레임 + 그 뒤 diff 몇 개'로 복원됩니다.
+    오래된 구간은 max_keyframes 개를 넘으면 버립니다.
+    """
+
+    def __init__(self, keyframe_interval: int = 64, max_keyframes: int = 16):
+        self.keyframe_interval = keyframe_interval
+        self._last: Dict[Key, Any] = {}   # 마지막 스냅샷의 평면 상태
+        self._rows: Dict[Hashable, tuple] = {}  # 행 단위 비교용 (pid / "supply" / "game")
+        # 각 구간: (키프레임 seq, 키프레임 전체 상태, 그 뒤의 [(seq, diff), ...])
+        self._segments: deque = deque(maxlen=max_keyframes)
+        self._segment_seqs: deque = deque(maxlen=max_keyframes)
+
+    def capture(self, seq: int, state) -> Diff:
+        """현재 상태와 직전 스냅샷을 비교해 바뀐 필드만 반환/기록합니다."""
+        # 플레이어/공동 마켓/진행 정보를 행(tuple) 단위로 먼저 비교하고,
+        # 바뀐 행만 필드 단위로 펼쳐서 diff 를 만듭니다. (대부분 한 행만 바뀜)
+        rows = self._rows
+        diff = []
+        for pid, p in state.players.items():
+            row = _player_row(p)
+            old = rows.get(pid)
+            if old != row:
+                rows[pid] = row
+                for i, value in enumerate(row):
+                    if old is None or old[i] != value:
+                        diff.append(((pid, PLAYER_FIELDS[i]), value))
+
+        supply = tuple(state.supply.items())
+        old = rows.get("supply")
+        if old != supply:
+            rows["supply"] = supply
+            old_counts = dict(old) if old else {}
+            diff.extend((("supply", name), n) for name, n in supply if old_counts.get(name) != n)
+
+        game = _game_row(state)
+        old = rows.get("game")
+        if old != game:
+            rows["game"] = game
+            diff.extend((key, v) for i, (key, v) in enumerate(zip(_GAME_KEYS, game)) if old is None or old[i] != v)
+
+        diff = tuple(diff)
+        last = self._last
+        last.update(diff)
+
+        if not self._segments or len(self._segments[-1][2]) >= self.keyframe_interval:
+            self._segments.append((seq, dict(last), []))
+            self._segment_seqs.append(seq)
+        elif diff:
+            self._segments[-1][2].append((seq, diff))
+        return diff
+
+    def rebuild(self, seq: Optional[int] = None) -> Dict[Key, Any]:
+        """seq 시점(그 이전 마지막 스냅샷 기준)의 전체 상태를 평면 dict 로 복원합니다."""
+        if not self._segments:
+            return {}
+        if seq is None:
+            return dict(self._last)
+
+        idx = bisect_right(self._segment_seqs, seq) - 1
+        if idx < 0:
+            raise ValueError(f"seq {seq} 시점의 스냅샷은 이미 버려졌습니다.")
+        _, keyframe, diffs = self._segments[idx]
+        full = dict(keyframe)
+        for diff_seq, diff in diffs:
+            if diff_seq > seq:
+                break
+            full.update(diff)
+        return full
+
+
+# ──────────────────────────────────────────────────────────────
+# 렌더링 (로그를 읽을 때만 호출)
+# ──────────────────────────────────────────────────────────────
+def _format_value(field: str, value) -> str:
+    if field in ("hand", "play_mat"):
+        return "[" + ", ".join(CARD_NAMES[i] for i in value) + "]"
+    if field == "private_market":
+        stock = array("h")
+        stock.frombytes(value)
+        return "{" + ", ".join(f"{CARD_NAMES[i]}({n})" for i, n in enumerate(stock) if n >= 0) + "}"
+    return str(value)
+
+
+def render_diff(action_type: str, diff: Diff) -> str:
+    """'🔍 [DEBUG DIFF: EVENT_OCCURRED] User_A.gold=3, supply.Silver=39' 형태의 한 줄"""
+    parts = []
+    for key, value in diff:
+        field = key[-1]
+        parts.append(f"{'.'.join(str(k) for k in key)}={_format_value(field, bytes(value) if isinstance(value, list) else value)}")
+    return f"🔍 [DEBUG DIFF: {action_type}] " + (", ".join(parts) if parts else "변경 없음")
+
+
+def capture_full(state) -> tuple:
+    """현재 상태를 event_log.render_snapshot 이 받는 튜플 형태로 바로 복사합니다."""
+    players = tuple((pid, state.turn_owner == pid) + _player_row(p) for pid, p in state.players.items())
+    return (players, tuple(state.supply.items()), state.phase.name, state.turn_count, state.is_game_over)
+
+
+def to_snapshot_tuple(full: Dict[Key, Any], player_ids: List[str]) -> tuple:
+    """평면 상태를 event_log.render_snapshot 이 받는 튜플 형태로 바꿉니다."""
+    players = tuple(
+        (pid, full[("owner",)] == pid,
+         full[(pid, "hp")], full[(pid, "gold")], full[(pid, "mana")], full[(pid, "actions")],
+         full[(pid, "buys")], full[(pid, "victory_points")],
+         full[(pid, "hand")], full[(pid, "play_mat")], full[(pid, "deck")], full[(pid, "discard")],
+         full[(pid, "private_market")])
+        for pid in player_ids
+    )
+    supply = tuple((key[1], value) for key, value in full.items() if key[0] == "supply" and len(key) == 2)
+    return players, supply, full[("phase",)], full[("turn",)], full[("over",)]
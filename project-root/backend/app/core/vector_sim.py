@@ -0,0 +1,487 @@
+# NumPy 락스텝(lockstep) 대량 시뮬레이터 logic
+
+# project-root/backend/app/core/vector_sim.py
+#
+# 사용 예 (project-root 에서 실행, numpy 필요):
+#   python -m backend.app.core.vector_sim --games 100000
+#   python -m backend.app.core.vector_sim --games 20000 --validate 2000   # 스칼라 엔진과 통계 비교
+#
+# 밸런스 작업에는 게임별 로그가 아니라 집계 통계만 필요합니다.
+# N 판을 배열 하나로 묶어 (플레이어, 카드 종류, 게임) 별 장수로 존을 표현하고, 모든 판을 같은 턴/같은 차례로
+# 한 걸음씩 진행합니다. 규칙은 engine.py / card.py 와 같고, 정책은 손패 순서와 무관한 ai.priority_ai_decision 입니다.
+#   - 드로우: 덱 장수에서 need 장을 비복원 표본 추출 (셔플한 덱 맨 위에서 뽑는 것과 같은 분포)
+#   - 카드 효과: CARD_DB 의 컴파일된 opcode 를 카드 종류별로 해당 게임들에 한꺼번에 적용
+#   - 끝난 판은 주기적으로 배열에서 잘라 내 남은 판만 계산
+# 난수열이 스칼라 엔진과 다르므로 판 단위 결과는 다르고, validate() 로 분포가 같은지 확인합니다.
+import argparse
+import math
+import sys
+import time
+from typing import Iterator, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from .ai import ACTION_PRIORITY
+from .card import (CARD_DB, CARD_IDS, CARD_NAMES, CLASS_DB, OP_DRAW, OP_HP, OP_MANA, OP_OP_HP, OP_OP_MANA,
+                   OP_STAT, intern_card)
+from .engine import GameState
+from .simulator import PLAYER_IDS, GameResult, MatchupStats, _iter_jobs, play_game
+
+POLICY = "priority"
+CLASS_NAMES = sorted(CLASS_DB)
+SUPPLY_BUYS = ("Gold", "Silver")  # smart 정책이 공용 공급처에서 사는 카드 (우선순위 순)
+COUNT = np.int16  # 존별 장수 자료형
+UNDRAWN = np.iinfo(COUNT).max  # 뽑지 않는 자리의 위치 (어떤 누적 장수보다도 큼)
+STAT = np.int16  # 게임별 스탯(HP, 골드 등) 자료형
+COMPACT_RATIO = 8  # 끝난 판이 살아 있는 열의 1/8 이상이면 배열을 압축
+
+
+def _cumsum(counts: np.ndarray) -> np.ndarray:
+    """카드 종류 축(0) 누적합. 종류 수가 작아 행 단위 덧셈이 np.cumsum(axis=0) 보다 훨씬 빠릅니다."""
+    out = np.empty_like(counts)
+    out[0] = counts[0]
+    for k in range(1, len(counts)):
+        np.add(out[k - 1], counts[k], out=out[k])
+    return out
+
+
+# ──────────────────────────────────────────────────────────────
+# 1️⃣ 카드 / 클래스 테이블
+# ──────────────────────────────────────────────────────────────
+class _Tables:
+    """
+    CARD_DB / CLASS_DB 를 배열로 펼친 것. 카드 ID 가 늘어날 수 있으므로 시뮬레이션마다 새로 만듭니다.
+    카드 종류 축(열)에는 이 정책에서 존에 들어올 수 있는 카드(초기 덱, 개인 마켓, 공용 구매 후보)만 둡니다.
+    """
+
+    def __init__(self):
+        ids = {intern_card(name) for name in SUPPLY_BUYS}
+        for data in CLASS_DB.values():
+            ids.update(intern_card(name) for name in data["initial_deck"])
+            ids.update(intern_card(name) for name in data["private_market"] if name in CARD_DB)
+        self.card_ids = sorted(ids)  # 열 번호 → 카드 ID
+        column = {card_id: i for i, card_id in enumerate(self.card_ids)}
+        k = self.kinds = len(self.card_ids)
+        cards = [CARD_DB[CARD_NAMES[card_id]] for card_id in self.card_ids]
+        self.cost = np.array([c.cost for c in cards], dtype=STAT)
+        self.treasures = [(i, c.value) for i, c in enumerate(cards) if c.card_type == "TREASURE"]
+        self.actions = [(column[CARD_IDS[name]], CARD_DB[name]) for name in ACTION_PRIORITY
+                        if CARD_IDS[name] in column]
+        self.supply_buys = [column[CARD_IDS[name]] for name in SUPPLY_BUYS]
+        self.supply = np.zeros(k, dtype=COUNT)
+        for name, count in GameState(list(PLAYER_IDS), log_enabled=False, record_actions=False).supply.items():
+            if CARD_IDS.get(name) in column:
+                self.supply[column[CARD_IDS[name]]] = count
+
+        self.class_hp = np.array([CLASS_DB[c]["hp"] for c in CLASS_NAMES], dtype=STAT)
+        self.class_gold = np.array([CLASS_DB[c]["gold"] for c in CLASS_NAMES], dtype=STAT)
+        self.class_actions = np.array([CLASS_DB[c]["actions"] for c in CLASS_NAMES], dtype=STAT)
+        self.class_deck = np.zeros((len(CLASS_NAMES), k), dtype=COUNT)
+        self.class_market = np.full((len(CLASS_NAMES), k), -1, dtype=COUNT)  # -1 = 개인 마켓에 없음
+        for i, name in enumerate(CLASS_NAMES):
+            for card in CLASS_DB[name]["initial_deck"]:
+                self.class_deck[i, column[CARD_IDS[card]]] += 1
+            for card, count in CLASS_DB[name]["private_market"].items():
+                if card in CARD_DB:  # 정의가 없는 카드는 smart 정책도 사지 않음
+                    self.class_market[i, column[CARD_IDS[card]]] = count
+        # smart 정책의 개인 마켓 선택 순서: 비용이 높을수록, 같으면 카드 ID 가 작을수록 우선 → 낮은 순서부터 나열
+        private = [i for i in range(k) if (self.class_market[:, i] >= 0).any()]
+        self.private_market = sorted(private, key=lambda i: (self.cost[i], -self.card_ids[i]))
+
+
+# ──────────────────────────────────────────────────────────────
+# 2️⃣ 락스텝 시뮬레이터
+# ──────────────────────────────────────────────────────────────
+class VectorGames:
+    """
+    N 판의 상태 배열. 모든 판이 같은 턴/같은 차례이므로 차례(p)와 턴 수는 스칼라입니다.
+    존은 (플레이어, 카드 열, 게임) 순서의 장수 배열이라 한 플레이어의 한 카드 종류가 연속된 벡터입니다.
+    끝난 판은 mask 에서 빠지고, 어느 정도 쌓이면 상태 배열에서 잘라 냅니다 (_compact).
+    그래서 상태 배열의 열(lane)은 살아 있는 판이고, lanes 가 열 → 게임 번호입니다.
+    결과(winner / ended_turn / final_hp)는 게임 번호로 인덱싱합니다.
+    """
+
+    def __init__(self, matchups: np.ndarray, seed: int = 0, max_turns: int = 20):
+        t = self.tables = _Tables()
+        n = self.games = self.width = len(matchups)
+        self.classes = matchups  # (N, 2) 클래스 인덱스
+        self.rng = np.random.default_rng(seed)
+        self.max_turns = max_turns
+
+        by_player = matchups.T                               # (2, N)
+        self.deck = np.ascontiguousarray(t.class_deck[by_player].transpose(0, 2, 1))      # (2, K, N)
+        self.discard = np.zeros_like(self.deck)
+        self.hand = np.zeros_like(self.deck)
+        self.mat = np.zeros_like(self.deck[0])              # (K, N) 현재 차례 플레이어의 play_mat
+        self.market = np.ascontiguousarray(t.class_market[by_player].transpose(0, 2, 1))  # 개인 마켓 재고
+        self.supply = np.repeat(t.supply[:, None], n, axis=1)
+
+        self.hp = t.class_hp[by_player]                      # (2, N)
+        self.gold = t.class_gold[by_player]
+        self.actions = t.class_actions[by_player]
+        self.buys = np.ones((2, n), dtype=STAT)
+        self.mana = np.zeros((2, n), dtype=STAT)
+        self.done = np.zeros(n, dtype=bool)
+        self.lanes = np.arange(n)
+
+        self.winner = np.full(n, -1, dtype=np.int8)        # -1 = 무승부/진행 중
+        self.ended_turn = np.zeros(n, dtype=np.int32)
+        self.final_hp = np.zeros((2, n), dtype=STAT)
+        self.turn_count = 1
+
+        everyone = np.ones(n, dtype=bool)
+        for p in (0, 1):
+            self._draw(everyone, p, 5)
+
+    # ──────────────────────────────────────────────────────────
+    # 드로우
+    # ──────────────────────────────────────────────────────────
+    def _draw(self, mask: np.ndarray, p: int, count: int) -> None:
+        """mask 판의 플레이어 p 가 count 장을 뽑습니다 (덱이 비면 버림패를 섞어 덱으로)."""
+        deck, discard, hand = self.deck[p], self.discard[p], self.hand[p]
+        need = np.where(mask, count, 0).astype(COUNT)
+        total = deck.sum(axis=0, dtype=COUNT)
+        short = need > total
+        if short.any():
+            # 덱이 모자라면 남은 덱은 전부 손으로 오고, 버림패를 섞은 새 덱에서 나머지를 뽑습니다.
+            hand += deck * short
+            need -= total * short
+            np.copyto(deck, discard, where=short)
+            discard *= ~short
+            total = deck.sum(axis=0, dtype=COUNT)
+            np.minimum(need, total, out=need)  # 버림패까지 모자라면 있는 만큼만
+        self._take(deck, hand, need, total)
+
+    def _take(self, deck: np.ndarray, hand: np.ndarray, need: np.ndarray, total: np.ndarray) -> None:
+        """
+        판마다 덱에서 need 장(<= total)을 비복원 추출합니다 (셔플한 덱 맨 위 need 장과 같은 분포).
+        덱을 카드 종류 순으로 늘어놓았다고 보고 서로 다른 위치 need 개를 Floyd 방식으로 고른 뒤,
+        누적 장수와 비교해 종류별 장수를 한 번에 셉니다.
+        """
+        n = int(need.max())
+        if n <= 0:
+            return
+        # 64비트 원시 난수 하나를 [0, 1) float32 두 개로 씁니다 (rng.random(dtype=float32) 보다 빠름).
+        raw = self.rng.bit_generator.random_raw((n * self.width + 1) // 2).view(np.uint32)[:n * self.width]
+        uniform = ((raw >> 8).astype(np.float32) * np.float32(2.0 ** -24)).reshape(n, self.width)
+        base = total - need
+        span = base.astype(np.float32)
+        uniform_need = bool((need == n).all())
+        positions: List[np.ndarray] = []
+        for step in range(n):
+            # Floyd: j = total - need + step 에 대해 0..j 에서 하나를 고르고, 이미 고른 위치면 j 를 택함
+            j = base + step
+            pick = (uniform[step] * (span + (step + 1))).astype(COUNT)
+            if positions:
+                taken = positions[0] == pick
+                for chosen in positions[1:]:
+                    taken |= chosen == pick
+                pick = np.where(taken, j, pick)
+            if not uniform_need:
+                pick = np.where(need > step, pick, UNDRAWN)
+            positions.append(pick)
+        cumulative = _cumsum(deck)
+        upto = np.zeros(deck.shape, dtype=np.int8)  # 종류 k 까지(포함)의 뽑힌 장수
+        for chosen in positions:
+            upto += (chosen < cumulative).view(np.int8)
+        drawn = upto
+        drawn[1:] -= upto[:-1].copy()
+        deck -= drawn
+        hand += drawn
+
+    # ──────────────────────────────────────────────────────────
+    # 카드 효과 (card.py 의 opcode 와 같은 순서)
+    # ──────────────────────────────────────────────────────────
+    def _hp(self, mask: np.ndarray, target: int, amount: int) -> None:
+        hp = self.hp[target]
+        hp += amount * mask.view(np.int8)
+        dead = mask & (hp <= 0)
+        if dead.any():
+            # 엔진과 같이 죽을 때마다 승자를 덮어씀 (한 카드로 둘 다 쓰러지면 나중 판정)
+            self.done |= dead
+            self.winner[self.lanes[dead]] = 1 - target
+            self.ended_turn[self.lanes[dead]] = self.turn_count
+
+    def _play_action(self, card_id: int, card, mask: np.ndarray, p: int) -> None:
+        step = mask.view(np.int8)
+        self.actions[p] -= step
+        self.hand[p, card_id] -= step
+        self.mat[card_id] += step
+        for op, field, amount in card.ops:
+            if op == OP_STAT:
+                getattr(self, field)[p] += amount * step
+            elif op == OP_DRAW:
+                self._draw(mask, p, amount)
+            elif op == OP_HP:
+                self._hp(mask, p, amount)
+            elif op == OP_MANA:
+                self.mana[p] += amount * step
+            elif op == OP_OP_HP:
+                self._hp(mask, 1 - p, amount)
+            elif op == OP_OP_MANA:
+                self.mana[1 - p] += amount * step
+
+    # ──────────────────────────────────────────────────────────
+    # 턴 단계 (ai.play_turn 과 같은 순서)
+    # ──────────────────────────────────────────────────────────
+    def _action_phase(self, mask: np.ndarray, p: int) -> None:
+        hand, hp = self.hand[p], self.hp[p]
+        mask = mask & (self.actions[p] > 0)
+        while mask.any():
+            choice = np.full(self.width, -1, dtype=STAT)
+            # 우선순위가 낮은 카드부터 덮어써서 가장 높은 카드가 남게 합니다.
+            for card_id, card in reversed(self.tables.actions):
+                ok = hand[card_id] > 0
+                if card.add_hp < 0:
+                    ok &= hp > -card.add_hp + 5
+                np.copyto(choice, card_id, where=ok)
+            mask &= choice >= 0
+            for card_id, card in self.tables.actions:
+                chosen = mask & (choice == card_id)
+                if chosen.any():
+                    self._play_action(card_id, card, chosen, p)
+            mask &= ~self.done & (self.actions[p] > 0)
+
+    def _treasures(self, mask: np.ndarray, p: int) -> None:
+        hand, gold = self.hand[p], self.gold[p]
+        for card_id, value in self.tables.treasures:
+            played = np.where(mask, hand[card_id], 0)
+            gold += played * value
+            self.mat[card_id] += played
+            hand[card_id] -= played
+
+    def _buy_choice(self, mask: np.ndarray, p: int) -> np.ndarray:
+        """smart_ai_decision 의 구매 규칙: 살 수 있는 가장 비싼 개인 카드, 더 비싸면 Gold → Silver"""
+        t = self.tables
+        gold, market = self.gold[p], self.market[p]
+        choice = np.full(self.width, -1, dtype=np.intp)
+        choice_cost = np.full(self.width, -1, dtype=STAT)
+        # 우선순위가 낮은 카드부터 덮어써서 살 수 있는 가장 높은 카드가 남게 합니다.
+        for card_id in t.private_market:
+            cost = t.cost[card_id]
+            take = (market[card_id] > 0) & (gold >= cost)
+            np.copyto(choice, card_id, where=take)
+            np.copyto(choice_cost, cost, where=take)
+        for card_id in t.supply_buys:
+            cost = t.cost[card_id]
+            take = (self.supply[card_id] > 0) & (gold >= cost) & ((choice < 0) | (choice_cost < cost))
+            np.copyto(choice, card_id, where=take)
+            np.copyto(choice_cost, cost, where=take)
+        np.copyto(choice, -1, where=~mask)
+        return choice
+
+    def _buy_phase(self, mask: np.ndarray, p: int) -> None:
+        t = self.tables
+        market, discard = self.market[p], self.discard[p]
+        mask = mask & (self.buys[p] > 0)
+        while mask.any():
+            choice = self._buy_choice(mask, p)
+            rows = np.flatnonzero(choice >= 0)
+            if not rows.size:
+                return
+            cards = choice[rows]
+            self.buys[p, rows] -= 1
+            self.gold[p, rows] -= t.cost[cards]
+            flat = cards * self.width + rows  # (종류, 게임) 2차원 인덱싱보다 1차원 인덱싱이 빠름
+            private = market.reshape(-1)[flat] >= 0
+            market.reshape(-1)[flat[private]] -= 1
+            self.supply.reshape(-1)[flat[~private]] -= 1
+            discard.reshape(-1)[flat] += 1
+            mask = (choice >= 0) & (self.buys[p] > 0)
+
+    def _cleanup(self, mask: np.ndarray, p: int) -> None:
+        # 끝난 판은 결과(HP/승자)에 영향이 없으므로 마스크 없이 통째로 정리합니다.
+        self.discard[p] += self.mat + self.hand[p]
+        self.mat[:] = 0
+        self.hand[p] = 0
+        self.actions[p] = 1
+        self.buys[p] = 1
+        self.gold[p] = 0
+        self._draw(mask, p, 5)
+
+    def play_turn(self, p: int) -> None:
+        self._action_phase(~self.done, p)
+        alive = ~self.done
+        self._treasures(alive, p)
+        self._buy_phase(alive, p)
+        self._cleanup(alive, p)
+
+    def _compact(self) -> None:
+        """끝난 판의 열을 상태 배열에서 잘라 냅니다 (최종 HP 는 결과 배열에 남김)."""
+        keep = ~self.done
+        self.final_hp[:, self.lanes[self.done]] = self.hp[:, self.done]
+        for name in ("deck", "discard", "hand", "market", "mat", "supply",
+                     "hp", "gold", "actions", "buys", "mana", "lanes"):
+            setattr(self, name, np.ascontiguousarray(getattr(self, name)[..., keep]))
+        self.width = len(self.lanes)
+        self.done = np.zeros(self.width, dtype=bool)
+
+    def run(self) -> "VectorGames":
+        while self.turn_count <= self.max_turns and self.width:
+            for p in (0, 1):
+                self.play_turn(p)
+            self.turn_count += 1
+            if np.count_nonzero(self.done) * COMPACT_RATIO >= self.width:
+                self._compact()
+        self._compact()
+        self.ended_turn[self.lanes] = self.max_turns
+        self.final_hp[:, self.lanes] = self.hp
+        return self
+
+    # ──────────────────────────────────────────────────────────
+    # 결과
+    # ──────────────────────────────────────────────────────────
+    def stats(self) -> MatchupStats:
+        stats = MatchupStats()
+        n_classes = len(CLASS_NAMES)
+        key = self.classes[:, 0] * n_classes + self.classes[:, 1]
+        outcome = np.where(self.winner < 0, 2, self.winner)  # 0: A 승, 1: B 승, 2: 무승부
+        counts = np.bincount(key * 3 + outcome, minlength=n_classes * n_classes * 3).reshape(-1, 3)
+        for index in np.flatnonzero(counts.sum(axis=1)):
+            stats.table[(CLASS_NAMES[index // n_classes], CLASS_NAMES[index % n_classes])] = counts[index].tolist()
+        stats.games = self.games
+        return stats
+
+    def results(self, seed: int = 0) -> Iterator[GameResult]:
+        """스칼라 시뮬레이터와 같은 모양의 게임별 결과 (seed 는 기록용 시작 시드)"""
+        for i in range(self.games):
+            winner = int(self.winner[i])
+            yield GameResult(
+                game_index=i, seed=seed + i,
+                classes=(CLASS_NAMES[self.classes[i, 0]], CLASS_NAMES[self.classes[i, 1]]),
+                policies=(POLICY, POLICY),
+                winner=None if winner < 0 else PLAYER_IDS[winner],
+                turns=int(self.ended_turn[i]),
+                hp=(int(self.final_hp[0, i]), int(self.final_hp[1, i])),
+            )
+
+
+def _matchups(games: int, classes: Optional[Sequence[str]], seed: int) -> np.ndarray:
+    """simulator._iter_jobs 와 같은 매치업 순서 (같은 seed 면 스칼라 시뮬레이터와 같은 매치업)"""
+    index = {name: i for i, name in enumerate(CLASS_NAMES)}
+    return np.array([[index[a], index[b]] for _, _, (a, b), _, _ in
+                     _iter_jobs(games, classes, (POLICY, POLICY), 0, seed)], dtype=np.int64).reshape(-1, 2)
+
+
+def run_vectorized(games: int, classes: Optional[Sequence[str]] = None, max_turns: int = 20,
+                   seed: int = 0, batch_size: int = 50_000) -> MatchupStats:
+    """games 판의 매치업별 통계. 큰 요청은 batch_size 판씩 나눠 돌리고 합칩니다."""
+    matchups = _matchups(games, classes, seed)
+    total = MatchupStats()
+    for start in range(0, games, batch_size):
+        batch = VectorGames(matchups[start:start + batch_size], seed=seed + start, max_turns=max_turns).run()
+        for matchup, row in batch.stats().table.items():
+            merged = total.table.setdefault(matchup, [0, 0, 0])
+            for i, n in enumerate(row):
+                merged[i] += n
+        total.games += batch.games
+    return total
+
+
+# ──────────────────────────────────────────────────────────────
+# 3️⃣ 스칼라 엔진과 통계 비교
+# ──────────────────────────────────────────────────────────────
+class Check(NamedTuple):
+    name: str
+    scalar: float
+    vector: float
+    z: float      # 두 표본 차이 / 표준오차
+    ok: bool
+
+
+class Validation(NamedTuple):
+    checks: List[Check]
+    scalar_per_s: float   # 스칼라 엔진 games/s
+    vector_per_s: float   # 벡터 시뮬레이터 games/s
+
+    @property
+    def ok(self) -> bool:
+        return all(check.ok for check in self.checks)
+
+    @property
+    def speedup(self) -> float:
+        return self.vector_per_s / self.scalar_per_s
+
+
+def _proportion_check(name: str, a: np.ndarray, b: np.ndarray, z_limit: float) -> Check:
+    pa, pb = float(a.mean()), float(b.mean())
+    pooled = (a.sum() + b.sum()) / (len(a) + len(b))
+    se = math.sqrt(max(pooled * (1 - pooled), 1e-12) * (1 / len(a) + 1 / len(b)))
+    z = abs(pa - pb) / se
+    return Check(name, pa, pb, z, z <= z_limit)
+
+
+def _mean_check(name: str, a: np.ndarray, b: np.ndarray, z_limit: float) -> Check:
+    se = math.sqrt(a.var(ddof=1) / len(a) + b.var(ddof=1) / len(b)) or 1e-12
+    z = abs(float(a.mean()) - float(b.mean())) / se
+    return Check(name, float(a.mean()), float(b.mean()), z, z <= z_limit)
+
+
+def validate(games: int = 2000, classes: Optional[Sequence[str]] = None, max_turns: int = 20,
+             seed: int = 0, vector_games: Optional[int] = None, z_limit: float = 4.0) -> Validation:
+    """
+    같은 시드/매치업으로 스칼라 엔진(priority 정책)과 벡터 시뮬레이터를 돌려 분포를 비교합니다.
+    승/패/무 비율은 두 비율 z 검정, 턴 수와 최종 HP 는 평균의 z 검정이며 |z| <= z_limit 이면 통과입니다.
+    vector_games 로 벡터 쪽 표본을 더 크게 잡을 수 있습니다 (기본은 games 와 같음).
+    """
+    started = time.perf_counter()
+    scalar = [play_game(matchup, (POLICY, POLICY), max_turns, game_seed, i)
+              for i, game_seed, matchup, _, _ in _iter_jobs(games, classes, (POLICY, POLICY), max_turns, seed)]
+    scalar_seconds = time.perf_counter() - started
+    vector_games = vector_games or games
+    matchups = _matchups(vector_games, classes, seed)
+    started = time.perf_counter()
+    vector = VectorGames(matchups, seed=seed, max_turns=max_turns).run()
+    vector_seconds = time.perf_counter() - started
+
+    s_winner = np.array([-1 if r.winner is None else PLAYER_IDS.index(r.winner) for r in scalar])
+    s_turns = np.array([r.turns for r in scalar], dtype=float)
+    s_hp = np.array([r.hp for r in scalar], dtype=float)
+    checks = [
+        _proportion_check("a_win", s_winner == 0, vector.winner == 0, z_limit),
+        _proportion_check("b_win", s_winner == 1, vector.winner == 1, z_limit),
+        _proportion_check("draw", s_winner == -1, vector.winner == -1, z_limit),
+        _mean_check("turns", s_turns, vector.ended_turn.astype(float), z_limit),
+        _mean_check("hp_a", s_hp[:, 0], vector.final_hp[0].astype(float), z_limit),
+        _mean_check("hp_b", s_hp[:, 1], vector.final_hp[1].astype(float), z_limit),
+    ]
+    return Validation(checks, games / scalar_seconds, vector_games / vector_seconds)
+
+
+def format_checks(checks: List[Check]) -> str:
+    lines = [f"{'항목':<8} {'스칼라':>10} {'벡터':>10} {'|z|':>6}"]
+    for c in checks:
+        lines.append(f"{c.name:<8} {c.scalar:>10.4f} {c.vector:>10.4f} {c.z:>6.2f}{'' if c.ok else '  << 불일치'}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="NumPy 락스텝 대량 시뮬레이터")
+    parser.add_argument("--games", type=int, default=100_000)
+    parser.add_argument("--classes", default=None, help="고정 매치업, 예: Warrior,Mage")
+    parser.add_argument("--max-turns", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument("--validate", type=int, default=0, metavar="N",
+                        help="스칼라 엔진 N 판과 분포를 비교하고 속도를 잽니다")
+    args = parser.parse_args(argv)
+    classes = args.classes.split(",") if args.classes else None
+
+    started = time.perf_counter()
+    stats = run_vectorized(args.games, classes, args.max_turns, args.seed, args.batch_size)
+    elapsed = time.perf_counter() - started
+    print(stats.format_table(), file=sys.stderr)
+    print(f"벡터: {args.games}판 {elapsed:.2f}초 ({args.games / elapsed:,.0f} games/s)", file=sys.stderr)
+    if not args.validate:
+        return 0
+
+    result = validate(args.validate, classes, args.max_turns, args.seed,
+                      vector_games=min(args.games, args.batch_size))
+    print(format_checks(result.checks), file=sys.stderr)
+    print(f"스칼라 {result.scalar_per_s:,.0f} games/s, 벡터 {result.vector_per_s:,.0f} games/s "
+          f"→ {result.speedup:.0f}배", file=sys.stderr)
+    return 0 if result.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+# 플레이어별로 가린 상태(view) logic
+
+# project-root/backend/app/core/view.py
+#
+# 플레이어는 자기 손패만 카드 이름으로 보고, 상대 손패와 모든 덱은 장수만 봅니다 (덱 순서는 아무도 못 봄).
+# 관전자(viewer=None)는 모든 손패를 장수로 봅니다. 버림패 / 플레이 매트 / 마켓 / 스탯은 모두에게 공개입니다.
+#
+# ViewCache 는 엔진의 delta 를 구독해 바뀐 부분만 무효로 표시하고, 읽을 때 그 부분만 다시 만듭니다.
+#   - 플레이어별 부분: stats / hand / deck / discard / play_mat / private_market
+#   - 공용 부분: supply / game
+#   - 보는 사람별 플레이어 항목(자기 것 / 남의 것)도 캐시: 남의 손패는 장수가 바뀔 때만 무효
+# 그래서 초당 수천 번 push 해도 전체 상태를 매번 훑지 않고, 명령 하나가 건드린 존만 복사합니다.
+# 같은 버전에서 다시 읽으면 같은 dict 를 돌려주므로 호출한 쪽에서 고치면 안 됩니다 (인코딩만 할 것).
+from typing import Any, Dict, Optional, Tuple
+
+from .delta import GAME_FIELDS, STAT_FIELDS, _game, _stats, full_state
+
+PLAYER_PARTS = ("stats", "hand", "deck", "discard", "play_mat", "private_market")
+
+
+# ──────────────────────────────────────────────────────────────
+# 1️⃣ 가린 상태 / 가린 delta (캐시 없음, 기준 구현)
+# ──────────────────────────────────────────────────────────────
+def redacted_state(state, viewer: Optional[str] = None) -> Dict[str, Any]:
+    """full_state 에서 viewer 가 아닌 플레이어의 손패를 장수로 바꾼 것"""
+    view = full_state(state)
+    for pid, player in view["players"].items():
+        if pid != viewer:
+            player["hand"] = len(player["hand"])
+    return view
+
+
+def _hides_from(move: list, viewer: Optional[str]) -> bool:
+    # 손패로 들어오는 카드(드로우)는 주인만 이름을 봅니다. 손패에서 나가는 카드는 공개 존으로 갑니다.
+    return move[2] == "hand" and move[0] != viewer and isinstance(move[3], list)
+
+
+def delta_audience(delta: Dict[str, Any], viewer: Optional[str]) -> Optional[str]:
+    """
+    이 delta 를 viewer 에게 보낼 때 쓸 판본: viewer 본인의 드로우가 들어 있으면 viewer, 아니면 None (공개본).
+    같은 판본끼리는 인코딩을 공유할 수 있습니다.
+    """
+    if viewer is not None and any(move[0] == viewer and move[2] == "hand" for move in delta.get("moves", ())):
+        return viewer
+    return None
+
+
+def redact_delta(delta: Dict[str, Any], viewer: Optional[str] = None) -> Dict[str, Any]:
+    """viewer 가 볼 수 없는 카드 이름(남의 드로우)을 장수로 바꾼 delta. 가릴 것이 없으면 원본 그대로."""
+    moves = delta.get("moves")
+    if not moves or not any(_hides_from(move, viewer) for move in moves):
+        return delta
+    redacted = dict(delta)
+    redacted["moves"] = [[move[0], move[1], move[2], len(move[3])] if _hides_from(move, viewer) else move
+                         for move in moves]
+    return redacted
+
+
+# ──────────────────────────────────────────────────────────────
+# 2️⃣ 증분 캐시
+# ──────────────────────────────────────────────────────────────
+def _build_part(player, name: str):
+    if name == "stats":
+        return dict(zip(STAT_FIELDS, _stats(player)))
+    if name == "hand":
+        return list(player.hand)
+    if name == "deck":
+        return len(player.deck)
+    if name == "discard":
+        return list(player.discard)
+    if name == "play_mat":
+        return list(player.play_mat)
+    return player.private_market.copy()
+
+
+class ViewCache:
+    """
+    엔진 하나의 플레이어별 view 캐시. engine.delta_listeners 로 delta 를 받아 무효화합니다.
+    delta 없이 상태를 직접 고쳤다면 invalidate() 를 불러야 합니다.
+    """
+
+    def __init__(self, engine):
+        self.state = engine.state
+        self._parts: Dict[str, Dict[str, Any]] = {pid: {} for pid in self.state.player_ids}  # 없는 키 = 무효
+        self._shared: Dict[str, Any] = {}                          # "supply" / "game"
+        self._entries: Dict[Tuple[str, bool], Dict[str, Any]] = {}  # (플레이어, 자기 것인지) → 플레이어 항목
+        self._views: Dict[Optional[str], Dict[str, Any]] = {}       # viewer → 마지막으로 만든 view
+        self.rebuilt = 0  # 다시 만든 부분 수 (테스트 / 통계용)
+        engine.delta_listeners.append(self.apply)
+
+    def invalidate(self) -> None:
+        for parts in self._parts.values():
+            parts.clear()
+        self._shared.clear()
+        self._entries.clear()
+        self._views.clear()
+
+    def apply(self, delta: Dict[str, Any]) -> None:
+        """delta 가 건드린 부분만 무효로 표시합니다 (다시 만드는 것은 읽을 때)."""
+        for pid in delta.get("stats", ()):
+            self._touch(pid, "stats")
+        for pid, src, dst, _cards in delta.get("moves", ()):
+            for zone in (src, dst):
+                if zone in PLAYER_PARTS:
+                    self._touch(pid, zone)
+        for pid in delta.get("market", ()):
+            self._touch(pid, "private_market")
+        if "supply" in delta:
+            self._shared.pop("supply", None)
+        if "game" in delta:
+            self._shared.pop("game", None)
+
+    def _touch(self, pid: str, part: str) -> None:
+        self._parts[pid].pop(part, None)
+        self._entries.pop((pid, True), None)
+        public = self._entries.get((pid, False))
+        if public is not None and (part != "hand" or public["hand"] != len(self.state.players[pid].hand.ids)):
+            del self._entries[(pid, False)]
+
+    def view(self, viewer: Optional[str] = None) -> Dict[str, Any]:
+        """viewer 에게 보여 줄 상태 (redacted_state 와 같은 내용). 플레이어가 아닌 viewer 는 관전자로 봅니다."""
+        state = self.state
+        if viewer not in state.players:
+            viewer = None
+        view = self._views.get(viewer)
+        if view is not None and view["v"] == state.version:
+            return view
+        view = {
+            "v": state.version,
+            "players": {pid: self._entry(pid, pid == viewer) for pid in state.player_ids},
+            "supply": self._shared_part("supply"),
+            "game": self._shared_part("game"),
+        }
+        self._views[viewer] = view
+        return view
+
+    def _entry(self, pid: str, own: bool) -> Dict[str, Any]:
+        entry = self._entries.get((pid, own))
+        if entry is None:
+            player = self.state.players[pid]
+            parts = self._parts[pid]
+            for name in PLAYER_PARTS:
+                if name not in parts and (own or name != "hand"):
+                    parts[name] = _build_part(player, name)
+                    self.rebuilt += 1
+            entry = {
+                **parts["stats"],
+                "hand": parts["hand"] if own else len(player.hand.ids),
+                "deck": parts["deck"], "discard": parts["discard"],
+                "play_mat": parts["play_mat"], "private_market": parts["private_market"],
+            }
+            self._entries[(pid, own)] = entry
+        return entry
+
+    def _shared_part(self, name: str):
+        value = self._shared.get(name)
+        if value is None:
+            state = self.state
+            if name == "supply":
+                value = dict(state.supply)
+            else:
+                value = dict(zip(GAME_FIELDS, _game(state)))
+            self._shared[name] = value
+            self.rebuilt += 1
+        return value
@@ -1 +1,590 @@
-# 서버 실행 및 Socket.io 설정
\ No newline at end of file
+# 서버 실행 및 Socket.io 설정
+
+# project-root/backend/app/main.py
+#
+# 사용 예 (project-root 에서 실행):
+#   python -m backend.app.main --metrics-port 9100 --instrument
+#   curl localhost:9100/metrics
+#   python -m backend.app.main --journal-dir /var/lib/newgame/wal   # 크래시 복구용 방 저널
+#   python -m backend.app.main --workers 8                          # 방을 워커 프로세스 8개에 나눠 실행
+#
+# /metrics 는 Prometheus 텍스트 포맷으로 방/명령 통계와 (계측을 켰다면) 엔진 지연 히스토그램을 내보냅니다.
+# 계측은 --instrument 또는 환경 변수 NEWGAME_INSTRUMENT=1 로 켭니다 (기본은 꺼짐, 비용 0).
+#
+# 멀티 프로세스 모드 (ShardRouter)
+#   엔진은 순수 파이썬이라 한 프로세스는 코어 하나만 씁니다. 워커 프로세스마다 GameManager 를 하나씩 두고
+#   방 ID 를 일관된 해싱 링으로 워커에 나눠, 라우터가 파이프로 명령을 넘기고 결과와 새 delta 를 받아옵니다.
+#   워커 수를 바꾸면 (resize) 주인이 바뀌는 방(약 1/N)만 persist 바이너리로 옮깁니다.
+#
+# 오래 쉰 방 정리: 단일 프로세스면 serve() 가, 멀티 프로세스면 각 워커가 EVICT_INTERVAL 초마다 evict_idle() 을 부릅니다.
+import argparse
+import asyncio
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+from .core import metrics, persist
+from .core.card import CARD_DATA_PATH, compile_catalog_cache
+from .core.journal import Journal, recover
+from .core.manager import GameManager
+from .utils.hash_ring import HashRing, moved_keys
+
+# 프로세스 전역 방 매니저 (소켓 핸들러와 지표 엔드포인트가 함께 씀)
+MANAGER = GameManager()
+
+# 라우터가 기억해 두는 방 → 워커 매핑 수 (넘으면 비우고 다시 채움)
+ROUTE_CACHE_SIZE = 100_000
+
+# 오래 쉰 방(GameManager.ttl)을 정리하는 주기 (초)
+EVICT_INTERVAL = 60.0
+
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# GameManager.stats() 키 → (지표 이름, 타입, 설명). commands_per_sec 는 Prometheus 가 rate() 로 계산합니다.
+MANAGER_METRICS = {
+    "live_rooms": ("newgame_live_rooms", "gauge", "현재 열려 있는 방 수"),
+    "rooms_created": ("newgame_rooms_created_total", "counter", "만들어진 방 수"),
+    "rooms_evicted": ("newgame_rooms_evicted_total", "counter", "정리된 방 수"),
+    "commands_total": ("newgame_commands_total", "counter", "실행한 엔진 명령 수"),
+    "uptime_sec": ("newgame_uptime_seconds", "gauge", "매니저 가동 시간"),
+}
+
+
+# ──────────────────────────────────────────────────────────────
+# 1️⃣ 지표 렌더링
+# ──────────────────────────────────────────────────────────────
+def render_metrics(manager: GameManager = MANAGER) -> str:
+    stats = manager.stats()
+    lines = []
+    for key, (name, kind, help_text) in MANAGER_METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.append(f"{name} {stats[key]}")
+    text = "\n".join(lines) + "\n"
+    if metrics.INSTRUMENTATION.enabled or metrics.INSTRUMENTATION.histograms:
+        text += metrics.render()
+    return text
+
+
+# ──────────────────────────────────────────────────────────────
+# 2️⃣ 지표 HTTP 엔드포인트 (표준 라이브러리 asyncio 만 사용)
+# ──────────────────────────────────────────────────────────────
+async def _handle_http(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                       manager: GameManager) -> None:
+    try:
+        request = await asyncio.wait_for(reader.readline(), timeout=5)
+        while True:  # 헤더는 읽고 버립니다.
+            line = await asyncio.wait_for(reader.readline(), timeout=5)
+            if line in (b"\r\n", b"\n", b""):
+                break
+        parts = request.decode("latin-1").split()
+        if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+            status, content_type, body = "200 OK", METRICS_CONTENT_TYPE, render_metrics(manager).encode("utf-8")
+        else:
+            status, content_type, body = "404 Not Found", "text/plain; charset=utf-8", b"not found\n"
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body
+        )
+        await writer.drain()
+    except (asyncio.TimeoutError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_metrics_server(host: str = "0.0.0.0", port: int = 9100,
+                               manager: GameManager = MANAGER) -> asyncio.AbstractServer:
+    """GET /metrics 에 응답하는 서버를 띄웁니다 (port=0 이면 빈 포트)."""
+    return await asyncio.start_server(lambda r, w: _handle_http(r, w, manager), host, port)
+
+
+async def evict_idle_forever(manager: GameManager, interval: float = EVICT_INTERVAL) -> None:
+    """interval 초마다 manager.evict_idle() 을 부릅니다 (취소될 때까지)."""
+    while True:
+        await asyncio.sleep(interval)
+        manager.evict_idle()
+
+
+async def serve(host: str, port: int, manager: GameManager = MANAGER,
+                evict_interval: Optional[float] = EVICT_INTERVAL) -> None:
+    """
+    /metrics 서버를 띄우고, evict_interval 이 있으면 같은 루프에서 오래 쉰 방도 주기적으로 정리합니다.
+    (ShardRouter 는 워커가 직접 정리하므로 None 을 넘깁니다.)
+    """
+    server = await start_metrics_server(host, port, manager)
+    evictor = None
+    if evict_interval is not None:
+        evictor = asyncio.get_running_loop().create_task(evict_idle_forever(manager, evict_interval))
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if evictor is not None:
+            evictor.cancel()
+
+
+# ──────────────────────────────────────────────────────────────
+# 3️⃣ 워커 프로세스
+# ──────────────────────────────────────────────────────────────
+def _worker_execute(manager: GameManager, room_id: str, command: str, args: tuple):
+    """명령 결과와 이 명령으로 새로 생긴 delta 들"""
+    room = manager.get_room(room_id)
+    if room is None:
+        raise KeyError(room_id)
+    before = room.state.version
+    result = manager.execute(room_id, command, *args)
+    return result, room.engine.deltas_since(before)
+
+
+def _worker_execute_many(manager: GameManager, commands: List[Tuple[str, str, tuple]]) -> List[Tuple[bool, Any]]:
+    results = []
+    for room_id, command, args in commands:
+        try:
+            results.append((True, _worker_execute(manager, room_id, command, args)))
+        except Exception as e:
+            results.append((False, e))
+    return results
+
+
+def _worker_export(manager: GameManager, room_id: str):
+    room = manager.remove_room(room_id)
+    if room is None:
+        raise KeyError(room_id)
+    return persist.dump(room.state), room.state.actions
+
+
+def _worker_import(manager: GameManager, room_id: str, data: bytes, actions: Optional[list]) -> None:
+    state = persist.load(data)
+    state.actions = actions
+    manager.add_room(room_id, state)
+
+
+def _worker_full_state(manager: GameManager, room_id: str):
+    room = manager.get_room(room_id)
+    if room is None:
+        raise KeyError(room_id)
+    return room.engine.full_state()
+
+
+def _worker_create(manager: GameManager, room_id: str, player_ids: List[str], player_classes: Optional[dict],
+                   state_options: Dict[str, Any]) -> None:
+    manager.create_room(room_id, player_ids, player_classes, **state_options)
+
+
+# 라우터가 보낼 수 있는 요청 → 처리 함수 (첫 인자는 워커의 GameManager)
+WORKER_OPS = {
+    "create_room": _worker_create,
+    "execute": _worker_execute,
+    "execute_many": _worker_execute_many,
+    "remove_room": lambda manager, room_id: manager.remove_room(room_id) is not None,
+    "full_state": _worker_full_state,
+    "export_room": _worker_export,
+    "import_room": _worker_import,
+    "rooms": GameManager.room_ids,
+    "stats": GameManager.stats,
+    "reload_catalog": lambda manager, path: manager.reload_catalog(path).version,
+    "catalog_versions": GameManager.catalog_versions,
+}
+
+
+def _worker_main(conn, manager_options: Dict[str, Any], evict_interval: float = EVICT_INTERVAL) -> None:
+    """
+    워커 프로세스 본체: 자기 몫의 방만 가진 GameManager 로 요청을 받은 순서대로 처리합니다.
+    파이프로는 요청/응답 목록이 오가며, 이미 도착해 있는 요청은 한꺼번에 처리하고 응답도 한 번에 보냅니다.
+    요청이 없어도 evict_interval 초마다 깨어나 오래 쉰 방을 정리합니다.
+    """
+    manager = GameManager(shards=1, **manager_options)  # 워커 안에서는 스레드 경쟁이 없음
+    next_evict = time.monotonic() + evict_interval
+    while True:
+        try:
+            requests = []
+            if conn.poll(max(next_evict - time.monotonic(), 0.0)):
+                requests = conn.recv()
+                while conn.poll():
+                    requests.extend(conn.recv())
+        except (EOFError, OSError):
+            return
+        if time.monotonic() >= next_evict:
+            manager.evict_idle()
+            next_evict = time.monotonic() + evict_interval
+        if not requests:
+            continue
+        replies = []
+        for req, op, args in requests:
+            if op == "stop":
+                replies.append((req, True, None))
+                _send_replies(conn, replies)
+                return
+            try:
+                replies.append((req, True, WORKER_OPS[op](manager, *args)))
+            except Exception as e:
+                replies.append((req, False, e))
+        _send_replies(conn, replies)
+
+
+def _send_replies(conn, replies: list) -> None:
+    try:
+        conn.send(replies)
+    except Exception:  # 결과/예외를 pickle 할 수 없는 응답이 섞여 있으면 하나씩 보냄
+        for req, ok, value in replies:
+            try:
+                conn.send([(req, ok, value)])
+            except Exception as e:
+                conn.send([(req, False, RuntimeError(f"응답을 보낼 수 없습니다: {e!r}"))])
+
+
+class _Worker:
+    """
+    워커 프로세스 하나와 그 파이프. 응답은 전용 스레드가 받아 요청 번호별 Future 를 완료합니다.
+    보낼 요청은 outbox 에 쌓고, 보내는 중인 스레드가 없으면 그 자리에서 쌓인 것을 한 번에 보냅니다.
+    """
+
+    def __init__(self, name: str, ctx, manager_options: Dict[str, Any], evict_interval: float = EVICT_INTERVAL):
+        self.name = name
+        parent, child = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child, manager_options, evict_interval),
+                                   name=name, daemon=True)
+        self.process.start()
+        child.close()
+        self.conn = parent
+        self._send_lock = threading.Lock()
+        self._outbox: deque = deque()
+        self._pending: Dict[int, Future] = {}
+        self._ids = itertools.count()
+        self._reader = threading.Thread(target=self._read, name=f"{name}-reader", daemon=True)
+        self._reader.start()
+
+    def call(self, op: str, *args) -> Future:
+        future: Future = Future()
+        req = next(self._ids)
+        self._pending[req] = future
+        outbox = self._outbox
+        outbox.append((req, op, args))
+        # 다른 스레드가 보내는 중이면 그 스레드가 락을 놓은 뒤 다시 확인하며 함께 보냅니다.
+        while outbox and self._send_lock.acquire(blocking=False):
+            try:
+                batch = []
+                while outbox:
+                    batch.append(outbox.popleft())
+                if batch:
+                    self.conn.send(batch)
+            finally:
+                self._send_lock.release()
+        return future
+
+    def _read(self) -> None:
+        try:
+            while True:
+                for req, ok, value in self.conn.recv():
+                    future = self._pending.pop(req)
+                    if ok:
+                        future.set_result(value)
+                    else:
+                        future.set_exception(value)
+        except (EOFError, OSError):
+            pass
+        for future in self._pending.values():
+            future.set_exception(RuntimeError(f"워커가 종료됐습니다: {self.name}"))
+        self._pending.clear()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        try:
+            self.call("stop").result(timeout)
+        except Exception:
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.conn.close()
+        self._reader.join(timeout)
+
+
+# ──────────────────────────────────────────────────────────────
+# 4️⃣ 로컬 라우터
+# ──────────────────────────────────────────────────────────────
+class ShardRouter:
+    """
+    방 ID → 워커를 일관된 해싱으로 고르고 명령을 전달합니다.
+    execute/create_room/stats 는 GameManager 와 같은 모양이라 render_metrics 등에 그대로 넘길 수 있습니다.
+    submit() 은 Future 를 돌려주므로 여러 워커에 명령을 동시에 흘려 보낼 수 있습니다.
+    """
+
+    def __init__(self, workers: Optional[int] = None, replicas: int = 128, start_method: str = "spawn",
+                 evict_interval: float = EVICT_INTERVAL, **manager_options):
+        self._ctx = multiprocessing.get_context(start_method)
+        self._manager_options = manager_options
+        self._evict_interval = evict_interval  # 워커마다 이 주기로 오래 쉰 방을 정리
+        self._ring = HashRing(replicas=replicas)
+        self._workers: Dict[str, _Worker] = {}
+        self._names = itertools.count()
+        self._lock = threading.Lock()  # 재배치 중에는 새 명령을 잠시 막음
+        self._routes: Dict[str, str] = {}  # 방 ID → 워커 캐시 (링 해시 계산 생략, resize 때 비움)
+        self.rooms_moved = 0
+        self._catalog_path: Optional[str] = None  # reload_catalog 로 바꾼 카드 데이터 (새 워커도 이걸로 시작)
+        with self._lock:
+            self._grow(workers or os.cpu_count() or 1)
+
+    def _grow(self, count: int) -> None:
+        for name in self._spawn(count):
+            self._ring.add(name)
+
+    def _spawn(self, count: int) -> List[str]:
+        """워커를 띄우기만 합니다 (링에는 넣지 않음)."""
+        names = []
+        for _ in range(count):
+            name = f"worker-{next(self._names)}"
+            self._workers[name] = _Worker(name, self._ctx, self._manager_options, self._evict_interval)
+            names.append(name)
+            if self._catalog_path is not None:
+                self._workers[name].call("reload_catalog", self._catalog_path).result()
+        return names
+
+    @property
+    def workers(self) -> List[str]:
+        return self._ring.nodes
+
+    def worker_for(self, room_id: str) -> str:
+        name = self._routes.get(room_id)
+        if name is None:
+            if len(self._routes) >= ROUTE_CACHE_SIZE:
+                self._routes.clear()
+            name = self._routes[room_id] = self._ring.node_for(room_id)
+        return name
+
+    # ──────────────────────────────────────────────────────────
+    # 명령 전달
+    # ──────────────────────────────────────────────────────────
+    def submit(self, room_id: str, op: str, *args) -> Future:
+        with self._lock:
+            return self._workers[self.worker_for(room_id)].call(op, room_id, *args)
+
+    def create_room(self, room_id: str, player_ids: List[str], player_classes: Optional[dict] = None,
+                    **state_options) -> None:
+        self.submit(room_id, "create_room", list(player_ids), player_classes, state_options).result()
+
+    def submit_execute(self, room_id: str, command: str, *args) -> Future:
+        """Future → (명령 결과, 이 명령으로 생긴 delta 목록)"""
+        return self.submit(room_id, "execute", command, args)
+
+    def submit_execute_many(self, commands: List[Tuple[str, str, tuple]]) -> Future:
+        """
+        [(방 ID, 명령, 인자 튜플), ...] 를 워커별로 묶어 요청 하나씩으로 보냅니다 (명령당 IPC/Future 비용 없음).
+        Future → 입력 순서대로 (True, (명령 결과, delta 목록)) 또는 (False, 예외)
+        소켓 쪽에서 한 번에 받은 메시지들을 넘길 때 씁니다.
+        """
+        groups: Dict[str, List[int]] = {}
+        with self._lock:
+            for i, (room_id, _, _) in enumerate(commands):
+                groups.setdefault(self.worker_for(room_id), []).append(i)
+            sent = [(indexes, self._workers[name].call(
+                "execute_many", [(commands[i][0], commands[i][1], tuple(commands[i][2])) for i in indexes]))
+                for name, indexes in groups.items()]
+
+        done: Future = Future()
+        results: List[Any] = [None] * len(commands)
+        remaining = [len(sent)]
+        lock = threading.Lock()
+
+        def collect(indexes: List[int], future: Future) -> None:
+            error = future.exception()
+            for i, result in zip(indexes, [(False, error)] * len(indexes) if error else future.result()):
+                results[i] = result
+            with lock:
+                remaining[0] -= 1
+                finished = remaining[0] == 0
+            if finished:
+                done.set_result(results)
+
+        if not sent:
+            done.set_result(results)
+        for indexes, future in sent:
+            future.add_done_callback(lambda f, indexes=indexes: collect(indexes, f))
+        return done
+
+    def execute_many(self, commands: List[Tuple[str, str, tuple]]) -> List[Tuple[bool, Any]]:
+        return self.submit_execute_many(commands).result()
+
+    def execute(self, room_id: str, command: str, *args):
+        return self.submit_execute(room_id, command, *args).result()[0]
+
+    async def aexecute(self, room_id: str, command: str, *args) -> Tuple[Any, list]:
+        return await asyncio.wrap_future(self.submit_execute(room_id, command, *args))
+
+    def full_state(self, room_id: str) -> Dict[str, Any]:
+        return self.submit(room_id, "full_state").result()
+
+    def remove_room(self, room_id: str) -> bool:
+        return self.submit(room_id, "remove_room").result()
+
+    # ──────────────────────────────────────────────────────────
+    # 카드 카탈로그
+    # ──────────────────────────────────────────────────────────
+    def reload_catalog(self, path=None) -> Dict[str, int]:
+        """
+        모든 워커에 새 카드 데이터를 적용하고 워커 → 카탈로그 버전을 반환합니다.
+        워커는 각자 파일을 읽고 검증한 뒤 참조만 바꾸므로 진행 중인 방의 명령은 기다리지 않습니다.
+        (요청 사이에 끼어 한 번 처리되며, 진행 중인 방은 원래 카탈로그로 끝까지 진행)
+        어느 워커에서든 검증에 실패하면 그 CatalogError 를 다시 냅니다.
+        """
+        path = str(CARD_DATA_PATH if path is None else path)
+        with self._lock:
+            futures = {name: worker.call("reload_catalog", path) for name, worker in self._workers.items()}
+        versions = {name: future.result() for name, future in futures.items()}
+        with self._lock:
+            self._catalog_path = path
+        return versions
+
+    def catalog_versions(self) -> Dict[int, int]:
+        """카탈로그 버전 → 그 버전으로 진행 중인 방 수 (모든 워커 합계)"""
+        with self._lock:
+            futures = [worker.call("catalog_versions") for worker in self._workers.values()]
+        merged: Dict[int, int] = {}
+        for future in futures:
+            for version, rooms in future.result().items():
+                merged[version] = merged.get(version, 0) + rooms
+        return merged
+
+    # ──────────────────────────────────────────────────────────
+    # 재배치
+    # ──────────────────────────────────────────────────────────
+    def resize(self, workers: int) -> Dict[str, str]:
+        """
+        워커 수를 바꾸고 주인이 바뀐 방만 옮깁니다 (옮긴 방 ID → 새 워커).
+        옮긴 방은 delta 기록이 비어 있으므로 클라이언트는 다음 동기화 때 전체 상태를 받습니다.
+        링은 모든 방을 옮긴 뒤에만 바꿉니다. 내보내기/가져오기가 하나라도 실패하면 옮긴 방을 원래 워커로
+        되돌리고 새로 띄운 워커를 멈춘 뒤 그 예외를 다시 냅니다 (링과 워커 구성은 그대로).
+        """
+        if workers < 1:
+            raise ValueError("워커는 1개 이상이어야 합니다.")
+        with self._lock:
+            owners = {name: worker.call("rooms") for name, worker in self._workers.items()}
+            rooms = {room_id: name for name, future in owners.items() for room_id in future.result()}
+            after = self._ring.copy()
+            retired = after.nodes[workers:]
+            spawned = self._spawn(max(0, workers - len(after)))
+            for name in spawned:
+                after.add(name)
+            for name in retired:
+                after.remove(name)
+
+            plan = moved_keys(self._ring, after, rooms)
+            futures = {room_id: self._workers[rooms[room_id]].call("export_room", room_id) for room_id in plan}
+            exported: Dict[str, tuple] = {}
+            imports = {}
+            try:
+                for room_id, future in futures.items():
+                    exported[room_id] = future.result()
+                imports = {room_id: self._workers[target].call("import_room", room_id, *exported[room_id])
+                           for room_id, target in plan.items()}
+                for future in imports.values():
+                    future.result()
+            except BaseException:
+                self._rollback(rooms, plan, exported, futures, imports)
+                for name in spawned:
+                    self._workers.pop(name).stop()
+                raise
+
+            self._ring = after
+            self._routes.clear()
+            for name in retired:
+                self._workers.pop(name).stop()
+            self.rooms_moved += len(plan)
+            return plan
+
+    def _rollback(self, rooms: Dict[str, str], plan: Dict[str, str], exported: Dict[str, tuple],
+                  exports: Dict[str, Future], imports: Dict[str, Future]) -> None:
+        """실패한 resize 에서 옮기던 방을 원래 워커로 되돌립니다 (되돌리기 실패는 삼키고 원래 예외를 살림)."""
+        for room_id, future in exports.items():  # 아직 결과를 안 본 내보내기도 끝나면 받아 둠
+            if room_id not in exported:
+                try:
+                    exported[room_id] = future.result()
+                except Exception:
+                    pass
+        undo = []
+        for room_id, data in exported.items():
+            future = imports.get(room_id)
+            if future is not None:
+                try:
+                    future.result()
+                    undo.append(self._workers[plan[room_id]].call("remove_room", room_id))
+                except Exception:
+                    pass
+        for future in undo:
+            try:
+                future.result()
+            except Exception:
+                pass
+        restores = [self._workers[rooms[room_id]].call("import_room", room_id, *data)
+                    for room_id, data in exported.items()]
+        for future in restores:
+            try:
+                future.result()
+            except Exception:
+                pass
+
+    # ──────────────────────────────────────────────────────────
+    # 통계 / 종료
+    # ──────────────────────────────────────────────────────────
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            futures = [worker.call("stats") for worker in self._workers.values()]
+        per_worker = [future.result() for future in futures]
+        if not per_worker:  # close() 뒤
+            return dict({key: 0 for key in MANAGER_METRICS}, uptime_sec=0.0, workers=0)
+        merged = {key: sum(stats[key] for stats in per_worker) for key in per_worker[0]}
+        merged["uptime_sec"] = max(stats["uptime_sec"] for stats in per_worker)
+        merged["workers"] = len(per_worker)
+        return merged
+
+    def close(self) -> None:
+        with self._lock:
+            for worker in self._workers.values():
+                worker.stop()
+            self._workers.clear()
+
+    def __enter__(self) -> "ShardRouter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="New_Game 서버")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--metrics-port", type=int, default=9100)
+    parser.add_argument("--instrument", action="store_true", help="엔진 핫패스 계측 켜기")
+    parser.add_argument("--journal-dir", default=None, help="방 명령 저널 디렉터리 (시작 시 여기서 복구)")
+    parser.add_argument("--fsync-interval", type=float, default=0.05, help="저널 그룹 커밋 주기 (초)")
+    parser.add_argument("--workers", type=int, default=1, help="방을 나눠 가질 워커 프로세스 수 (1 이면 단일 프로세스)")
+    args = parser.parse_args(argv)
+
+    # 워커 / 리로드가 JSON 대신 읽을 컴파일된 카탈로그 캐시 (import 때는 쓰지 않으므로 시작할 때 명시적으로)
+    compile_catalog_cache(CARD_DATA_PATH)
+    if args.workers > 1:
+        if args.journal_dir or args.instrument:
+            parser.error("--journal-dir / --instrument 는 아직 단일 프로세스(--workers 1)에서만 지원합니다.")
+        with ShardRouter(args.workers) as router:
+            asyncio.run(serve(args.host, args.metrics_port, router, evict_interval=None))
+        return
+
+    if args.instrument or os.environ.get("NEWGAME_INSTRUMENT") == "1":
+        metrics.enable()
+    if args.journal_dir:
+        # 저널을 먼저 붙여야 복구한 방의 이후 명령이 같은 파일에 이어서 기록됩니다.
+        MANAGER.journal = Journal(args.journal_dir, fsync_interval=args.fsync_interval)
+        recovered = recover(args.journal_dir, MANAGER)
+        print(f"저널 복구: {len(recovered.states)}개 방, 실패 {len(recovered.failed)}개")
+        for room_id, reason in recovered.failed.items():
+            print(f"  - {room_id}: {reason}")
+    asyncio.run(serve(args.host, args.metrics_port))
+
+
+if __name__ == "__main__":
+    main()
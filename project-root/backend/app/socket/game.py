@@ -1 +1,413 @@
-# 게임 내 실시간 액션 주고받기
\ No newline at end of file
+# 게임 내 실시간 액션 주고받기
+
+# project-root/backend/app/socket/game.py
+#
+# 전송 계층(Socket.io / websockets 등)과 무관한 메시지 처리부입니다.
+# 소켓 핸들러는 접속 시 join(), 메시지 수신 시 handle(), 종료 시 leave() 만 호출하면 됩니다.
+#
+# 클라이언트 → 서버
+#   {"type": "command", "id": 7, "cmd": "play_card", "args": ["Village"]}
+#   {"type": "batch", "id": 8, "commands": [["play_treasures"], ["buy_card", "Silver"], ["next_phase"]]}
+#   {"type": "resync", "since": 41}      # 버전 구멍을 발견했을 때
+#   {"type": "logs", "since": 120, "limit": 50, "follow": true}   # 게임 로그 (커서 이후만, follow 면 이후 계속)
+# 토큰 접속: join_with_token() 은 플레이어 ID 를 클라이언트가 아니라 서명된 토큰에서 가져오고,
+# 명령 메시지마다 토큰을 다시 확인합니다 (캐시 적중이면 dict 조회 몇 번, 폐기하면 바로 거부).
+# dispatcher(core.dispatch.RoomDispatcher)를 주면 명령을 방 대기열로 직렬화합니다: 핸들러가 동시에 불려도
+# 검증과 실행이 한 번에 하나씩 일어나고, 같은 세션이 같은 id 의 메시지를 다시 보내면(재전송) 한 번만 실행됩니다.
+# 내용이 같아도 id 가 다르면 별개의 명령입니다 (next_phase 두 번, Silver 두 장 구매 등).
+# 서버 → 클라이언트
+#   {"type": "sync", "state": {...}}     # 전체 상태 (접속 직후 / 재동기화). 남의 손패와 덱은 장수만
+#   {"type": "delta", "delta": {"v": 42, ...}}   # 남이 뽑은 카드는 이름 대신 장수
+#   {"type": "result", "id": 7, "ok": true, "error": null}
+#   {"type": "logs", "entries": [{"seq": 120, "text": "..."}], "cursor": 121, "missed": 0, "more": false}
+import asyncio
+import json
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from ..core.dispatch import CommandRejected, RoomDispatcher
+from ..core.event_log import LogPage, render
+from ..core.manager import GameManager
+from ..core.view import delta_audience, redact_delta
+from ..utils.token import TokenError, TokenService
+
+Send = Callable[[str], Awaitable[None]]
+
+# 클라이언트가 보낼 수 있는 명령과 인자 개수 (플레이어 ID 는 세션에서 채움)
+CLIENT_COMMANDS = {"play_card": 1, "buy_card": 1, "next_phase": 0}
+# batch 메시지에 넣을 수 있는 명령과 인자 개수 (play_treasures: 손패의 재물을 모두 냄)
+BATCH_CLIENT_COMMANDS = {**CLIENT_COMMANDS, "play_treasures": 0}
+# logs 메시지 한 번에 보내는 최대 레코드 수 (클라이언트는 more 가 true 면 cursor 로 이어서 요청)
+LOG_PAGE_LIMIT = 200
+# 관전자 한 명에게 쌓아 둘 최대 메시지 수. 넘치면 밀린 것을 버리고 전체 상태(sync) 하나로 대신합니다.
+SPECTATOR_QUEUE_LIMIT = 64
+
+
+def _encode(message: Dict[str, Any]) -> str:
+    return json.dumps(message, ensure_ascii=False, separators=(",", ":"))
+
+
+def _count(message: Dict[str, Any], name: str, default: int) -> Optional[int]:
+    """메시지의 0 이상 정수 필드 (없거나 null 이면 default). 형식이 틀리면 None."""
+    value = message.get(name)
+    if value is None:
+        return default
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        return None
+    return value
+
+
+def _retry_key(session: "Session", message: Dict[str, Any]) -> Optional[tuple]:
+    """dispatcher 가 합칠 수 있는 키. 같은 세션이 같은 id 로 다시 보낸 메시지만 합칩니다 (id 가 없으면 None)."""
+    msg_id = message.get("id")
+    return None if msg_id is None else (session, msg_id)
+
+
+def _encode_logs(page: LogPage) -> str:
+    return _encode({"type": "logs", "entries": [{"seq": r.seq, "text": render(r)} for r in page.records],
+                    "cursor": page.cursor, "missed": page.missed, "more": page.more})
+
+
+class Session:
+    """
+    소켓 연결 하나. version 은 이 클라이언트에게 마지막으로 보낸 상태 버전,
+    log_cursor 는 로그를 따라 받는 중이면 다음에 보낼 로그 커서 (아니면 None) 입니다.
+    """
+    __slots__ = ("player_id", "send", "version", "token", "log_cursor", "outbox")
+
+    def __init__(self, player_id: Optional[str], send: Send, token: Optional[str] = None):
+        self.player_id = player_id  # None 이면 관전자
+        self.send = send
+        self.version = 0
+        self.token = token          # 토큰으로 접속한 세션이면 명령마다 다시 검증
+        self.log_cursor: Optional[int] = None
+        self.outbox: Optional[_Outbox] = None  # 관전자만: 송신 대기열 (플레이어는 바로 보냄)
+
+
+class _Outbox:
+    """
+    관전자 한 명의 송신 대기열 (크기 제한). 채널은 넣기만 하고, 전송은 관전자마다 하나인 태스크가 합니다.
+    느린 관전자의 대기열이 limit 을 넘으면 밀린 메시지를 모두 버리고 전체 상태 하나를 보낸 뒤 다시 따라갑니다.
+    """
+    __slots__ = ("items", "limit", "resync", "drops", "wakeup", "idle", "task")
+
+    def __init__(self, limit: int):
+        self.items: deque = deque()  # (인코딩된 메시지, 로그 페이지면 그 페이지의 시작 커서)
+        self.limit = limit
+        self.resync = False
+        self.drops = 0
+        self.wakeup = asyncio.Event()
+        self.idle = asyncio.Event()
+        self.idle.set()
+        self.task: Optional[asyncio.Task] = None
+
+    def put(self, session: Session, raw: str, log_cursor: Optional[int] = None) -> None:
+        if len(self.items) >= self.limit:
+            self.request_sync(session)
+            return
+        self.items.append((raw, log_cursor))
+        self._wake()
+
+    def request_sync(self, session: Optional[Session] = None) -> None:
+        if self.items:
+            self.drops += 1
+            # 버린 로그는 다음 flush 때 다시 보내도록 커서를 되돌림
+            first_log = next((cursor for _, cursor in self.items if cursor is not None), None)
+            if session is not None and first_log is not None and session.log_cursor is not None:
+                session.log_cursor = first_log
+            self.items.clear()
+        self.resync = True
+        self._wake()
+
+    def _wake(self) -> None:
+        self.idle.clear()
+        self.wakeup.set()
+
+
+class GameChannel:
+    """
+    방 하나에 붙은 세션들에게 명령 결과를 delta 로 전파합니다.
+    명령이 처리될 때마다 각 세션의 version 이후 delta 만 순서대로 보내고,
+    엔진이 이미 버린 구간이 필요하면 전체 상태(sync)로 대신합니다.
+
+    관전자(player_id=None)는 수백 명이 붙을 수 있으므로 방송 방식으로 보냅니다.
+      - 메시지는 한 번만 인코딩하고 같은 (불변) 문자열을 모든 관전자 대기열이 공유
+      - 관전자마다 크기 제한 대기열 + 송신 태스크 하나: 명령 처리 쪽은 넣기만 하고 전송을 기다리지 않음
+      - 대기열이 넘친 관전자는 밀린 것을 버리고 전체 상태로 건너뜀 (느린 관전자 한 명이 게임을 늦추지 않음)
+    """
+
+    def __init__(self, manager: GameManager, room_id: str, tokens: Optional[TokenService] = None,
+                 spectator_queue: int = SPECTATOR_QUEUE_LIMIT, dispatcher: Optional[RoomDispatcher] = None):
+        self.manager = manager
+        self.dispatcher = dispatcher
+        self.room_id = room_id
+        self.tokens = tokens
+        self.spectator_queue = spectator_queue
+        self.sessions: List[Session] = []
+        # (상태 버전, {보는 사람 → 인코딩된 sync 메시지}) — 관전자는 모두 None 판본을 공유
+        self._sync_cache: Tuple[int, Dict[Optional[str], str]] = (-1, {})
+
+    @property
+    def engine(self):
+        room = self.manager.get_room(self.room_id)
+        if room is None:
+            raise KeyError(self.room_id)
+        return room.engine
+
+    # ──────────────────────────────────────────────────────────
+    # 접속 / 종료
+    # ──────────────────────────────────────────────────────────
+    async def join(self, player_id: Optional[str], send: Send) -> Session:
+        """접속해 전체 상태를 받습니다. 관전자는 그 뒤로 송신 대기열을 통해 받습니다."""
+        session = Session(player_id, send)
+        self.sessions.append(session)
+        await self._send_sync(session)
+        if player_id is None:
+            session.outbox = _Outbox(self.spectator_queue)
+            session.outbox.task = asyncio.get_running_loop().create_task(self._pump(session))
+        return session
+
+    async def join_with_token(self, token: str, send: Send) -> Session:
+        """토큰을 검증해 그 플레이어로 접속합니다. 잘못된 토큰이면 TokenError."""
+        if self.tokens is None:
+            raise TokenError("토큰 검증기가 설정되지 않은 채널입니다.")
+        claims = self.tokens.verify(token, self.room_id)
+        session = Session(claims.player_id, send, token)
+        self.sessions.append(session)
+        await self._send_sync(session)
+        return session
+
+    def leave(self, session: Session) -> None:
+        if session in self.sessions:
+            self.sessions.remove(session)
+        if session.outbox is not None and session.outbox.task is not None:
+            session.outbox.task.cancel()
+            session.outbox.idle.set()
+
+    # ──────────────────────────────────────────────────────────
+    # 수신 처리
+    # ──────────────────────────────────────────────────────────
+    async def handle(self, session: Session, raw: str) -> None:
+        try:
+            message = json.loads(raw)
+            kind = message["type"]
+        except (ValueError, KeyError, TypeError):
+            await self._send(session, _encode({"type": "error", "error": "잘못된 메시지 형식입니다."}))
+            return
+
+        if kind in ("command", "batch") and session.token is not None:
+            error = self._check_token(session)
+            if error is not None:
+                await self._send(session, _encode({"type": "result", "id": message.get("id"), "ok": False,
+                                                   "error": error}))
+                return
+
+        if kind == "resync":
+            since = _count(message, "since", 0)
+            if since is None:
+                await self._send(session, _encode({"type": "error", "error": "since 는 0 이상의 정수여야 합니다."}))
+                return
+            await self._resync(session, since)
+        elif kind == "logs":
+            since, limit = _count(message, "since", 0), _count(message, "limit", LOG_PAGE_LIMIT)
+            if since is None or not limit:
+                await self._send(session, _encode({"type": "error",
+                                                   "error": "since 는 0 이상, limit 은 1 이상의 정수여야 합니다."}))
+                return
+            await self._send_logs(session, since, min(limit, LOG_PAGE_LIMIT), bool(message.get("follow")))
+        elif kind == "command":
+            cmd, args = message.get("cmd"), message.get("args")
+            if args is None:
+                args = []
+            if not isinstance(cmd, str) or not isinstance(args, list) or not all(isinstance(a, str) for a in args):
+                await self._send(session, _encode({"type": "error", "error": "잘못된 명령 형식입니다."}))
+                return
+            ok, error = await self._run(_retry_key(session, message), lambda: self._execute(session, cmd, args))
+            await self._send(session, _encode({"type": "result", "id": message.get("id"), "ok": ok, "error": error}))
+            await self.flush()
+        elif kind == "batch":
+            # 여러 명령을 한 번에: 전부 적용되거나 전혀 적용되지 않고, delta 도 하나만 나갑니다.
+            commands = message.get("commands")
+            ok, error = await self._run(_retry_key(session, message),
+                                        lambda: self._execute_batch(session, commands))
+            await self._send(session, _encode({"type": "result", "id": message.get("id"), "ok": ok, "error": error}))
+            await self.flush()
+        else:
+            await self._send(session, _encode({"type": "error", "error": f"알 수 없는 메시지입니다: {kind}"}))
+
+    def _check_token(self, session: Session) -> Optional[str]:
+        try:
+            self.tokens.verify(session.token, self.room_id)
+        except TokenError as e:
+            return str(e)
+        return None
+
+    async def _run(self, key, job):
+        """job (검증 + 실행) 을 dispatcher 대기열을 거쳐 실행합니다. 대기열이 가득 차면 실패 결과로 바꿉니다."""
+        if self.dispatcher is None:
+            return job()
+        try:
+            return await self.dispatcher.call(self.room_id, key, job)
+        except CommandRejected as e:
+            return False, str(e)
+
+    def _execute(self, session: Session, cmd: str, args: list):
+        if session.player_id is None:
+            return False, "관전자는 명령을 보낼 수 없습니다."
+        if CLIENT_COMMANDS.get(cmd) != len(args):
+            return False, f"허용되지 않은 명령입니다: {cmd}"
+        engine = self.engine
+        if cmd == "next_phase":
+            # next_phase 자체는 플레이어를 검사하지 않으므로 여기서 턴 주인만 허용합니다.
+            if engine.state.turn_owner != session.player_id:
+                return False, "현재 본인의 턴이 아닙니다."
+            self.manager.execute(self.room_id, cmd)
+            return True, None
+        ok, msg = self.manager.execute(self.room_id, cmd, session.player_id, *args)
+        return ok, None if ok else msg
+
+    def _execute_batch(self, session: Session, commands):
+        if session.player_id is None:
+            return False, "관전자는 명령을 보낼 수 없습니다."
+        if not isinstance(commands, list) or not commands:
+            return False, "명령 목록이 비어 있습니다."
+        for command in commands:
+            # 개별 명령과 같은 것만 허용 (end_turn 같은 스크립트용 명령은 제외)
+            if (not isinstance(command, list) or not command or not isinstance(command[0], str)
+                    or BATCH_CLIENT_COMMANDS.get(command[0]) != len(command) - 1
+                    or not all(isinstance(arg, str) for arg in command[1:])):
+                return False, f"허용되지 않은 명령입니다: {command}"
+        ok, msg = self.manager.execute(self.room_id, "apply_batch", session.player_id, commands)
+        return ok, None if ok else msg
+
+    # ──────────────────────────────────────────────────────────
+    # 송신
+    # ──────────────────────────────────────────────────────────
+    async def flush(self) -> None:
+        """
+        모든 세션에 밀린 delta 를 보내고, 로그를 따라 받는 세션에는 새 로그도 보냅니다.
+        같은 delta / 같은 커서의 로그 페이지는 한 번만 인코딩해 모든 세션이 같은 문자열을 공유합니다.
+        (delta 는 판본별로 한 번: 뽑은 카드 이름이 보이는 본인용, 장수만 보이는 공개용)
+        관전자에게는 대기열에 넣기만 하므로 관전자 수와 전송 속도는 이 호출을 늦추지 않습니다.
+        """
+        engine = self.engine
+        encoded: Dict[tuple, str] = {}  # (버전, 판본) → 인코딩된 delta
+        missing: Dict[int, Optional[list]] = {}  # 세션 버전 → 보낼 delta 목록 (같은 버전의 관전자끼리 공유)
+        log_pages: Dict[int, tuple] = {}  # 커서 → (인코딩한 페이지, 다음 커서)
+        for session in list(self.sessions):
+            outbox = session.outbox
+            if outbox is not None and outbox.resync:
+                continue  # 전체 상태를 보낼 예정 (보낸 뒤의 버전부터 다시 따라감)
+            if session.version not in missing:
+                missing[session.version] = engine.deltas_since(session.version)
+            pending = missing[session.version]
+            if pending is None:
+                await self._send_sync(session)
+                continue
+            for delta in pending:
+                key = (delta["v"], delta_audience(delta, session.player_id))
+                if key not in encoded:
+                    encoded[key] = _encode({"type": "delta", "delta": redact_delta(delta, key[1])})
+                if outbox is None:
+                    await session.send(encoded[key])
+                else:
+                    outbox.put(session, encoded[key])
+                    if outbox.resync:
+                        break
+                session.version = key[0]
+            while session.log_cursor is not None and session.log_cursor < engine.state.logs.next_seq:
+                if outbox is not None and outbox.resync:
+                    break
+                cursor = session.log_cursor
+                if cursor not in log_pages:
+                    page = engine.state.logs.since(cursor, LOG_PAGE_LIMIT, debug=False)
+                    log_pages[cursor] = (_encode_logs(page) if page.records or page.missed else None, page.cursor)
+                raw, session.log_cursor = log_pages[cursor]
+                if raw is not None:
+                    await self._send(session, raw, log_cursor=cursor)
+
+    async def _send_logs(self, session: Session, since: int, limit: int, follow: bool) -> None:
+        """
+        since 이후 로그 한 페이지를 보냅니다 (디버그 전용 레코드 제외, 게임 길이가 아니라 새 로그 수에 비례).
+        follow 면 이후 flush 때마다 새 로그를 이어서 보냅니다.
+        """
+        page = self.engine.state.logs.since(since, limit, debug=False)
+        session.log_cursor = page.cursor if follow else None
+        await self._send(session, _encode_logs(page), log_cursor=since if follow else None)
+
+    async def _resync(self, session: Session, since: int) -> None:
+        pending = self.engine.deltas_since(since)
+        if pending is None:
+            await self._send_sync(session)
+            return
+        session.version = since
+        for delta in pending:
+            await self._send(session, _encode({"type": "delta", "delta": redact_delta(delta, session.player_id)}))
+            session.version = delta["v"]
+
+    async def _send_sync(self, session: Session) -> None:
+        if session.outbox is not None:
+            session.outbox.request_sync(session)  # 밀린 메시지를 버리고 송신 태스크가 최신 전체 상태를 보냄
+            return
+        await session.send(self._sync_message(session))
+
+    def _sync_message(self, session: Session) -> str:
+        """
+        현재 버전의 sync 메시지 (보는 사람별로 가린 상태, 버전마다 한 번만 인코딩해 공유).
+        가린 상태 자체도 엔진이 delta 로 바뀐 부분만 다시 만듭니다 (Engine.view).
+        """
+        engine = self.engine
+        version = engine.state.version
+        if self._sync_cache[0] != version:
+            self._sync_cache = (version, {})
+        messages = self._sync_cache[1]
+        raw = messages.get(session.player_id)
+        if raw is None:
+            raw = messages[session.player_id] = _encode({"type": "sync", "state": engine.view(session.player_id)})
+        session.version = version
+        return raw
+
+    async def _send(self, session: Session, raw: str, log_cursor: Optional[int] = None) -> None:
+        """플레이어에게는 바로 보내고, 관전자에게는 대기열에 넣습니다 (기다리지 않음)."""
+        if session.outbox is None:
+            await session.send(raw)
+        else:
+            session.outbox.put(session, raw, log_cursor)
+
+    # ──────────────────────────────────────────────────────────
+    # 관전자 송신 태스크
+    # ──────────────────────────────────────────────────────────
+    async def _pump(self, session: Session) -> None:
+        """관전자 한 명의 대기열을 순서대로 보냅니다. 전송이 실패하면 그 관전자를 내보냅니다."""
+        outbox = session.outbox
+        try:
+            while True:
+                if outbox.resync:
+                    outbox.resync = False
+                    raw = self._sync_message(session)
+                elif outbox.items:
+                    raw = outbox.items.popleft()[0]
+                else:
+                    outbox.idle.set()
+                    outbox.wakeup.clear()
+                    await outbox.wakeup.wait()
+                    continue
+                await session.send(raw)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.leave(session)
+
+    async def drain(self) -> None:
+        """관전자 대기열이 모두 비워질 때까지 기다립니다 (종료 전 / 테스트용)."""
+        outboxes = [session.outbox for session in self.sessions if session.outbox is not None]
+        await asyncio.gather(*(outbox.idle.wait() for outbox in outboxes))
+
+    def stats(self) -> Dict[str, int]:
+        outboxes = [session.outbox for session in self.sessions if session.outbox is not None]
+        return {
+            "players": len(self.sessions) - len(outboxes),
+            "spectators": len(outboxes),
+            "queued": sum(len(outbox.items) for outbox in outboxes),
+            "dropped_to_sync": sum(outbox.drops for outbox in outboxes),
+        }
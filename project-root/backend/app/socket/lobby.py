@@ -1 +1,304 @@
-# 매칭 및 대기열 관리
\ No newline at end of file
+# 매칭 및 대기열 관리
+
+# project-root/backend/app/socket/lobby.py
+#
+# 대기 중인 플레이어를 요청한 클래스별 버킷에 레이팅 순으로 정렬해 두고,
+# 하나의 ticker 태스크가 주기적으로 (오래 기다린 순서대로) 짝을 찾습니다.
+#   - 상대 찾기: 허용 클래스 버킷마다 bisect 로 가장 가까운 레이팅 → O(클래스 수 x log n)
+#   - 허용 레이팅 차이는 기다린 시간에 비례해 넓어짐 (base_window + widen_per_sec x 대기 초, 최대 max_window)
+#   - 한 번의 tick 에서 잡힌 짝은 on_match 에 한꺼번에 넘겨 방을 만들고, 그 뒤 각 플레이어의 Future 를 완료
+# 플레이어마다 태스크를 만들지 않으므로 수천 명이 기다려도 태스크는 ticker 하나입니다.
+import asyncio
+import itertools
+import logging
+import time
+from bisect import bisect_left
+from collections import deque
+from typing import Awaitable, Callable, Dict, FrozenSet, List, NamedTuple, Optional, Tuple, Union
+
+from ..core.card import current_catalog
+from ..core.manager import GameManager
+
+logger = logging.getLogger(__name__)
+
+
+class Match(NamedTuple):
+    room_id: str
+    players: Tuple[str, str]
+    classes: Dict[str, str]       # 플레이어 ID → 클래스
+    ratings: Tuple[float, float]
+    waited: Tuple[float, float]   # 각자 기다린 시간 (초)
+
+
+class Ticket:
+    """대기열 항목 하나. future 는 매칭되면 Match 로, 취소되면 CancelledError 로 끝납니다."""
+    __slots__ = ("player_id", "player_class", "rating", "seq", "enqueued_at", "accepts", "future")
+
+    def __init__(self, player_id: str, player_class: str, rating: float, seq: int, enqueued_at: float,
+                 accepts: Optional[FrozenSet[str]], future: "asyncio.Future[Match]"):
+        self.player_id = player_id
+        self.player_class = player_class
+        self.rating = rating
+        self.seq = seq                  # 같은 레이팅끼리의 정렬 순서 (먼저 온 순)
+        self.enqueued_at = enqueued_at
+        self.accepts = accepts          # 상대로 받아들일 클래스 (None 이면 전부)
+        self.future = future
+
+    @property
+    def key(self) -> Tuple[float, int]:
+        return (self.rating, self.seq)
+
+
+class _Bucket:
+    """클래스 하나의 대기자 목록 (레이팅 순). keys 와 tickets 는 같은 순서의 평행 리스트입니다."""
+    __slots__ = ("keys", "tickets")
+
+    def __init__(self):
+        self.keys: List[Tuple[float, int]] = []
+        self.tickets: List[Ticket] = []
+
+    def add(self, ticket: Ticket) -> None:
+        i = bisect_left(self.keys, ticket.key)
+        self.keys.insert(i, ticket.key)
+        self.tickets.insert(i, ticket)
+
+    def remove(self, ticket: Ticket) -> None:
+        i = bisect_left(self.keys, ticket.key)
+        if i < len(self.keys) and self.tickets[i] is ticket:
+            del self.keys[i]
+            del self.tickets[i]
+
+    def nearest(self, ticket: Ticket, window: float) -> Optional[Ticket]:
+        """ticket 과 레이팅 차이가 window 이하이고 서로 클래스를 받아들이는 가장 가까운 대기자"""
+        keys, tickets = self.keys, self.tickets
+        i = bisect_left(keys, ticket.key)
+        lo, hi = i - 1, i
+        best, best_gap = None, window
+        # 양쪽으로 한 칸씩 넓히다가 window 를 넘거나 더 가까운 후보가 나올 수 없으면 멈춥니다.
+        while lo >= 0 or hi < len(tickets):
+            gaps = []
+            if lo >= 0:
+                gaps.append((ticket.rating - keys[lo][0], lo))
+            if hi < len(tickets):
+                gaps.append((keys[hi][0] - ticket.rating, hi))
+            gap, j = min(gaps)
+            if gap > best_gap or (best is not None and gap == best_gap):
+                break
+            if j == lo:
+                lo -= 1
+            else:
+                hi += 1
+            other = tickets[j]
+            if other is ticket or not _compatible(ticket, other):
+                continue
+            best, best_gap = other, gap
+        return best
+
+
+def _compatible(a: Ticket, b: Ticket) -> bool:
+    return (a.accepts is None or b.player_class in a.accepts) and (b.accepts is None or a.player_class in b.accepts)
+
+
+OnMatch = Callable[[List[Match]], Union[None, Awaitable[None]]]
+
+
+# ──────────────────────────────────────────────────────────────
+# 1️⃣ 매치메이커
+# ──────────────────────────────────────────────────────────────
+class Matchmaker:
+    """
+    asyncio 매칭 서비스. 소켓 핸들러는 `match = await matchmaker.join(pid, "Warrior", 1500)` 만 부르면 됩니다.
+    start() 로 ticker 태스크를 띄우고, 테스트에서는 tick() 을 직접 불러도 됩니다.
+    """
+
+    def __init__(self, on_match: Optional[OnMatch] = None, base_window: float = 50.0,
+                 widen_per_sec: float = 25.0, max_window: float = 400.0, interval: float = 0.25,
+                 clock: Callable[[], float] = time.monotonic, room_prefix: str = "match",
+                 history: int = 1024):
+        self.on_match = on_match
+        self.base_window = base_window
+        self.widen_per_sec = widen_per_sec
+        self.max_window = max_window
+        self.interval = interval
+        self._clock = clock
+        self._room_prefix = room_prefix
+        # 클래스별 버킷 (카탈로그 핫 리로드로 새 클래스가 생기면 처음 들어올 때 만듦)
+        self._buckets: Dict[str, _Bucket] = {name: _Bucket() for name in current_catalog().classes}
+        self._tickets: Dict[str, Ticket] = {}  # 삽입 순서 = 대기 시작 순서
+        self._seq = itertools.count()
+        self._rooms = itertools.count(1)
+        self._waits: deque = deque(maxlen=history)  # 최근 매칭들의 대기 시간
+        self.matched = 0
+        self.tick_errors = 0  # ticker 가 삼키고 넘어간 tick 예외 수
+        self._task: Optional[asyncio.Task] = None
+
+    # ──────────────────────────────────────────────────────────
+    # 대기열 입장 / 취소
+    # ──────────────────────────────────────────────────────────
+    def enqueue(self, player_id: str, player_class: str, rating: float,
+                accepts: Optional[List[str]] = None) -> "asyncio.Future[Match]":
+        """대기열에 넣고 매칭 결과를 받을 Future 를 반환합니다. (이벤트 루프 안에서 호출)"""
+        classes = current_catalog().classes
+        if player_class not in classes:
+            raise ValueError(f"알 수 없는 클래스입니다: {player_class}")
+        if player_id in self._tickets:
+            raise ValueError(f"이미 대기 중인 플레이어입니다: {player_id}")
+        unknown = set(accepts or ()) - set(classes)
+        if unknown:
+            raise ValueError(f"알 수 없는 클래스입니다: {', '.join(sorted(unknown))}")
+        future = asyncio.get_running_loop().create_future()
+        ticket = Ticket(player_id, player_class, float(rating), next(self._seq), self._clock(),
+                        frozenset(accepts) if accepts else None, future)
+        self._tickets[player_id] = ticket
+        self._buckets.setdefault(player_class, _Bucket()).add(ticket)
+        return future
+
+    async def join(self, player_id: str, player_class: str, rating: float,
+                   accepts: Optional[List[str]] = None) -> Match:
+        """매칭될 때까지 기다립니다. 기다리는 쪽이 취소되면 대기열에서도 빠집니다."""
+        future = self.enqueue(player_id, player_class, rating, accepts)
+        try:
+            return await future
+        except asyncio.CancelledError:
+            self.leave(player_id)
+            raise
+
+    def leave(self, player_id: str) -> bool:
+        ticket = self._tickets.pop(player_id, None)
+        if ticket is None:
+            return False
+        self._buckets[ticket.player_class].remove(ticket)
+        if not ticket.future.done():
+            ticket.future.cancel()
+        return True
+
+    def __contains__(self, player_id: str) -> bool:
+        return player_id in self._tickets
+
+    def __len__(self) -> int:
+        return len(self._tickets)
+
+    # ──────────────────────────────────────────────────────────
+    # 매칭
+    # ──────────────────────────────────────────────────────────
+    def window(self, ticket: Ticket, now: float) -> float:
+        return min(self.base_window + self.widen_per_sec * (now - ticket.enqueued_at), self.max_window)
+
+    def _find_pairs(self, now: Optional[float] = None) -> List[Tuple[Match, Tuple[Ticket, Ticket]]]:
+        """
+        오래 기다린 사람부터 짝을 찾아 대기열에서 뺍니다 (Future 는 아직 완료하지 않음).
+        기준은 먼저 온 쪽의 창(window) 입니다: 오래 기다릴수록 더 먼 레이팅까지 받아들입니다.
+        """
+        now = self._clock() if now is None else now
+        matches = []
+        for ticket in list(self._tickets.values()):
+            if ticket.player_id not in self._tickets:
+                continue  # 이번 tick 에서 이미 짝이 됨
+            window = self.window(ticket, now)
+            best, best_gap = None, None
+            for name in (ticket.accepts or list(self._buckets)):
+                bucket = self._buckets.get(name)
+                other = None if bucket is None else bucket.nearest(ticket, window)
+                if other is not None:
+                    gap = abs(other.rating - ticket.rating)
+                    if best is None or (gap, other.seq) < (best_gap, best.seq):
+                        best, best_gap = other, gap
+            if best is None:
+                continue
+            for t in (ticket, best):
+                del self._tickets[t.player_id]
+                self._buckets[t.player_class].remove(t)
+                self._waits.append(now - t.enqueued_at)
+            matches.append((Match(
+                room_id=f"{self._room_prefix}-{next(self._rooms)}",
+                players=(ticket.player_id, best.player_id),
+                classes={ticket.player_id: ticket.player_class, best.player_id: best.player_class},
+                ratings=(ticket.rating, best.rating),
+                waited=(now - ticket.enqueued_at, now - best.enqueued_at),
+            ), (ticket, best)))
+        self.matched += len(matches)
+        return matches
+
+    async def tick(self, now: Optional[float] = None) -> List[Match]:
+        """짝을 찾아 on_match 로 한꺼번에 넘기고, 성공하면 각 플레이어의 Future 를 완료합니다."""
+        found = self._find_pairs(now)
+        if not found:
+            return []
+        matches = [match for match, _ in found]
+        pending = [pair for _, pair in found]
+        try:
+            if self.on_match is not None:
+                result = self.on_match(matches)
+                if asyncio.iscoroutine(result) or isinstance(result, asyncio.Future):
+                    await result
+        except Exception as e:
+            for pair in pending:
+                for ticket in pair:
+                    if not ticket.future.done():
+                        ticket.future.set_exception(e)
+            raise
+        for match, pair in zip(matches, pending):
+            for ticket in pair:
+                if not ticket.future.done():
+                    ticket.future.set_result(match)
+        return matches
+
+    # ──────────────────────────────────────────────────────────
+    # ticker 태스크
+    # ──────────────────────────────────────────────────────────
+    def start(self) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return self._task
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.tick()
+            except Exception:
+                # 방 생성 실패는 해당 플레이어 Future 로 전달됐으므로 기록만 하고 ticker 는 계속 돕니다.
+                self.tick_errors += 1
+                logger.exception("matchmaker tick failed")
+            await asyncio.sleep(self.interval)
+
+    # ──────────────────────────────────────────────────────────
+    # 통계
+    # ──────────────────────────────────────────────────────────
+    def stats(self) -> Dict[str, object]:
+        """대기열 깊이(전체/클래스별)와 최근 매칭 대기 시간 백분위수(초)"""
+        waits = sorted(self._waits)
+        return {
+            "queue_depth": len(self._tickets),
+            "depth_by_class": {name: len(bucket.keys) for name, bucket in self._buckets.items()},
+            "matched_total": self.matched,
+            "tick_errors": self.tick_errors,
+            "wait_p50": _percentile(waits, 0.50),
+            "wait_p90": _percentile(waits, 0.90),
+            "wait_p99": _percentile(waits, 0.99),
+        }
+
+
+def _percentile(ordered: List[float], q: float) -> Optional[float]:
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+# ──────────────────────────────────────────────────────────────
+# 2️⃣ 방 생성 연결
+# ──────────────────────────────────────────────────────────────
+def room_creator(manager: GameManager, **state_options) -> Callable[[List[Match]], None]:
+    """매칭된 짝들을 GameManager 방으로 만드는 on_match 핸들러"""
+    def create_rooms(matches: List[Match]) -> None:
+        for match in matches:
+            manager.create_room(match.room_id, list(match.players), dict(match.classes), **state_options)
+    return create_rooms
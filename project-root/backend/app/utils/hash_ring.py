@@ -0,0 +1,74 @@
+# 일관된 해싱 링 유틸리티
+
+# project-root/backend/app/utils/hash_ring.py
+#
+# 방 ID → 워커 이름. 워커마다 가상 노드(replicas 개)를 링 위에 흩어 두고,
+# 키의 해시보다 크거나 같은 첫 가상 노드의 주인이 담당합니다 (bisect 한 번).
+# 워커가 늘거나 줄면 그 워커 몫의 키(약 1/N)만 주인이 바뀝니다.
+#
+# 파이썬 내장 hash() 는 프로세스마다 달라지므로 blake2b 로 고정된 해시를 씁니다.
+import hashlib
+from bisect import bisect_left
+from typing import Dict, Iterable, List
+
+
+def stable_hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    def __init__(self, nodes: Iterable[str] = (), replicas: int = 128):
+        self.replicas = replicas
+        self._points: List[int] = []
+        self._owners: List[str] = []
+        self._nodes: List[str] = []
+        for node in nodes:
+            self.add(node)
+
+    @property
+    def nodes(self) -> List[str]:
+        return list(self._nodes)
+
+    def add(self, node: str) -> None:
+        if node in self._nodes:
+            raise ValueError(f"이미 링에 있는 노드입니다: {node}")
+        self._nodes.append(node)
+        for i in range(self.replicas):
+            point = stable_hash(f"{node}#{i}")
+            j = bisect_left(self._points, point)
+            self._points.insert(j, point)
+            self._owners.insert(j, node)
+
+    def remove(self, node: str) -> None:
+        if node not in self._nodes:
+            raise KeyError(node)
+        self._nodes.remove(node)
+        kept = [(p, o) for p, o in zip(self._points, self._owners) if o != node]
+        self._points = [p for p, _ in kept]
+        self._owners = [o for _, o in kept]
+
+    def node_for(self, key: str) -> str:
+        if not self._points:
+            raise LookupError("링에 노드가 없습니다.")
+        i = bisect_left(self._points, stable_hash(key))
+        return self._owners[i if i < len(self._points) else 0]
+
+    def copy(self) -> "HashRing":
+        clone = HashRing(replicas=self.replicas)
+        clone._points = list(self._points)
+        clone._owners = list(self._owners)
+        clone._nodes = list(self._nodes)
+        return clone
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+
+def moved_keys(before: HashRing, after: HashRing, keys: Iterable[str]) -> Dict[str, str]:
+    """주인이 바뀌는 키 → 새 주인 (재배치 계획)"""
+    plan = {}
+    for key in keys:
+        target = after.node_for(key)
+        if before.node_for(key) != target:
+            plan[key] = target
+    return plan
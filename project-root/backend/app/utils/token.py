@@ -1 +1,143 @@
-# 토큰 생성 등 유틸리티
\ No newline at end of file
+# 토큰 생성 등 유틸리티
+
+# project-root/backend/app/utils/token.py
+#
+# 저장소 조회 없이 검증하는 세션 토큰 (HMAC-SHA256 서명)
+#   토큰 = base64url(payload) "." base64url(서명 16바이트)
+#   payload = "player_id|room_id|만료(유닉스 초)|토큰 ID"
+#
+# 소켓 메시지마다 검증하므로 핫패스 비용을 줄입니다.
+#   - 최근 검증한 토큰은 크기 제한 LRU 캐시에 두고, 다시 오면 HMAC/디코딩 없이 만료와 폐기만 확인
+#   - 폐기 목록은 토큰 ID → 만료 시각 dict (확인 O(1)), 만료가 지난 항목은 주기적으로 정리
+import base64
+import hashlib
+import hmac
+import secrets
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, NamedTuple, Optional, Union
+
+SIGNATURE_BYTES = 16
+SEPARATOR = "|"
+
+
+class TokenError(ValueError):
+    """형식이 틀리거나, 서명이 맞지 않거나, 만료/폐기된 토큰"""
+
+
+class TokenClaims(NamedTuple):
+    player_id: str
+    room_id: str
+    expires_at: int
+    token_id: str
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+class TokenService:
+    """
+    토큰 발급/검증/폐기. 서버 프로세스마다 같은 secret 을 쓰면 어느 프로세스에서든 검증됩니다.
+    cache_size 는 동시에 접속한 세션 수 정도면 충분합니다.
+    """
+
+    def __init__(self, secret: Union[str, bytes], ttl: int = 3600, cache_size: int = 4096,
+                 clock: Callable[[], float] = time.time):
+        if isinstance(secret, str):
+            secret = secret.encode("utf-8")
+        if not secret:
+            raise ValueError("토큰 서명 키가 비어 있습니다.")
+        self._mac = hmac.new(secret, digestmod=hashlib.sha256)  # 키를 미리 넣어 둔 원본 (copy() 해서 씀)
+        self.ttl = ttl
+        self.cache_size = cache_size
+        self._clock = clock
+        self._cache: "OrderedDict[str, TokenClaims]" = OrderedDict()
+        self._revoked: Dict[str, int] = {}  # 토큰 ID → 만료 시각
+        self._next_prune = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    # ──────────────────────────────────────────────────────────
+    # 1️⃣ 발급
+    # ──────────────────────────────────────────────────────────
+    def issue(self, player_id: str, room_id: str, ttl: Optional[int] = None) -> str:
+        for value in (player_id, room_id):
+            if not value or SEPARATOR in value:
+                raise ValueError(f"토큰에 넣을 수 없는 값입니다: {value!r}")
+        expires_at = int(self._clock()) + (self.ttl if ttl is None else ttl)
+        payload = SEPARATOR.join((player_id, room_id, str(expires_at), secrets.token_hex(8))).encode("utf-8")
+        return f"{_b64encode(payload)}.{_b64encode(self._sign(payload))}"
+
+    def _sign(self, payload: bytes) -> bytes:
+        mac = self._mac.copy()
+        mac.update(payload)
+        return mac.digest()[:SIGNATURE_BYTES]
+
+    # ──────────────────────────────────────────────────────────
+    # 2️⃣ 검증
+    # ──────────────────────────────────────────────────────────
+    def verify(self, token: str, room_id: Optional[str] = None) -> TokenClaims:
+        """토큰의 클레임을 반환합니다. room_id 를 주면 그 방의 토큰인지도 확인합니다. 실패하면 TokenError."""
+        claims = self._cache.get(token)
+        if claims is not None:
+            self.hits += 1
+            self._cache.move_to_end(token)
+        else:
+            self.misses += 1
+            claims = self._decode(token)
+        if claims.expires_at <= self._clock():
+            self._cache.pop(token, None)
+            raise TokenError("만료된 토큰입니다.")
+        if claims.token_id in self._revoked:
+            raise TokenError("폐기된 토큰입니다.")
+        if room_id is not None and claims.room_id != room_id:
+            raise TokenError("다른 방의 토큰입니다.")
+        if token not in self._cache:
+            self._cache[token] = claims
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return claims
+
+    def _decode(self, token: str) -> TokenClaims:
+        try:
+            body, signature = token.split(".")
+            payload = _b64decode(body)
+            given = _b64decode(signature)
+        except (ValueError, AttributeError):
+            raise TokenError("잘못된 토큰 형식입니다.") from None
+        if not hmac.compare_digest(given, self._sign(payload)):
+            raise TokenError("서명이 맞지 않는 토큰입니다.")
+        try:
+            player_id, room_id, expires_at, token_id = payload.decode("utf-8").split(SEPARATOR)
+            return TokenClaims(player_id, room_id, int(expires_at), token_id)
+        except ValueError:
+            raise TokenError("잘못된 토큰 형식입니다.") from None
+
+    # ──────────────────────────────────────────────────────────
+    # 3️⃣ 폐기
+    # ──────────────────────────────────────────────────────────
+    def revoke(self, token: Union[str, TokenClaims]) -> None:
+        """토큰(또는 verify 결과)을 폐기합니다. 만료가 지나면 폐기 목록에서도 저절로 빠집니다."""
+        claims = token if isinstance(token, TokenClaims) else self._decode(token)
+        self._revoked[claims.token_id] = claims.expires_at
+        self._prune()
+
+    def is_revoked(self, token_id: str) -> bool:
+        return token_id in self._revoked
+
+    def _prune(self) -> None:
+        now = self._clock()
+        if now < self._next_prune:
+            return
+        self._next_prune = now + 60
+        expired = [token_id for token_id, expires_at in self._revoked.items() if expires_at <= now]
+        for token_id in expired:
+            del self._revoked[token_id]
+
+    def stats(self) -> Dict[str, int]:
+        return {"cached": len(self._cache), "revoked": len(self._revoked), "hits": self.hits, "misses": self.misses}
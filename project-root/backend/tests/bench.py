@@ -0,0 +1,326 @@
+# 엔진 성능 벤치마크 logic
+
+# project-root/backend/tests/bench.py
+#
+# 사용 예 (project-root 에서 실행):
+#   python -m backend.tests.bench --out bench.json
+#   python -m backend.tests.bench --compare backend/tests/bench_baseline.json
+#   python -m backend.tests.bench --runs 5 --out backend/tests/bench_baseline.json   # 기준값 갱신
+#
+# 측정 항목
+#   - 명령 단위 지연 (µs/op): play_card(재물/액션), buy_card, _end_turn, DeckManager.draw
+#   - 한 판 처리량 (games/s): 로그 켠 기본 설정으로 debug 끔 / 켬
+#   - GameState 메모리 (bytes): 셋업 직후, 한 판 진행 후 (로그 포함)
+#
+# 잡음이 많은 머신에서도 비교할 수 있도록 각 항목은 여러 번 반복해서 가장 좋은 값(min)을 씁니다.
+# 시간 항목은 반복마다 바로 앞에서 보정 작업도 함께 재서(교차 측정) 그 항목의 calibration_us 로 남깁니다.
+# 비교할 때는 항목마다 같은 시간대에 잰 보정값의 비율로 나누므로, 실행 중간에 CPU 속도가 바뀌어도 덜 흔들립니다.
+# 같은 머신에서도 프로세스마다(메모리 배치 / 해시 시드) 결과가 다르므로, --runs 2 이상이면 매번 새 프로세스에서 재고
+# 항목별 중앙값과 흔들림 폭(noise)을 남깁니다. 비교는 tolerance 에 기준값 / 현재 중 큰 noise 를 더한 폭을 넘을 때만 회귀입니다.
+# 기준값 파일은 측정한 머신에서만 의미가 있으므로, 머신을 바꾸면 다시 만들어 커밋하세요.
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+from backend.app.core import persist
+from backend.app.core.ai import play_turn, smart_ai_decision
+from backend.app.core.engine import Engine, GameState, Phase
+
+BENCH_FORMAT = 2
+PLAYER_IDS = ["User_A", "User_B"]
+CLASSES = {"User_A": "Warrior", "User_B": "Mage"}
+
+# 기준값 대비 이 비율 이상 나빠지면 회귀로 판정 (여기에 측정 흔들림 폭이 더해짐)
+DEFAULT_TOLERANCE = 0.25
+# 전체 측정 횟수 기본값 (각각 새 프로세스)
+DEFAULT_RUNS = 3
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# ──────────────────────────────────────────────────────────────
+# 1️⃣ 측정 도구
+# ──────────────────────────────────────────────────────────────
+def _metric(value: float, unit: str, better: str, calibration: Optional[float] = None) -> Dict:
+    metric = {"value": round(value, 3), "unit": unit, "better": better}
+    if calibration is not None:
+        metric["calibration_us"] = round(calibration, 3)
+    return metric
+
+
+@contextmanager
+def _no_gc():
+    """측정 구간에서는 GC 를 멈춥니다 (timeit 과 같은 방식)."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _new_engine(seed: int = 0, debug: bool = False) -> Engine:
+    state = GameState(list(PLAYER_IDS), debug=debug, seed=seed)
+    engine = Engine(state)
+    engine.setup_game(dict(CLASSES))
+    return engine
+
+
+def _op_latency(prepare: Callable[[], Engine], op: Callable[[Engine], object],
+                count: int, repeat: int) -> Tuple[float, float]:
+    """
+    prepare() 로 만든 엔진 count 개에 op 를 한 번씩 실행해 1회 평균 µs 를 잽니다.
+    준비(상태 복원)는 측정 구간 밖에서 하고, repeat 번 중 최솟값을 씁니다.
+    (µs, 같은 반복들 사이사이에 잰 보정 작업 µs) 를 반환합니다.
+    """
+    best = calibration = float("inf")
+    for _ in range(repeat):
+        engines = [prepare() for _ in range(count)]
+        calibration = min(calibration, _calibrate_once())
+        with _no_gc():
+            started = time.perf_counter()
+            for engine in engines:
+                op(engine)
+            best = min(best, (time.perf_counter() - started) / count)
+    return best * 1e6, calibration
+
+
+def _fixture(hand: List[str], phase: Phase, gold: int = 0) -> Callable[[], Engine]:
+    """손패/페이즈를 고정한 상태를 한 번 만들고, 이후에는 바이너리 덤프에서 복원합니다."""
+    engine = _new_engine()
+    state = engine.state
+    player = state.players[state.turn_owner]
+    player["hand"] = hand
+    player.gold = gold
+    state.phase = phase
+    data = persist.dump(state)
+    return lambda: Engine(persist.load(data))
+
+
+def _full_game(debug: bool, seed: int, max_turns: int = 20) -> GameState:
+    random.seed(seed)
+    engine = _new_engine(seed, debug)
+    state = engine.state
+    while not state.is_game_over and state.turn_count <= max_turns:
+        play_turn(engine, state.turn_owner, smart_ai_decision)
+    return state
+
+
+def _throughput(debug: bool, games: int, repeat: int) -> Tuple[float, float]:
+    """(games/s, 같은 반복들 사이사이에 잰 보정 작업 µs)"""
+    best = calibration = float("inf")
+    for _ in range(repeat):
+        calibration = min(calibration, _calibrate_once())
+        with _no_gc():
+            started = time.perf_counter()
+            for seed in range(games):
+                _full_game(debug, seed)
+            best = min(best, time.perf_counter() - started)
+    return games / best, calibration
+
+
+def _calibration_work():
+    table = {}
+    for i in range(2000):
+        table[i & 63] = table.get(i & 63, 0) + i
+        items = [i, i + 1, i + 2]
+        items.append(len(items))
+        items.pop(0)
+    return table
+
+
+def _calibrate_once(rounds: int = 3) -> float:
+    """
+    엔진과 무관한 고정 작업(dict/list/속성 접근 위주)의 µs (rounds 번 중 최솟값).
+    같은 머신이라도 시간대마다 CPU 속도가 달라지므로, 각 측정 반복 바로 앞에서 불러 그 항목의 보정값으로 씁니다.
+    """
+    best = float("inf")
+    for _ in range(rounds):
+        with _no_gc():
+            started = time.perf_counter()
+            _calibration_work()
+            best = min(best, time.perf_counter() - started)
+    return best * 1e6
+
+
+def _memory(make: Callable[[int], object], count: int) -> float:
+    """make(i) 로 만든 객체 count 개가 차지하는 평균 바이트 (tracemalloc 기준)"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = [make(i) for i in range(count)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del kept
+    return (after - before) / count
+
+
+# ──────────────────────────────────────────────────────────────
+# 2️⃣ 벤치마크 실행
+# ──────────────────────────────────────────────────────────────
+def run(quick: bool = False) -> Dict:
+    """모든 항목을 측정해 JSON 직렬화 가능한 dict 로 반환합니다. quick=True 면 반복 횟수를 줄입니다."""
+    count, repeat, games = (50, 2, 3) if quick else (200, 30, 40)
+    pid = PLAYER_IDS[0]
+
+    latency_ops = {
+        "play_card_treasure_us": (_fixture(["Copper"] * 5, Phase.ACTION), lambda e: e.play_card(pid, "Copper")),
+        "play_card_action_us": (_fixture(["Village", "Copper", "Copper", "Estate", "Copper"], Phase.ACTION),
+                                lambda e: e.play_card(pid, "Village")),
+        "buy_card_us": (_fixture([], Phase.BUY, gold=6), lambda e: e.buy_card(pid, "Silver")),
+        "end_turn_us": (_fixture(["Copper"] * 5, Phase.BUY), lambda e: e._end_turn()),
+        "draw_5_us": (_fixture([], Phase.ACTION), lambda e: e.deck_managers[pid].draw(5)),
+    }
+    metrics = {}
+    for name, (prepare, op) in latency_ops.items():
+        value, calibration = _op_latency(prepare, op, count, repeat)
+        metrics[name] = _metric(value, "us", "lower", calibration)
+
+    for debug in (False, True):
+        key = "game_debug_on_per_s" if debug else "game_debug_off_per_s"
+        value, calibration = _throughput(debug, games, repeat)
+        metrics[key] = _metric(value, "games/s", "higher", calibration)
+
+    # 메모리는 잡음이 없으므로 quick 여부와 상관없이 같은 표본을 씁니다.
+    metrics["state_setup_bytes"] = _metric(
+        _memory(lambda seed: _new_engine(seed).state, 200), "bytes", "lower")
+    metrics["state_after_game_bytes"] = _metric(
+        _memory(lambda seed: _full_game(False, seed), 20), "bytes", "lower")
+
+    return {
+        "format": BENCH_FORMAT,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "quick": quick,
+        # 항목별 보정값의 중앙값 (참고용, 비교는 항목별 값으로 함)
+        "calibration_us": round(statistics.median(
+            m["calibration_us"] for m in metrics.values() if "calibration_us" in m), 3),
+        "metrics": metrics,
+    }
+
+
+def run_isolated(quick: bool = False) -> Dict:
+    """새 인터프리터에서 run() 을 한 번 실행합니다 (프로세스마다 달라지는 차이까지 표본에 넣기 위해)."""
+    command = [sys.executable, "-m", "backend.tests.bench", "--runs", "1", "--out", "-"]
+    if quick:
+        command.append("--quick")
+    out = subprocess.run(command, cwd=PROJECT_ROOT, check=True, capture_output=True, text=True).stdout
+    return json.loads(out)
+
+
+def median_of(results: List[Dict]) -> Dict:
+    """
+    여러 번 실행한 결과를 항목별 중앙값으로 합칩니다 (머신 상태가 튀는 실행을 걸러냄).
+    noise 는 실행 사이의 흔들림 폭 (최댓값 - 최솟값) / 중앙값 입니다. 실행이 하나면 0.
+    """
+    merged = dict(results[0], metrics={})
+    merged["calibration_us"] = round(statistics.median(r["calibration_us"] for r in results), 3)
+    for name, first in results[0]["metrics"].items():
+        values = [r["metrics"][name]["value"] for r in results]
+        value = statistics.median(values)
+        noise = (max(values) - min(values)) / value if value else 0.0
+        merged["metrics"][name] = dict(first, value=round(value, 3), noise=round(noise, 3))
+        if "calibration_us" in first:
+            calibration = statistics.median(r["metrics"][name]["calibration_us"] for r in results)
+            merged["metrics"][name]["calibration_us"] = round(calibration, 3)
+    return merged
+
+
+# ──────────────────────────────────────────────────────────────
+# 3️⃣ 기준값 비교
+# ──────────────────────────────────────────────────────────────
+def compare(current: Dict, baseline: Dict, tolerance: float = DEFAULT_TOLERANCE,
+            normalize: bool = True) -> List[Dict]:
+    """
+    기준값에 있는 항목마다 {name, baseline, current, change, band, regressed} 를 반환합니다.
+    change 는 '나빠진 비율' (0.1 = 10% 느려짐/커짐, 음수면 개선), band 는 tolerance + 기준값 / 현재 중 큰 noise 이고
+    change 가 band 를 넘으면 회귀입니다.
+    normalize=True 면 시간 항목을 보정 작업의 속도 차이만큼 나눠서 비교합니다. 보정값은 항목마다 그 항목과
+    번갈아 잰 calibration_us 를 쓰고, 항목에 없으면(이전 형식) 전체 calibration_us 를 씁니다.
+    """
+    rows = []
+    for name, base in baseline["metrics"].items():
+        now = current["metrics"].get(name)
+        if now is None:
+            continue
+        speed = 1.0  # 현재 측정이 기준값을 만들 때보다 느린 정도
+        if normalize:
+            now_cal = now.get("calibration_us") or current.get("calibration_us")
+            base_cal = base.get("calibration_us") or baseline.get("calibration_us")
+            if now_cal and base_cal:
+                speed = now_cal / base_cal
+        if base["better"] == "higher":
+            value = now["value"] * (speed if base["unit"] == "games/s" else 1.0)
+            change = base["value"] / value - 1 if value else float("inf")
+        else:
+            value = now["value"] / (speed if base["unit"] == "us" else 1.0)
+            change = value / base["value"] - 1 if base["value"] else 0.0
+        band = tolerance + max(base.get("noise", 0.0), now.get("noise", 0.0))
+        rows.append({"name": name, "unit": base["unit"], "baseline": base["value"],
+                     "current": now["value"], "change": change, "band": band, "regressed": change > band})
+    return rows
+
+
+def format_rows(rows: List[Dict]) -> str:
+    lines = [f"{'항목':<24} {'기준값':>12} {'현재':>12} {'변화':>8} {'허용':>8}"]
+    for row in rows:
+        mark = "  << 회귀" if row["regressed"] else ""
+        lines.append(f"{row['name']:<24} {row['baseline']:>12} {row['current']:>12} "
+                     f"{row['change']:>+8.1%} {row['band']:>8.1%}{mark}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="엔진 성능 벤치마크")
+    parser.add_argument("--out", default=None, help="결과 JSON 파일 ('-'는 stdout)")
+    parser.add_argument("--compare", default=None, help="비교할 기준값 JSON 파일")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"회귀로 볼 악화 비율 (기본 {DEFAULT_TOLERANCE})")
+    parser.add_argument("--no-normalize", action="store_true", help="보정 작업 속도로 시간 항목을 보정하지 않음")
+    parser.add_argument("--quick", action="store_true", help="반복 횟수를 줄여 빠르게 실행")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS,
+                        help=f"전체 측정 횟수 (기본 {DEFAULT_RUNS}). 2 이상이면 매번 새 프로세스에서 재고 항목별 중앙값을 씀")
+    args = parser.parse_args(argv)
+
+    if args.runs <= 1:
+        result = median_of([run(quick=args.quick)])
+    else:
+        result = median_of([run_isolated(quick=args.quick) for _ in range(args.runs)])
+    text = json.dumps(result, indent=2, ensure_ascii=False)
+    if args.out == "-":
+        print(text)
+    elif args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+    if not args.compare:
+        if not args.out:
+            print(text)
+        return 0
+    with open(args.compare, encoding="utf-8") as f:
+        baseline = json.load(f)
+    rows = compare(result, baseline, args.tolerance, normalize=not args.no_normalize)
+    if not args.no_normalize:
+        print(f"보정 작업: 기준값 {baseline.get('calibration_us')} µs, 현재 {result['calibration_us']} µs",
+              file=sys.stderr)
+    print(format_rows(rows), file=sys.stderr)
+    regressed = [row["name"] for row in rows if row["regressed"]]
+    if regressed:
+        print(f"회귀 {len(regressed)}건: {', '.join(regressed)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1 +1,1350 @@
-# 로직 테스트
\ No newline at end of file
+import sys
+import os
+
+import pytest
+
+# 프로젝트 루트 경로 추가 (backend 디렉토리가 보이도록)
+sys.path.append(os.getcwd())
+
+from backend.app.core.engine import GameState, Engine, Phase
+from backend.app.core.card import CARD_DB, CLASS_DB
+from backend.app.core import simulator
+from backend.app.core.event_log import EventLog
+from backend.app.core.manager import GameManager
+
+
+# ──────────────────────────────────────────────────────────────
+# 시뮬레이터
+# ──────────────────────────────────────────────────────────────
+def test_simulator_disables_logs_and_aggregates():
+    result = simulator.play_game(("Warrior", "Mage"), seed=1)
+    assert result.classes == ("Warrior", "Mage")
+    assert 1 <= result.turns <= 20
+
+    stats = simulator.simulate(20, workers=1, seed=7)
+    assert stats.games == 20
+    assert sum(r["games"] for r in stats.win_rates().values()) == 20
+
+
+def test_simulator_is_reproducible_per_seed():
+    a = simulator.play_game(("Priest", "Warrior"), seed=42)
+    b = simulator.play_game(("Priest", "Warrior"), seed=42)
+    assert a == b
+
+
+def test_logging_off_keeps_logs_empty():
+    state = GameState(["User_A", "User_B"], log_enabled=False)
+    engine = Engine(state)
+    engine.setup_game({"User_A": "Warrior", "User_B": "Priest"})
+    engine.play_card("User_A", state.players["User_A"]["hand"][0])
+    assert state.logs == []
+
+
+# ──────────────────────────────────────────────────────────────
+# 슬롯 기반 PlayerState
+# ──────────────────────────────────────────────────────────────
+def test_player_state_dict_view_matches_attributes():
+    state = GameState(["User_A", "User_B"])
+    engine = Engine(state)
+    engine.setup_game({"User_A": "Mage", "User_B": "Priest"})
+    p = state.players["User_A"]
+
+    assert p["hp"] == p.hp == CLASS_DB["Mage"]["hp"]
+    assert len(p["hand"]) == 5 and len(p["deck"]) == 7
+    assert sorted(p["deck"] + p["hand"]) == sorted(CLASS_DB["Mage"]["initial_deck"])
+    assert dict(p["private_market"]) == CLASS_DB["Mage"]["private_market"]
+
+    p["gold"] = 7
+    p["hand"].append("Gold")
+    assert p.gold == 7 and "Gold" in p.hand
+    p["hand"] = []
+    assert p.hand == [] and p.get("missing", 0) == 0
+
+
+def test_draw_reshuffles_discard_like_a_list():
+    state = GameState(["User_A", "User_B"])
+    engine = Engine(state)
+    p = state.players["User_A"]
+    p["deck"] = ["Copper", "Silver"]
+    p["discard"] = ["Gold", "Estate", "Duchy"]
+
+    drawn = engine.deck_managers["User_A"].draw(4)
+    assert drawn == 4
+    assert p["hand"][:2] == ["Silver", "Copper"]  # 덱 맨 위(끝)부터
+    assert sorted(p["hand"][2:] + p["deck"]) == ["Duchy", "Estate", "Gold"]
+    assert p["discard"] == []
+
+
+# ──────────────────────────────────────────────────────────────
+# 구조화 이벤트 로그
+# ──────────────────────────────────────────────────────────────
+def test_logs_are_rendered_on_read():
+    state = GameState(["User_A", "User_B"])
+    engine = Engine(state)
+    engine.setup_game({"User_A": "Warrior", "User_B": "Warrior"})
+    state.phase = Phase.BUY
+    state.players["User_A"]["gold"] = 3
+    engine.buy_card("User_A", "Silver")
+    engine.buy_card("User_A", "Silver")
+
+    record = list(state.logs.records())[-2]
+    assert (record.code, record.player_id, record.args) == ("BUY_COMMON", "User_A", ("Silver",))
+    assert state.logs[-2] == "✨ User_A: 🛒 '공동 마켓'에서 Silver을(를) 구매했습니다."
+    assert state.logs[-1].startswith("❌ User_A: 남은 구매 횟수가 없습니다.")
+
+
+def test_event_log_ring_buffer_spills_evicted_records(tmp_path):
+    log = EventLog(capacity=3, spill_path=str(tmp_path / "spill.jsonl"))
+    for i in range(5):
+        log.append("DRAW", "User_A", (i,))
+
+    assert len(log) == 3 and log.dropped == 2
+    assert [r.seq for r in log.records()] == [2, 3, 4]
+    assert [r.args for r in log.spilled_records()] == [(0,), (1,)]
+    log.close()
+
+
+# ──────────────────────────────────────────────────────────────
+# 증분 디버그 스냅샷
+# ──────────────────────────────────────────────────────────────
+def test_diff_snapshots_rebuild_full_state_at_any_seq():
+    from backend.app.core.snapshot import SnapshotTracker
+
+    state = GameState(["User_A", "User_B"], debug=True)
+    state.snapshots = SnapshotTracker(keyframe_interval=2)  # 구간 경계를 자주 넘도록
+    engine = Engine(state)
+    engine.setup_game({"User_A": "Warrior", "User_B": "Priest"})
+
+    expected = {}
+    for _ in range(3):
+        for card in list(state.players[state.turn_owner]["hand"]):
+            engine.play_card(state.turn_owner, card)
+            expected[state.logs.next_seq] = engine.debug_snapshot()
+        engine.next_phase()
+        engine.next_phase()
+        expected[state.logs.next_seq] = engine.debug_snapshot()
+
+    for seq, text in expected.items():
+        assert engine.debug_snapshot(seq=seq) == text
+
+    diffs = [r for r in state.logs.records() if r.code == "SNAPSHOT_DIFF"]
+    assert diffs and all(len(r.args[1]) < 10 for r in diffs[2:])  # 셋업 이후엔 바뀐 필드만
+
+
+# ──────────────────────────────────────────────────────────────
+# 방 매니저
+# ──────────────────────────────────────────────────────────────
+def test_game_manager_runs_commands_and_evicts_idle_rooms():
+    now = [0.0]
+    evicted = []
+    manager = GameManager(shards=4, ttl=60, clock=lambda: now[0], on_evict=evicted.append)
+    manager.create_room("room-1", ["User_A", "User_B"], {"User_A": "Warrior", "User_B": "Mage"})
+    manager.create_room("room-2", ["User_C", "User_D"])
+
+    assert manager.execute("room-1", "next_phase") is None
+    assert manager.get_room("room-1").state.phase == Phase.BUY
+
+    now[0] = 50.0
+    manager.execute("room-2", "next_phase")
+    now[0] = 100.0
+    assert manager.evict_idle() == ["room-1"]
+    assert [room.room_id for room in evicted] == ["room-1"]
+    assert "room-1" not in manager and "room-2" in manager
+
+    stats = manager.stats()
+    assert stats["live_rooms"] == 1 and stats["commands_total"] == 2
+
+
+# ──────────────────────────────────────────────────────────────
+# 상태 delta / 게임 소켓
+# ──────────────────────────────────────────────────────────────
+def test_deltas_are_versioned_per_accepted_command():
+    state = GameState(["User_A", "User_B"], record_deltas=True)
+    engine = Engine(state)
+    engine.setup_game({"User_A": "Warrior", "User_B": "Mage"})
+
+    assert engine.play_card("User_B", "Village")[0] is False
+    assert state.version == 0 and engine.deltas_since(0) == []
+
+    engine.next_phase()
+    engine.next_phase()  # 턴 종료까지 하나의 delta
+    deltas = engine.deltas_since(0)
+    assert [d["v"] for d in deltas] == [1, 2] and state.version == 2
+    assert deltas[0]["game"] == {"phase": "BUY"}
+    end_turn = deltas[1]
+    assert end_turn["game"]["owner"] == "User_B"
+    assert [m[1:3] for m in end_turn["moves"]] == [["hand", "discard"], ["deck", "hand"]]
+    assert end_turn["sizes"]["User_A"] == {"hand": 5, "deck": 0, "discard": 5, "play_mat": 0}
+    assert engine.deltas_since(1) == [end_turn]
+
+    engine.deltas.popleft()  # 오래된 delta 가 버려지면 재동기화 필요
+    assert engine.deltas_since(0) is None
+    assert engine.full_state()["v"] == 2
+
+
+def test_game_channel_broadcasts_deltas_in_order():
+    import asyncio
+    import json
+    from backend.app.socket.game import GameChannel
+
+    manager = GameManager(shards=1)
+    manager.create_room("room-1", ["User_A", "User_B"])
+    channel = GameChannel(manager, "room-1")
+    inbox = {"a": [], "spectator": []}
+
+    def sender(name):
+        async def send(raw):
+            inbox[name].append(json.loads(raw))
+        return send
+
+    async def scenario():
+        a = await channel.join("User_A", sender("a"))
+        spectator = await channel.join(None, sender("spectator"))
+        await channel.handle(a, json.dumps({"type": "command", "id": 1, "cmd": "next_phase", "args": []}))
+        await channel.handle(spectator, json.dumps({"type": "command", "id": 2, "cmd": "next_phase", "args": []}))
+        await channel.handle(spectator, json.dumps({"type": "resync", "since": 0}))
+        await channel.drain()  # 관전자는 송신 태스크가 보냄
+
+    asyncio.run(scenario())
+    assert [m["type"] for m in inbox["a"]] == ["sync", "result", "delta"]
+    assert inbox["a"][1]["ok"] is True and inbox["a"][2]["delta"]["v"] == 1
+    assert [m["type"] for m in inbox["spectator"]] == ["sync", "delta", "result", "delta"]
+    assert inbox["spectator"][2]["ok"] is False
+
+
+def test_game_channel_hides_other_hands():
+    import asyncio
+    import json
+    from backend.app.socket.game import GameChannel
+
+    manager = GameManager(shards=1)
+    manager.create_room("room-1", ["User_A", "User_B"])
+    channel = GameChannel(manager, "room-1")
+    inbox = {"a": [], "b": [], "spectator": []}
+
+    def sender(name):
+        async def send(raw):
+            inbox[name].append(json.loads(raw))
+        return send
+
+    async def scenario():
+        a = await channel.join("User_A", sender("a"))
+        await channel.join("User_B", sender("b"))
+        spectator = await channel.join(None, sender("spectator"))
+        for i in (1, 2):  # 턴 종료: A 가 새 손패 5장을 드로우
+            await channel.handle(a, json.dumps({"type": "command", "id": i, "cmd": "next_phase", "args": []}))
+        await channel.handle(spectator, json.dumps({"type": "resync", "since": 0}))
+
+    asyncio.run(scenario())
+    sync_a, sync_b, sync_spectator = inbox["a"][0], inbox["b"][0], inbox["spectator"][0]
+    assert isinstance(sync_a["state"]["players"]["User_A"]["hand"], list)
+    assert sync_a["state"]["players"]["User_B"]["hand"] == 5
+    assert sync_b["state"]["players"]["User_A"]["hand"] == 5
+    assert all(isinstance(p["hand"], int) for p in sync_spectator["state"]["players"].values())
+
+    def draws(name):
+        return [move[3] for m in inbox[name] if m["type"] == "delta"
+                for move in m["delta"].get("moves", []) if move[2] == "hand"]
+    assert len(draws("a")) == 1 and len(draws("a")[0]) == 5
+    assert draws("b") == [5]
+    assert draws("spectator") == [5, 5]  # 브로드캐스트 + resync 모두 장수만
+
+
+def test_buy_card_is_refused_outside_own_turn():
+    import asyncio
+    import json
+    from backend.app.socket.game import GameChannel
+
+    manager = GameManager(shards=1)
+    manager.create_room("room-1", ["User_A", "User_B"])
+    channel = GameChannel(manager, "room-1")
+    inbox = []
+
+    async def scenario():
+        a = await channel.join("User_A", lambda raw: asyncio.sleep(0))
+        b = await channel.join("User_B", lambda raw: asyncio.sleep(0, inbox.append(json.loads(raw))))
+        await channel.handle(a, json.dumps({"type": "command", "id": 1, "cmd": "next_phase", "args": []}))
+        await channel.handle(b, json.dumps({"type": "command", "id": 2, "cmd": "buy_card", "args": ["Copper"]}))
+
+    asyncio.run(scenario())
+    result = [m for m in inbox if m["type"] == "result"][0]
+    assert result["ok"] is False and "본인의 턴" in result["error"]
+    player = channel.engine.state.players["User_B"]
+    assert player.buys == 1 and "Copper" not in player.discard
+    assert channel.engine.buy_card("User_B", "Copper")[0] is False  # 엔진에서도 거절
+
+
+def test_game_channel_replies_error_to_malformed_messages():
+    import asyncio
+    import json
+    from backend.app.socket.game import GameChannel
+
+    manager = GameManager(shards=1)
+    manager.create_room("room-1", ["User_A", "User_B"])
+    channel = GameChannel(manager, "room-1")
+    inbox = []
+    malformed = [
+        {"type": "logs", "since": "x"},
+        {"type": "logs", "since": 0, "limit": -5},
+        {"type": "logs", "limit": 0, "follow": True},
+        {"type": "resync", "since": -1},
+        {"type": "command", "id": 1, "cmd": "buy_card", "args": 5},
+        {"type": "command", "id": 2, "cmd": ["buy_card"], "args": []},
+        {"type": "command", "id": 3, "cmd": "buy_card", "args": [["Copper"]]},
+    ]
+
+    async def scenario():
+        a = await channel.join("User_A", lambda raw: asyncio.sleep(0, inbox.append(json.loads(raw))))
+        for message in malformed:
+            await channel.handle(a, json.dumps(message))
+
+    asyncio.run(scenario())
+    assert [m["type"] for m in inbox] == ["sync"] + ["error"] * len(malformed)
+    assert channel.engine.state.version == 0
+
+
+# ──────────────────────────────────────────────────────────────
+# 바이너리 저장 / 복원
+# ──────────────────────────────────────────────────────────────
+def test_dump_load_round_trips_exactly():
+    import json
+    from backend.app.core import persist
+    from backend.app.core.delta import full_state
+
+    state = GameState(["User_A", "User_B"], record_deltas=True)
+    engine = Engine(state)
+    engine.setup_game({"User_A": "Warrior", "User_B": "Mage"})
+    for _ in range(5):
+        engine.next_phase()
+        engine.next_phase()
+    state.players["User_B"].private_market["HolyLight"] = 0
+    state.rng.random()
+    assert len(persist.dump(state)) < len(json.dumps([full_state(state), state.rng.getstate()])) / 2
+
+    data = persist.dump(state)
+    restored = persist.load(data)
+    assert full_state(restored) == full_state(state)
+    assert [list(restored.players[pid].deck) for pid in state.player_ids] == \
+           [list(state.players[pid].deck) for pid in state.player_ids]  # 덱 순서까지 보존
+    assert persist.dump(restored) == data
+    assert restored.rng.random() == state.rng.random()
+
+    import pytest
+    with pytest.raises(persist.StateFormatError):
+        persist.load(data[:-10])
+
+    # 시드는 u64 로 저장: 범위 밖 시드는 만들 때 거절, 경계값은 그대로 왕복
+    for seed in (-1, 2 ** 64, "7", True):
+        with pytest.raises(ValueError):
+            GameState(["User_A", "User_B"], seed=seed)
+    edge = GameState(["User_A", "User_B"], seed=2 ** 64 - 1)
+    assert persist.load(persist.dump(edge)).seed == 2 ** 64 - 1
+
+
+# ──────────────────────────────────────────────────────────────
+# 시드 + 액션 기록 리플레이
+# ──────────────────────────────────────────────────────────────
+def test_replay_rebuilds_game_from_seed_and_actions():
+    import json
+    from backend.app.core import persist
+    from backend.app.core.ai import play_turn, random_ai_decision
+    from backend.app.core.replay import ReplayError, game_record, replay
+
+    state = GameState(["User_A", "User_B"], seed=1234, log_enabled=False)
+    engine = Engine(state)
+    engine.setup_game({"User_A": "Warrior", "User_B": "Mage"})
+    checkpoints = {}
+    for _ in range(30):
+        pid = state.turn_owner
+        play_turn(engine, pid, random_ai_decision)
+        checkpoints[len(state.actions)] = persist.dump(state)
+        if state.is_game_over:
+            break
+
+    record = json.loads(json.dumps(game_record(state)))
+    for upto, data in checkpoints.items():
+        assert persist.dump(replay(record, upto=upto, log_enabled=False).state) == data
+
+    record["actions"].insert(0, ["buy_card", "User_B", "Province"])
+    import pytest
+    with pytest.raises(ReplayError):
+        replay(record)
+
+
+# ──────────────────────────────────────────────────────────────
+# 카드 정의 JSON / 효과 opcode
+# ──────────────────────────────────────────────────────────────
+def test_cards_load_from_json_and_compile_effects(tmp_path):
+    import json
+    import pytest
+    from backend.app.core.card import OP_DRAW, OP_HP, OP_OP_HP, ActionCard, load_cards
+
+    assert CARD_DB["BloodDraw"].ops == ((OP_HP, "hp", -10), (OP_DRAW, "hand", 3))  # 0인 효과는 빠짐
+    assert CARD_DB["BloodArrow"].ops[-1] == (OP_OP_HP, "hp", -15)
+
+    path = tmp_path / "cards.json"
+    path.write_text(json.dumps({"version": 1, "cards": [
+        {"name": "Festival", "type": "ACTION", "cost": 5, "effects": {"actions": 2, "buys": 1, "gold": 2}},
+    ]}), encoding="utf-8")
+    festival = load_cards(path)["Festival"]
+    assert isinstance(festival, ActionCard) and festival.add_gold == 2 and len(festival.ops) == 3
+
+    path.write_text(json.dumps({"cards": [{"name": "Bad", "type": "ACTION", "cost": 1, "effects": {"heal": 1}}]}))
+    with pytest.raises(ValueError, match="Bad"):
+        load_cards(path)
+
+    state = GameState(["User_A", "User_B"])
+    engine = Engine(state)
+    engine.setup_game({"User_A": "Warrior", "User_B": "Warrior"})
+    state.players["User_A"].hand.append("BloodArrow")
+    assert engine.play_card("User_A", "BloodArrow")[0]
+    assert (state.players["User_A"].hp, state.players["User_B"].hp) == (35, 25)
+
+
+# ──────────────────────────────────────────────────────────────
+# 가능한 수 (legal_moves)
+# ──────────────────────────────────────────────────────────────
+def test_legal_moves_match_engine_validation():
+    from backend.app.core import persist
+    from backend.app.core.ai import random_ai_decision
+
+    def accepted(state, command, pid, card):
+        clone = Engine(persist.load(persist.dump(state), log_enabled=False))
+        return getattr(clone, command)(pid, card)[0]
+
+    state = GameState(["User_A", "User_B"], seed=5, log_enabled=False)
+    engine = Engine(state)
+    engine.setup_game({"User_A": "Priest", "User_B": "Warrior"})
+    state.supply["Silver"] = 1
+    engine.invalidate_market_index()
+    checked = 0
+    for _ in range(100):
+        if state.is_game_over:
+            break
+        pid = state.turn_owner
+        moves = engine.legal_moves(pid)
+        for card in CARD_DB:
+            assert (card in moves.play) == accepted(state, "play_card", pid, card)
+            assert (card in moves.buy) == accepted(state, "buy_card", pid, card)
+        checked += 1
+        choice = random_ai_decision(pid, engine)
+        if choice is None or not (engine.play_card(pid, choice)[0] or engine.buy_card(pid, choice)[0]):
+            engine.next_phase()
+    assert checked > 50
+
+
+# ──────────────────────────────────────────────────────────────
+# fork / MCTS
+# ──────────────────────────────────────────────────────────────
+def test_fork_is_isolated_and_quiet():
+    import time
+    from backend.app.core import persist
+    from backend.app.core.ai import MCTSPolicy, play_turn, smart_ai_decision
+
+    state = GameState(["User_A", "User_B"], seed=7, record_deltas=True)
+    engine = Engine(state)
+    engine.setup_game({"User_A": "Mage", "User_B": "Warrior"})
+    before = persist.dump(state)
+    logs, actions = len(state.logs), len(state.actions)
+
+    sim = engine.fork()
+    assert sim.state.players["User_A"].private_market.stock is state.players["User_A"].private_market.stock
+    for _ in range(6):
+        play_turn(sim, sim.state.turn_owner, smart_ai_decision)
+    assert sim.state.turn_count > state.turn_count
+    assert persist.dump(state) == before
+    assert (len(state.logs), len(state.actions), state.version) == (logs, actions, 0)
+    assert sim.state.actions is None and not sim.deltas
+
+    # rng 를 생략하면 원본 RNG 상태를 복제하므로 같은 진행을 재현합니다.
+    twin = engine.fork()
+    for _ in range(6):
+        play_turn(twin, twin.state.turn_owner, smart_ai_decision)
+    assert persist.dump(twin.state) == persist.dump(sim.state)
+
+    # MCTS: 시간 예산 안에서 합법적인 수를 고르고, 원본 상태는 건드리지 않음
+    engine.next_phase()
+    for card in list(state.players["User_A"].hand):
+        engine.play_card("User_A", card)
+    before = persist.dump(state)
+    policy = MCTSPolicy(time_budget=0.05, seed=1)
+    started = time.perf_counter()
+    choice = policy("User_A", engine)
+    assert time.perf_counter() - started < 0.5
+    assert choice is None or choice in engine.legal_moves("User_A").buy
+    assert sum(n for n, _ in policy.last_stats.values()) >= len(policy.last_stats) > 1
+    assert persist.dump(state) == before
+    assert MCTSPolicy(time_budget=None, rollouts=30, seed=3)("User_A", engine) == \
+        MCTSPolicy(time_budget=None, rollouts=30, seed=3)("User_A", engine)
+
+    # 레지스트리의 mcts 는 rollout 수로만 멈추고 게임 RNG 의 복사본에서 뽑으므로 재현 가능 (게임 RNG 는 그대로)
+    from backend.app.core.ai import POLICIES
+    from backend.app.core.simulator import play_game
+    registered = POLICIES["mcts"]
+    assert registered.time_budget is None and registered.rollouts
+    choice = registered("User_A", engine)
+    assert persist.dump(state) == before and registered("User_A", engine) == choice
+    assert play_game(("Mage", "Warrior"), ("mcts", "smart"), max_turns=3, seed=11) == \
+        play_game(("Mage", "Warrior"), ("mcts", "smart"), max_turns=3, seed=11)
+
+
+# ──────────────────────────────────────────────────────────────
+# 벤치마크
+# ──────────────────────────────────────────────────────────────
+def test_bench_reports_metrics_and_flags_regressions():
+    import json
+    from backend.tests import bench
+
+    result = json.loads(json.dumps(bench.run(quick=True)))
+    with open(os.path.join(os.path.dirname(__file__), "bench_baseline.json"), encoding="utf-8") as f:
+        baseline = json.load(f)
+    assert set(result["metrics"]) == set(baseline["metrics"])
+    assert all(m["value"] > 0 for m in result["metrics"].values())
+
+    slower = json.loads(json.dumps(result))
+    slower["metrics"]["buy_card_us"]["value"] *= 2
+    slower["metrics"]["game_debug_off_per_s"]["value"] /= 2
+    rows = {row["name"]: row for row in bench.compare(slower, result, tolerance=0.25)}
+    assert {name for name, row in rows.items() if row["regressed"]} == {"buy_card_us", "game_debug_off_per_s"}
+    assert rows["buy_card_us"]["change"] == pytest.approx(1.0)
+
+    merged = bench.median_of([result, slower, result])  # 실행 사이 흔들림 폭이 허용 폭에 더해짐
+    assert merged["metrics"]["buy_card_us"]["noise"] == pytest.approx(1.0, abs=0.01)
+    rows = {row["name"]: row for row in bench.compare(slower, merged, tolerance=0.25)}
+    assert not rows["buy_card_us"]["regressed"] and rows["game_debug_off_per_s"]["regressed"]
+
+
+# ──────────────────────────────────────────────────────────────
+# 계측 / 지표 엔드포인트
+# ──────────────────────────────────────────────────────────────
+def test_instrumentation_is_opt_in_and_exported():
+    import asyncio
+    from backend.app import main
+    from backend.app.core import metrics
+    from backend.app.core.card import ActionCard
+
+    original = Engine.play_card
+    manager = GameManager(shards=2)
+    room = manager.create_room("r1", ["User_A", "User_B"])  # delta 래퍼가 있는 엔진
+    inst = metrics.INSTRUMENTATION
+    inst.reset()
+    metrics.enable()
+    try:
+        assert Engine.play_card is not original
+        pid = room.state.turn_owner
+        room.state.players[pid]["hand"] = ["Village", "Copper"]
+        manager.execute("r1", "play_card", pid, "Village")
+        manager.execute("r1", "play_card", pid, "Copper")
+        manager.execute("r1", "buy_card", pid, "Province")  # 실패한 명령도 집계
+        for bogus in ("x" * 64, "Provinse", "../etc"):  # 카탈로그에 없는 이름은 라벨 하나로
+            manager.execute("r1", "buy_card", pid, bogus)
+        manager.execute("r1", "next_phase")
+    finally:
+        metrics.disable()
+    assert Engine.play_card is original and "play" in ActionCard.__dict__
+
+    counts = {key: count for key, (_, _, count) in inst.snapshot().items()}
+    assert counts[("play_card", "card", "Village")] == 1
+    assert counts[("card_play", "card", "Village")] == 1
+    assert counts[("buy_card", "card", "Province")] == 1
+    assert counts[("buy_card", "card", metrics.INVALID_CARD_LABEL)] == 3
+    assert {value for op, _, value in counts if op == "buy_card"} == {"Province", metrics.INVALID_CARD_LABEL}
+    assert counts[("next_phase", "phase", "BUY")] == 1
+    assert counts[("draw_card", None, "")] >= 2  # Village 효과 + 정리 단계
+    assert room.state.version == 3
+
+    async def scrape():
+        server = await main.start_metrics_server("127.0.0.1", 0, manager)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"GET /metrics HTTP/1.1\r\nHost: x\r\n\r\n")
+        body = await reader.read()
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return body.decode("utf-8")
+
+    text = asyncio.run(scrape())
+    assert text.startswith("HTTP/1.1 200 OK")
+    assert "newgame_live_rooms 1" in text
+    assert 'newgame_engine_op_seconds_count{op="play_card",card="Village"} 1' in text
+    assert 'newgame_card_play_seconds_bucket{card="Copper",le="+Inf"} 1' in text
+    inst.reset()
+
+
+# ──────────────────────────────────────────────────────────────
+# 묶음 명령 (apply_batch)
+# ──────────────────────────────────────────────────────────────
+def test_apply_batch_matches_single_commands_and_rolls_back():
+    from backend.app.core import persist
+    from backend.app.core.ai import smart_ai_decision
+
+    batched = Engine(GameState(["User_A", "User_B"], seed=11, debug=True))
+    batched.setup_game({"User_A": "Warrior", "User_B": "Mage"})
+    single = Engine(persist.load(persist.dump(batched.state), debug=True))
+    for _ in range(12):
+        pid = batched.state.turn_owner
+        batched.next_phase()
+        single.next_phase()
+        treasures = [c for c in single.state.players[pid].hand if CARD_DB[c].card_type == "TREASURE"]
+        for card in treasures:
+            single.play_card(pid, card)
+        choice = smart_ai_decision(pid, single)
+        commands = [["play_treasures"]] + ([["buy_card", choice]] if choice else []) + [["next_phase"]]
+        if choice:
+            single.buy_card(pid, choice)
+        single.next_phase()
+        assert batched.apply_batch(pid, commands) == (True, "성공")
+        assert persist.dump(batched.state) == persist.dump(single.state)
+        assert batched.state.actions[-len(commands) - len(treasures) + 1:] == single.state.actions[-len(commands) - len(treasures) + 1:]
+
+    # 실패하면 셔플(RNG)까지 포함해 전부 되돌리고 FAIL 로그 하나만 남깁니다.
+    state = batched.state
+    pid, other = state.turn_owner, batched.get_opponent_id(state.turn_owner)
+    state.players[pid]["deck"] = []
+    before, logs, actions = persist.dump(state), len(state.logs), len(state.actions)
+    ok, message = batched.apply_batch(pid, [["next_phase"], ["next_phase"], ["buy_card", "Gold"]])
+    assert not ok and message.startswith("3번째 명령")
+    assert persist.dump(state) == before
+    assert len(state.logs) == logs + 1 and len(state.actions) == actions
+    assert batched.apply_batch(other, [["next_phase"]])[0] is False
+    assert batched.apply_batch(pid, [["draw_card", 3]])[0] is False
+
+    # delta 를 기록하는 방에서는 묶음 전체가 delta 하나
+    manager = GameManager(shards=1)
+    room = manager.create_room("r", ["User_A", "User_B"], seed=3)
+    ok, _ = manager.execute("r", "apply_batch", "User_A", [["play_treasures"], ["next_phase"]])
+    assert ok and room.state.version == 1
+    (delta,) = room.engine.deltas
+    assert delta["cmd"][0] == "batch" and delta["game"]["owner"] == "User_B"
+
+    # 소켓 batch 메시지도 명령 이름과 인자 개수를 검사해 실패 결과로 돌려줌 (예외 없이)
+    import asyncio
+    import json
+    from backend.app.socket.game import GameChannel
+
+    channel = GameChannel(manager, "r")
+    inbox = []
+
+    async def client():
+        b = await channel.join("User_B", lambda raw: asyncio.sleep(0, inbox.append(json.loads(raw))))
+        for i, commands in enumerate([[[["x"]]], [["buy_card"]], [["next_phase", "extra"]], [["buy_card", 3]]]):
+            await channel.handle(b, json.dumps({"type": "batch", "id": i, "commands": commands}))
+
+    asyncio.run(client())
+    results = [m for m in inbox if m["type"] == "result"]
+    assert len(results) == 4 and not any(m["ok"] for m in results) and room.state.version == 1
+
+
+# ──────────────────────────────────────────────────────────────
+# 장수 존 (zone_mode="counts")
+# ──────────────────────────────────────────────────────────────
+def test_count_zones_sample_like_shuffle_and_play_full_games():
+    import random
+    from backend.app.core import persist
+    from backend.app.core.card import CARD_IDS
+    from backend.app.core.deck import DeckManager
+    from backend.app.core.player import CountZone, PlayerState
+
+    # Gold 가 몇 번째로 뽑히는지는 섞은 뒤 위에서 뽑을 때처럼 균등해야 합니다.
+    rng = random.Random(5)
+    positions = [0] * 5
+    for _ in range(20000):
+        zone = CountZone(["Copper", "Copper", "Copper", "Gold", "Estate"])
+        positions[list(zone.take(5, rng)).index(CARD_IDS["Gold"])] += 1
+        assert not zone
+    assert all(abs(n / 20000 - 0.2) < 0.015 for n in positions)
+
+    # 셔플은 장수 배열만 넘겨받고, 버림은 개수로 처리
+    p = PlayerState(counted=True)
+    p["discard"] = ["Copper"] * 3000 + ["Smithy"] * 5
+    manager = DeckManager(p, random.Random(1))
+    assert manager.draw(5) == 5 and len(p.deck) == 3000 and not p.discard
+    assert p.deck.count("Copper") + p.deck.count("Smithy") == 3000
+    hand = list(p.hand)
+    manager.discard_hand()
+    assert sorted(p.discard) == sorted(hand) and not p.hand
+
+    for seed in range(20):
+        result = simulator.play_game(("Warrior", "Mage"), seed=seed, zone_mode="counts")
+        assert result.turns >= 1
+
+    state = GameState(["User_A", "User_B"], seed=2, zone_mode="counts")
+    engine = Engine(state)
+    engine.setup_game({"User_A": "Warrior", "User_B": "Mage"})
+    assert isinstance(state.players["User_A"].deck, CountZone) and len(state.players["User_A"].hand) == 5
+    restored = persist.load(persist.dump(state))
+    assert restored.zone_mode == "counts" and isinstance(restored.players["User_B"].discard, CountZone)
+    assert persist.dump(restored) == persist.dump(state)
+    assert isinstance(engine.fork().state.players["User_A"].deck, CountZone)
+
+    before = persist.dump(state)
+    assert not engine.apply_batch("User_A", [["next_phase"], ["next_phase"], ["next_phase"], ["buy_card", "Gold"]])[0]
+    assert persist.dump(state) == before
+
+
+# ──────────────────────────────────────────────────────────────
+# 매치메이킹 대기열
+# ──────────────────────────────────────────────────────────────
+def test_matchmaker_pairs_by_rating_with_widening_windows():
+    import asyncio
+    from backend.app.socket.lobby import Matchmaker, room_creator
+
+    now = [0.0]
+    manager = GameManager(shards=2)
+    batches = []
+
+    def on_match(matches):
+        batches.append(len(matches))
+        room_creator(manager)(matches)
+
+    mm = Matchmaker(on_match=on_match, base_window=50, widen_per_sec=10, max_window=300, clock=lambda: now[0])
+
+    async def scenario():
+        far = mm.enqueue("far", "Priest", 2000)
+        a = mm.enqueue("a", "Warrior", 1500)
+        b = mm.enqueue("b", "Mage", 1540)
+        c = mm.enqueue("c", "Warrior", 1800, accepts=["Priest"])
+        picky = mm.enqueue("picky", "Mage", 1520, accepts=["Priest"])
+        assert len(await mm.tick()) == 1  # a-b (40 이내), c/picky/far 는 창 밖이거나 클래스 불일치
+        assert (await a).players == ("a", "b") and (await b).room_id == (await a).room_id
+        assert manager.get_room((await a).room_id).state.player_classes == {"a": "Warrior", "b": "Mage"}
+
+        now[0] = 16.0  # 창 50 + 160 = 210: far(2000)-c(1800) 는 가능, picky 는 Priest 만 받음
+        assert [m.players for m in await mm.tick()] == [("far", "c")]
+        assert (await c).waited == (16.0, 16.0)
+        assert mm.stats()["queue_depth"] == 1 and not picky.done()
+        assert mm.leave("picky") and picky.cancelled() and not mm.leave("picky")
+
+        for i in range(200):
+            mm.enqueue(f"p{i}", ["Warrior", "Mage", "Priest"][i % 3], 1000 + (i * 37) % 400)
+        now[0] = 50.0  # 창 50 + 340 = 390: 레이팅 폭(400) 안에서 남는 사람 없이 짝이 됨
+        assert len(await mm.tick()) == 100 and batches[-1] == 100
+
+        # ticker 태스크: join 한 두 사람이 자동으로 매칭됨
+        mm.interval = 0.001
+        mm.start()
+        x, y = await asyncio.wait_for(asyncio.gather(mm.join("x", "Mage", 1200), mm.join("y", "Mage", 1210)), 1)
+        await mm.stop()
+        assert x == y
+
+    asyncio.run(scenario())
+    stats = mm.stats()
+    assert stats["queue_depth"] == 0 and stats["matched_total"] == 1 + 1 + 100 + 1
+    assert stats["depth_by_class"] == {name: 0 for name in CLASS_DB}
+    assert stats["wait_p99"] == 34.0 and stats["wait_p50"] is not None
+
+
+def test_matchmaker_ticker_logs_and_counts_failed_ticks(caplog):
+    import asyncio
+    from backend.app.socket.lobby import Matchmaker
+
+    calls = []
+
+    def on_match(matches):
+        calls.append(matches)
+        if len(calls) == 1:
+            raise RuntimeError("room service down")
+
+    mm = Matchmaker(on_match=on_match, interval=0.001)
+
+    async def scenario():
+        mm.start()
+        failed = await asyncio.gather(mm.join("a", "Mage", 1200), mm.join("b", "Mage", 1210), return_exceptions=True)
+        assert all(isinstance(e, RuntimeError) for e in failed)
+        # 실패한 tick 뒤에도 ticker 는 계속 돕니다.
+        x, y = await asyncio.wait_for(asyncio.gather(mm.join("c", "Mage", 1200), mm.join("d", "Mage", 1210)), 1)
+        await mm.stop()
+        assert x == y
+
+    with caplog.at_level("ERROR", logger="backend.app.socket.lobby"):
+        asyncio.run(scenario())
+    assert mm.stats()["tick_errors"] == 1
+    assert [r.getMessage() for r in caplog.records] == ["matchmaker tick failed"] and caplog.records[0].exc_info
+
+
+# ──────────────────────────────────────────────────────────────
+# 세션 토큰
+# ──────────────────────────────────────────────────────────────
+def test_session_tokens_verify_cache_and_revoke():
+    import asyncio
+    import json
+    from backend.app.socket.game import GameChannel
+    from backend.app.utils.token import TokenError, TokenService
+
+    now = [1000.0]
+    tokens = TokenService("secret", ttl=60, cache_size=2, clock=lambda: now[0])
+    token = tokens.issue("User_A", "room-1")
+    claims = tokens.verify(token, "room-1")
+    assert (claims.player_id, claims.room_id, claims.expires_at) == ("User_A", "room-1", 1060)
+    assert tokens.verify(token) == claims and tokens.stats()["hits"] == 1
+
+    body, signature = token.split(".")
+    forged = TokenService("other").issue("User_A", "room-1")
+    for bad in (forged, body + "." + signature[::-1], "garbage", body):
+        with pytest.raises(TokenError):
+            tokens.verify(bad)
+    with pytest.raises(TokenError):
+        tokens.verify(token, "room-2")
+
+    # LRU: 가장 오래 안 쓴 토큰이 밀려나도 다시 검증하면 됨
+    others = [tokens.issue(f"P{i}", "room-1") for i in range(3)]
+    for other in others:
+        tokens.verify(other)
+    assert tokens.stats()["cached"] == 2 and token not in tokens._cache
+    assert tokens.verify(token) == claims
+
+    now[0] = 1060.0
+    with pytest.raises(TokenError, match="만료"):
+        tokens.verify(token)
+    now[0] = 1000.0
+
+    manager = GameManager(shards=1)
+    manager.create_room("room-1", ["User_A", "User_B"])
+    channel = GameChannel(manager, "room-1", tokens=tokens)
+    inbox = []
+
+    async def send(raw):
+        inbox.append(json.loads(raw))
+
+    async def scenario():
+        session = await channel.join_with_token(token, send)
+        assert session.player_id == "User_A"
+        await channel.handle(session, json.dumps({"type": "command", "id": 1, "cmd": "next_phase", "args": []}))
+        tokens.revoke(token)
+        await channel.handle(session, json.dumps({"type": "command", "id": 2, "cmd": "next_phase", "args": []}))
+        with pytest.raises(TokenError):
+            await channel.join_with_token(token, send)
+
+    asyncio.run(scenario())
+    results = [m for m in inbox if m["type"] == "result"]
+    assert results[0]["ok"] is True
+    assert results[1]["ok"] is False and "폐기" in results[1]["error"]
+    assert manager.get_room("room-1").state.phase.name == "BUY"  # 폐기 뒤 명령은 실행되지 않음
+    assert tokens.stats()["revoked"] == 1
+
+
+# ──────────────────────────────────────────────────────────────
+# 명령 저널 (WAL) / 크래시 복구
+# ──────────────────────────────────────────────────────────────
+def test_journal_group_commits_and_recovers_rooms(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+    from backend.app.core import journal as wal
+    from backend.app.core.delta import full_state
+
+    directory = str(tmp_path / "wal")
+    journal = wal.Journal(directory, fsync_interval=None)
+    manager = GameManager(shards=4, journal=journal)
+    for i in range(3):
+        manager.create_room(f"room/{i}", ["User_A", "User_B"], {"User_A": "Warrior", "User_B": "Mage"},
+                            zone_mode="counts" if i == 2 else "array")
+    manager.create_room("gone", ["User_A", "User_B"])
+    for i in range(3):
+        room_id = f"room/{i}"
+        manager.execute(room_id, "next_phase")
+        manager.execute(room_id, "apply_batch", "User_A", [["play_treasures"], ["buy_card", "Silver"]])
+        manager.execute(room_id, "apply_batch", "User_A", [["buy_card", "Province"]])  # 거절: 기록 안 됨
+        manager.execute(room_id, "next_phase")
+        for _ in range(3 + i):
+            manager.execute(room_id, "next_phase")
+    assert journal.commits == 0 and not any(os.scandir(directory))  # 커밋 전에는 디스크에 아무것도 없음
+    assert journal.wait_durable(journal.last_seq, timeout=1) and journal.commits == 1
+    manager.remove_room("gone")
+    assert sorted(os.listdir(directory)) == sorted(journal.path(f"room/{i}").rsplit(os.sep, 1)[1] for i in range(3))
+
+    # 크래시 흉내: 마지막 줄을 쓰다 만 상태
+    with open(journal.path("room/1"), "a", encoding="utf-8") as f:
+        f.write('["buy_card","User_')
+    expected = {f"room/{i}": full_state(manager.get_room(f"room/{i}").state) for i in range(3)}
+
+    recovered_manager = GameManager(shards=4, journal=wal.Journal(directory, fsync_interval=None))
+    with ThreadPoolExecutor(2) as pool:
+        recovered = wal.recover(directory, recovered_manager, executor=pool)
+    assert recovered.failed == {}
+    for room_id, state in recovered.states.items():
+        original = manager.get_room(room_id).state
+        assert full_state(state) == expected[room_id]
+        assert state.actions == original.actions and state.record_deltas and state.rng.getstate() == original.rng.getstate()
+    assert recovered.states["room/2"].zone_mode == "counts"
+
+    # 복구한 방은 같은 저널에 이어서 기록되고, 다시 복구해도 같은 상태
+    recovered_manager.execute("room/0", "next_phase")
+    recovered_manager.journal.close()
+    again = wal.recover(directory, workers=1)
+    assert full_state(again.states["room/0"]) == full_state(recovered_manager.get_room("room/0").state)
+
+    with open(os.path.join(directory, "broken.wal"), "w", encoding="utf-8") as f:
+        f.write("not json\n")
+    assert list(wal.recover(directory, workers=1).failed) == [os.path.join(directory, "broken.wal")]
+    journal.close()
+
+
+def test_journal_recover_isolates_room_errors_and_broken_pool(tmp_path, monkeypatch):
+    from concurrent.futures import Executor, Future
+    from concurrent.futures.process import BrokenProcessPool
+    from backend.app.core import journal as wal
+    from backend.app.core.delta import full_state
+
+    directory = str(tmp_path / "wal")
+    journal = wal.Journal(directory, fsync_interval=None)
+    manager = GameManager(journal=journal)
+    for i in range(3):
+        manager.create_room(f"room/{i}", ["User_A", "User_B"])
+        manager.execute(f"room/{i}", "next_phase")
+    journal.close()
+
+    # 예상 못 한 예외가 나는 방 하나는 실패로 보고하고 나머지는 계속 복구
+    replay_dump = wal._replay_dump
+
+    def flaky(header, actions):
+        if header["room_id"] == "room/1":
+            raise KeyError("room/1")
+        return replay_dump(header, actions)
+
+    monkeypatch.setattr(wal, "_replay_dump", flaky)
+
+    # 워커가 죽어 풀이 깨지면 현재 프로세스에서 다시 리플레이
+    class BrokenPool(Executor):
+        def submit(self, fn, *args, **kwargs):
+            future = Future()
+            future.set_exception(BrokenProcessPool("worker died"))
+            return future
+
+    recovered_manager = GameManager(journal=wal.Journal(directory, fsync_interval=None))
+    recovered = wal.recover(directory, recovered_manager, executor=BrokenPool())
+    assert recovered.failed == {"room/1": "KeyError: 'room/1'"}
+    assert sorted(recovered.states) == ["room/0", "room/2"]
+    assert full_state(recovered.states["room/2"]) == full_state(manager.get_room("room/2").state)
+    recovered_manager.journal.close()
+
+
+# ──────────────────────────────────────────────────────────────
+# 멀티 프로세스 방 샤딩
+# ──────────────────────────────────────────────────────────────
+def test_hash_ring_moves_only_the_new_workers_share():
+    from backend.app.utils.hash_ring import HashRing, moved_keys
+
+    keys = [f"room-{i}" for i in range(3000)]
+    three = HashRing(["w0", "w1", "w2"])
+    four = three.copy()
+    four.add("w3")
+    plan = moved_keys(three, four, keys)
+    assert set(plan.values()) == {"w3"}                  # 새 워커로 가는 키만 움직임
+    assert 0.15 < len(plan) / len(keys) < 0.35           # 약 1/4
+    shares = [sum(three.node_for(k) == n for k in keys) / len(keys) for n in three.nodes]
+    assert all(0.25 < share < 0.42 for share in shares)
+    four.remove("w3")
+    assert moved_keys(three, four, keys) == {}
+
+
+def test_idle_rooms_are_evicted_on_a_schedule():
+    import asyncio
+    import time
+    from backend.app.main import ShardRouter, evict_idle_forever
+
+    now = [0.0]
+    manager = GameManager(shards=1, ttl=60, clock=lambda: now[0])
+    manager.create_room("room-1", ["User_A", "User_B"])
+
+    async def scenario():
+        task = asyncio.get_running_loop().create_task(evict_idle_forever(manager, 0.01))
+        await asyncio.sleep(0.03)
+        assert "room-1" in manager
+        now[0] = 100.0
+        await asyncio.sleep(0.03)
+        task.cancel()
+
+    asyncio.run(scenario())
+    assert "room-1" not in manager
+
+    # 워커는 요청이 없어도 주기마다 깨어나 정리
+    with ShardRouter(workers=1, evict_interval=0.05, ttl=0.1) as router:
+        router.create_room("room-1", ["User_A", "User_B"])
+        deadline = time.monotonic() + 5
+        while router.stats()["live_rooms"] and time.monotonic() < deadline:
+            time.sleep(0.05)
+        stats = router.stats()
+        assert stats["live_rooms"] == 0 and stats["rooms_evicted"] == 1
+
+
+def test_shard_router_forwards_commands_and_rebalances(tmp_path):
+    import json
+    from backend.app.core.card import CARD_DATA_PATH
+    from backend.app.core.persist import StateFormatError
+    from backend.app.main import ShardRouter
+
+    with ShardRouter(workers=2) as router:
+        rooms = [f"room-{i}" for i in range(12)]
+        for room_id in rooms:
+            router.create_room(room_id, ["User_A", "User_B"], {"User_A": "Warrior", "User_B": "Mage"}, seed=7)
+        assert {router.worker_for(room_id) for room_id in rooms} == {"worker-0", "worker-1"}
+
+        futures = [router.submit_execute(room_id, "next_phase") for room_id in rooms]  # 워커들에 동시에
+        for future in futures:
+            result, deltas = future.result(timeout=10)
+            assert result is None and [d["v"] for d in deltas] == [1]
+        ok, _ = router.execute("room-0", "apply_batch", "User_A", [["play_treasures"], ["buy_card", "Silver"]])
+        assert ok
+        with pytest.raises(KeyError):
+            router.execute("missing", "next_phase")
+        many = router.execute_many([("room-3", "next_phase", ()), ("missing", "next_phase", ()),
+                                    ("room-4", "next_phase", ())])
+        assert [ok for ok, _ in many] == [True, False, True] and isinstance(many[1][1], KeyError)
+        assert [d["v"] for d in many[2][1][1]] == [2]
+        before = {room_id: router.full_state(room_id) for room_id in rooms}
+
+        plan = router.resize(3)
+        assert plan and set(plan.values()) == {"worker-2"} and router.rooms_moved == len(plan)
+        assert {room_id: router.full_state(room_id) for room_id in rooms} == before
+        router.resize(1)
+        assert router.workers == ["worker-0"]
+        assert {room_id: router.full_state(room_id) for room_id in rooms} == before
+        assert router.execute("room-0", "next_phase") is None
+
+        stats = router.stats()
+        assert stats["live_rooms"] == 12 and stats["workers"] == 1
+
+        # 새 워커가 모르는 카탈로그의 방이 있으면 resize 는 실패하고 아무것도 바뀌지 않음
+        data = json.loads(CARD_DATA_PATH.read_text(encoding="utf-8"))
+        for n in (1, 2):
+            data["version"] += 1
+            path = tmp_path / f"cards-{n}.json"
+            path.write_text(json.dumps(data), encoding="utf-8")
+            router.reload_catalog(path)
+            if n == 1:  # 이 카탈로그로 만든 방은 cards-2 로 시작하는 새 워커에서 읽을 수 없음
+                for i in range(12):
+                    router.create_room(f"old-{i}", ["User_A", "User_B"], seed=i)
+        everything = rooms + [f"old-{i}" for i in range(12)]
+        before = {room_id: router.full_state(room_id) for room_id in everything}
+        with pytest.raises(StateFormatError):
+            router.resize(3)
+        assert router.workers == ["worker-0"] and router.stats()["workers"] == 1
+        assert {room_id: router.full_state(room_id) for room_id in everything} == before
+        assert router.execute("old-0", "next_phase") is None
+
+    assert router.stats()["workers"] == 0  # close() 뒤에도 예외 없음
+
+
+def test_vector_simulator_matches_scalar_engine_statistics():
+    pytest.importorskip("numpy")
+    from backend.app.core import vector_sim
+    from backend.app.core.ai import ACTION_PRIORITY, priority_ai_decision
+
+    assert ACTION_PRIORITY[0] == "Madness"  # 액션을 주는 카드가 먼저
+    engine = Engine(GameState(["User_A", "User_B"], {"User_A": "Warrior", "User_B": "Mage"}, seed=3))
+    engine.next_phase()
+    assert priority_ai_decision("User_A", engine) in (None, *ACTION_PRIORITY)
+
+    games = vector_sim.VectorGames(vector_sim._matchups(3000, None, 5), seed=5).run()
+    assert games.width == 0 or not games.done.any()
+    stats = games.stats()
+    assert stats.games == 3000 and sum(sum(row) for row in stats.table.values()) == 3000
+    results = list(games.results())
+    assert all(r.winner is None for r in results if r.turns == 20 and min(r.hp) > 0)
+    assert all(min(r.hp) <= 0 for r in results if r.winner is not None)
+
+    check = vector_sim.validate(300, seed=5, vector_games=3000)
+    assert check.ok, vector_sim.format_checks(check.checks)
+
+
+def test_card_catalog_validates_caches_and_hot_reloads(tmp_path, monkeypatch):
+    import json
+    import warnings
+    from backend.app.core.card import (CARD_DATA_PATH, CARD_IDS, CATALOG_STORE, CatalogError, CatalogWarning,
+                                       catalog_cache_path, compile_catalog_cache, current_catalog, load_catalog)
+    from concurrent.futures import ThreadPoolExecutor
+    from backend.app.core import journal as wal
+    from backend.app.core import persist
+    from backend.app.core.manager import GameManager
+
+    catalog = current_catalog()
+    assert catalog.warnings == () and list(catalog.classes["Mage"]["private_market"]) == ["BloodDraw"]
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        load_catalog(use_cache=False)
+
+    # 개인 마켓이 정의되지 않은 카드를 가리키면: 로딩은 되지만 경고로 알리고 살 수는 없음
+    dangling = json.loads(CARD_DATA_PATH.read_text(encoding="utf-8"))
+    dangling["classes"]["Mage"]["private_market"]["ManaPotion"] = 5
+    dangling_path = tmp_path / "dangling.json"
+    dangling_path.write_text(json.dumps(dangling), encoding="utf-8")
+    with pytest.warns(CatalogWarning, match="ManaPotion"):
+        warned = load_catalog(dangling_path, use_cache=False)
+    assert warned.get("ManaPotion") is None
+    assert warned.warnings == ("classes.Mage.private_market: 정의되지 않은 카드입니다: ManaPotion",)
+    assert catalog.of_type("TREASURE") == ("Copper", "Silver", "Gold")
+    assert catalog.affordable(0) == ["Copper"] and catalog.by_id[CARD_IDS["Smithy"]] is CARD_DB["Smithy"]
+
+    # 문제는 구매 시점이 아니라 로딩 시점에 한꺼번에 보고됨
+    bad = tmp_path / "bad.json"
+    bad.write_text(json.dumps({"version": 1, "cards": [
+        {"name": "Copper", "type": "TREASURE", "cost": 0, "value": 1},
+        {"name": "Copper", "type": "TREASURE", "cost": 0, "value": 1},
+        {"name": "Gem", "type": "TREASURE", "cost": 4},
+    ], "classes": {"Rogue": {"hp": 30, "gold": 0, "actions": 1, "initial_deck": {"Copper": 7, "Dagger": 3}}}}),
+        encoding="utf-8")
+    with pytest.raises(CatalogError) as error:
+        load_catalog(bad)
+    assert len(error.value.problems) == 3 and "Dagger" in str(error.value)
+    assert not catalog_cache_path(bad).exists()
+
+    # 컴파일된 캐시: 명시적으로 쓸 때만 생기고, 원본이 같으면 캐시를, 바뀌면 원본을 다시 읽음
+    data = json.loads(CARD_DATA_PATH.read_text(encoding="utf-8"))
+    path = tmp_path / "cards.json"
+    path.write_text(json.dumps(data), encoding="utf-8")
+    first = load_catalog(path)
+    assert not catalog_cache_path(path).exists()
+    assert compile_catalog_cache(path) and catalog_cache_path(path).exists()
+    assert load_catalog(path).cards.keys() == first.cards.keys() == catalog.cards.keys()
+    data["version"] = catalog.version + 1
+    data["cards"].append({"name": "Festival", "type": "ACTION", "cost": 5, "effects": {"actions": 2, "gold": 2}})
+    data["supply"]["Festival"] = 10
+    path.write_text(json.dumps(data, indent=1), encoding="utf-8")
+    assert load_catalog(path).version == catalog.version + 1
+
+    # 핫 리로드: 진행 중인 방은 원래 카탈로그로, 새 방부터 새 카탈로그로
+    manager = GameManager(shards=2)
+    old = manager.create_room("old", ["User_A", "User_B"], {"User_A": "Warrior", "User_B": "Mage"}, seed=1)
+    try:
+        assert manager.reload_catalog(path).version == catalog.version + 1
+        new = manager.create_room("new", ["User_A", "User_B"], seed=1)
+        assert "Festival" in new.state.supply and "Festival" not in old.state.supply
+        assert old.engine.cards is catalog.cards
+        assert manager.execute("old", "next_phase") is None
+        assert manager.catalog_versions() == {catalog.version: 1, catalog.version + 1: 1}
+
+        # 저장/이전/복구해도 방은 원래 카탈로그에 다시 묶임 (모르는 카탈로그면 거절)
+        restored = persist.load(persist.dump(old.state))
+        assert (restored.catalog.version, restored.catalog.digest) == (catalog.version, catalog.digest)
+        assert "Festival" not in restored.catalog.cards
+        saved = persist.dump(new.state)
+        with pytest.raises(persist.StateFormatError):
+            persist.load(saved.replace(bytes.fromhex(new.state.catalog.digest), b"\xff" * 8))
+        directory = str(tmp_path / "wal")
+        with wal.Journal(directory, fsync_interval=None) as journal:
+            journal.open("old", old.state)
+        with ThreadPoolExecutor(1) as pool:
+            recovered = wal.recover(directory, executor=pool)
+        assert recovered.failed == {} and "Festival" not in recovered.states["old"].catalog.cards
+        with pytest.raises(CatalogError):
+            manager.reload_catalog(bad)
+        assert current_catalog().version == catalog.version + 1  # 실패한 리로드는 아무것도 바꾸지 않음
+    finally:
+        CATALOG_STORE.reload()
+    assert current_catalog().cards.keys() == catalog.cards.keys()
+
+    # 존은 카드 ID 를 u8 로 담으므로 ID 가 넘칠 카탈로그는 게임 중이 아니라 로딩할 때 거절
+    from backend.app.core import card as card_module
+    monkeypatch.setattr(card_module, "MAX_CARD_IDS", len(card_module.CARD_NAMES) + 1)
+    data["cards"] += [{"name": name, "type": "TREASURE", "cost": 9, "value": 9} for name in ("Ruby", "Opal")]
+    with pytest.raises(CatalogError, match="카드 ID 가 부족합니다"):
+        card_module.build_catalog(data)
+    card_module.intern_card("Ruby")  # 마지막 남은 ID
+    with pytest.raises(ValueError):
+        card_module.intern_card("Opal")
+    assert "Opal" not in CARD_IDS
+
+
+def test_event_log_cursor_pages_and_async_follow():
+    import asyncio
+    import json
+    import threading
+    from backend.app.socket.game import GameChannel
+
+    log = EventLog(capacity=5)
+    for i in range(3):
+        log.append("DRAW", "User_A", (i,))
+    log.append("RAW", None, ("snapshot",), True)
+    page = log.since(0, limit=2)
+    assert [r.args for r in page.records] == [(0,), (1,)] and page.cursor == 2 and page.more
+    page = log.since(page.cursor, debug=False)
+    assert [r.args for r in page.records] == [(2,)] and page.cursor == 4 and not page.more
+    for i in range(3, 6):
+        log.append("DRAW", "User_A", (i,))
+    page = log.since(1)  # 0~1 은 밀려남
+    assert page.missed == 1 and page.records[0].seq == 2 and page.cursor == log.next_seq == 7
+    assert log.since(log.next_seq) == ([], 7, 0, False)
+
+    async def follow():
+        pages = []
+        async for page in log.follow(log.next_seq, debug=False):
+            pages.append(page)
+            if page.records[-1].args == ("done",):
+                return pages
+
+    async def scenario():
+        task = asyncio.ensure_future(follow())
+        await asyncio.sleep(0)
+        assert len(log._waiters) == 1
+        writer = threading.Thread(target=lambda: [log.append("MSG", "User_B", (text,)) for text in ("a", "b", "done")])
+        writer.start()
+        writer.join()
+        pages = await asyncio.wait_for(task, 5)
+        assert [r.args[0] for p in pages for r in p.records] == ["a", "b", "done"] and not log._waiters
+        with pytest.raises(ValueError):  # limit=0 은 커서가 나아가지 않으므로 거절
+            await asyncio.wait_for(log.follow(0, limit=0).__anext__(), 1)
+
+    asyncio.run(scenario())
+
+    # 소켓: 커서 이후 로그만, follow 면 명령마다 새 로그를 이어서 (디버그 레코드 제외)
+    manager = GameManager(shards=1)
+    manager.create_room("room-1", ["User_A", "User_B"], {"User_A": "Warrior", "User_B": "Mage"}, debug=True)
+    channel = GameChannel(manager, "room-1")
+    inbox = []
+
+    async def send(raw):
+        inbox.append(json.loads(raw))
+
+    async def client():
+        session = await channel.join("User_A", send)
+        await channel.handle(session, json.dumps({"type": "logs", "since": 0, "follow": True}))
+        first = inbox[-1]
+        assert first["entries"] and first["cursor"] == channel.engine.state.logs.next_seq
+        await channel.handle(session, json.dumps({"type": "command", "id": 1, "cmd": "next_phase", "args": []}))
+        logs = [m for m in inbox if m["type"] == "logs"][1:]
+        assert [e["text"] for m in logs for e in m["entries"]] == ["✨ SYSTEM: ➡️ 구매 페이즈로 넘어갑니다."]
+        assert logs[-1]["cursor"] == session.log_cursor == channel.engine.state.logs.next_seq
+
+    asyncio.run(client())
+
+
+def test_spectator_broadcast_encodes_once_and_drops_slow_viewers_to_sync():
+    import asyncio
+    import json
+    from backend.app.socket.game import GameChannel
+
+    manager = GameManager(shards=1)
+    manager.create_room("room-1", ["User_A", "User_B"], {"User_A": "Warrior", "User_B": "Mage"}, seed=3)
+    channel = GameChannel(manager, "room-1", spectator_queue=4)
+    fast = [[] for _ in range(200)]
+    slow = []
+
+    async def scenario():
+        gate = asyncio.Event()
+
+        async def slow_send(raw):
+            await gate.wait()
+            slow.append(json.loads(raw))
+
+        players = [await channel.join(pid, lambda raw: asyncio.sleep(0)) for pid in ("User_A", "User_B")]
+        for inbox in fast:
+            await channel.join(None, lambda raw, inbox=inbox: asyncio.sleep(0, inbox.append(raw)))
+        gate.set()
+        slow_session = await channel.join(None, slow_send)  # 첫 sync 는 바로 받음
+        gate.clear()
+
+        for _ in range(10):  # 느린 관전자가 멈춰 있어도 명령 처리는 기다리지 않음
+            owner = channel.engine.state.turn_owner
+            session = players[0] if owner == "User_A" else players[1]
+            for _ in range(2):
+                await asyncio.wait_for(channel.handle(session, json.dumps(
+                    {"type": "command", "id": 1, "cmd": "next_phase", "args": []})), 1)
+        stats = channel.stats()
+        assert stats["spectators"] == 201 and stats["dropped_to_sync"] >= 1 and stats["queued"] <= 4 * 201
+        gate.set()
+        await asyncio.wait_for(channel.drain(), 5)
+        assert slow_session.version == channel.engine.state.version == 20
+
+    asyncio.run(scenario())
+
+    assert all(len(inbox) == 21 for inbox in fast)  # sync + delta 20개
+    assert all(inbox[5] is fast[0][5] for inbox in fast)  # 같은 delta 는 한 번 인코딩한 문자열을 공유
+    assert json.loads(fast[0][-1])["delta"]["v"] == 20
+    received = slow[1:]
+    assert "sync" in [m["type"] for m in received] and len(received) < 20
+    last = received[-1]
+    assert (last["state"]["v"] if last["type"] == "sync" else last["delta"]["v"]) == 20
+
+
+def test_cached_views_match_redacted_state_and_rebuild_only_touched_parts():
+    from backend.app.core.ai import random_ai_decision
+    from backend.app.core.view import redact_delta, redacted_state
+
+    state = GameState(["User_A", "User_B"], seed=9, record_deltas=True, log_enabled=False)
+    engine = Engine(state)
+    engine.setup_game({"User_A": "Warrior", "User_B": "Mage"})
+    viewers = ["User_A", "User_B", None]
+    for _ in range(120):
+        if state.is_game_over:
+            break
+        for viewer in viewers:
+            assert engine.view(viewer) == redacted_state(state, viewer)
+        pid = state.turn_owner
+        choice = random_ai_decision(pid, engine)
+        if choice is None or not (engine.play_card(pid, choice)[0] or engine.buy_card(pid, choice)[0]):
+            engine.next_phase()
+
+    view = engine.view("User_A")
+    assert isinstance(view["players"]["User_A"]["hand"], list) and isinstance(view["players"]["User_B"]["hand"], int)
+    assert engine.view("nobody") is engine.view(None)  # 플레이어가 아니면 관전자 판본, 같은 버전은 같은 dict
+
+    cache = engine._views
+    before = cache.rebuilt
+    engine.next_phase()  # 페이즈만 바뀜 → game 한 부분만 다시 만듦
+    for viewer in viewers:
+        assert engine.view(viewer) == redacted_state(state, viewer)
+    assert cache.rebuilt - before <= 2
+
+    while True:  # 턴 종료 delta: 드로우 카드 이름은 주인만 봄
+        version = state.version
+        engine.next_phase()
+        delta = engine.deltas_since(version)[-1]
+        if any(move[2] == "hand" for move in delta["moves"]):
+            break
+    drawn = [move for move in delta["moves"] if move[2] == "hand"]
+    assert redact_delta(delta, drawn[0][0]) is delta
+    public = redact_delta(delta, None)
+    assert all(isinstance(move[3], int) for move in public["moves"] if move[2] == "hand")
+    assert delta["moves"] is not public["moves"]  # 원본 delta 는 그대로
+
+
+def test_room_dispatcher_serializes_coalesces_and_rejects_floods():
+    import asyncio
+    import json
+    from backend.app.core.dispatch import CommandRejected, RoomDispatcher
+    from backend.app.socket.game import GameChannel
+
+    manager = GameManager(shards=1)
+    for room_id in ("room-1", "room-2"):
+        manager.create_room(room_id, ["User_A", "User_B"], {"User_A": "Warrior", "User_B": "Mage"}, seed=3)
+
+    async def scenario():
+        dispatcher = RoomDispatcher(manager, queue_limit=3)
+        order = []
+        jobs = [dispatcher.submit_call(room_id, None, lambda room_id=room_id, i=i: order.append((room_id, i)) or i)
+                for i in range(3) for room_id in ("room-1", "room-2")]
+        with pytest.raises(CommandRejected):
+            dispatcher.submit_call("room-1", None, lambda: None)
+        assert await asyncio.gather(*jobs) == [0, 0, 1, 1, 2, 2]
+        assert order == [(room_id, i) for i in range(3) for room_id in ("room-1", "room-2")]  # 방끼리 번갈아
+
+        first = dispatcher.submit("room-1", "next_phase")
+        second = dispatcher.submit("room-1", "next_phase")  # 키가 없으면 내용이 같아도 별개의 명령
+        assert second is not first
+        assert dispatcher.submit("room-1", "next_phase", key="retry-7") is not second
+        assert dispatcher.submit("room-1", "next_phase", key="retry-7") is dispatcher.submit(
+            "room-1", "next_phase", key="retry-7")  # 같은 키의 재전송만 한 번 실행
+        await dispatcher.drain()
+        assert manager.get_room("room-1").state.version == 3
+        with pytest.raises(KeyError):
+            await dispatcher.execute("missing", "next_phase")
+        await dispatcher.drain()
+        assert dispatcher.stats() == {"rooms": 0, "queued": 0, "submitted": 10, "executed": 10, "coalesced": 2,
+                                      "rejected": 1, "max_depth": 3}
+
+        channel = GameChannel(manager, "room-2", dispatcher=dispatcher)
+        inbox = []
+        session = await channel.join("User_A", lambda raw: asyncio.sleep(0, inbox.append(json.loads(raw))))
+        first, second = (json.dumps({"type": "command", "id": i, "cmd": "next_phase", "args": []}) for i in (1, 2))
+        await asyncio.gather(channel.handle(session, first), channel.handle(session, second))
+        assert [m["ok"] for m in inbox if m["type"] == "result"] == [True, True]
+        assert channel.engine.state.version == 2 and dispatcher.coalesced == 2  # 두 명령 모두 실행
+
+        inbox.clear()  # 같은 id 의 재전송만 합쳐지고, 두 응답 모두 실제로 실행된 결과
+        session_b = await channel.join("User_B", lambda raw: asyncio.sleep(0, inbox.append(json.loads(raw))))
+        retry = json.dumps({"type": "command", "id": 3, "cmd": "next_phase", "args": []})
+        await asyncio.gather(channel.handle(session_b, retry), channel.handle(session_b, retry))
+        assert [(m["id"], m["ok"]) for m in inbox if m["type"] == "result"] == [(3, True), (3, True)]
+        assert channel.engine.state.version == 3 and dispatcher.coalesced == 3
+
+    asyncio.run(scenario())
@@ -1 +1,158 @@
-// useGameSocket (상태 업데이트용 커스텀 훅)
\ No newline at end of file
+// useGameSocket (상태 업데이트용 커스텀 훅)
+//
+// 서버(backend/app/socket/game.py)가 보내는 메시지
+//   sync  : 전체 상태 { v, players, supply, game }
+//   delta : 명령 하나만큼의 변경분 { v, cmd, stats?, moves?, sizes?, supply?, market?, game? }
+// 받은 delta 의 v 가 (현재 버전 + 1) 이 아니면 구멍이 생긴 것이므로 resync 를 요청합니다.
+import { useCallback, useEffect, useReducer, useRef } from "react";
+
+const initialState = { version: 0, game: null, synced: false };
+
+// 카드 이동 한 건 적용. cards 가 숫자면 내용이 비공개(덱 셔플 등)인 장수 이동입니다.
+function applyMove(player, src, dst, cards) {
+  const count = typeof cards === "number" ? cards : cards.length;
+  const next = { ...player };
+  if (src in next) {
+    if (Array.isArray(next[src])) {
+      const rest = [...next[src]];
+      if (typeof cards === "number") {
+        rest.splice(0, count);
+      } else {
+        cards.forEach((name) => {
+          const i = rest.indexOf(name);
+          if (i >= 0) rest.splice(i, 1);
+        });
+      }
+      next[src] = rest;
+    } else if (typeof next[src] === "number") {
+      next[src] -= count;
+    }
+  }
+  if (dst in next) {
+    if (Array.isArray(next[dst])) {
+      next[dst] = typeof cards === "number" ? next[dst] : [...next[dst], ...cards];
+    } else if (typeof next[dst] === "number") {
+      next[dst] += count;
+    }
+  }
+  return next;
+}
+
+function applyDelta(game, delta) {
+  const players = { ...game.players };
+
+  Object.entries(delta.stats || {}).forEach(([pid, stats]) => {
+    players[pid] = { ...players[pid], ...stats };
+  });
+  (delta.moves || []).forEach(([pid, src, dst, cards]) => {
+    players[pid] = applyMove(players[pid], src, dst, cards);
+  });
+  Object.entries(delta.market || {}).forEach(([pid, counts]) => {
+    players[pid] = { ...players[pid], private_market: { ...players[pid].private_market, ...counts } };
+  });
+  // 서버가 보낸 존 크기로 덱(장수만 아는 존)을 맞추고, 나머지는 어긋나면 null 을 돌려 재동기화합니다.
+  for (const [pid, sizes] of Object.entries(delta.sizes || {})) {
+    const player = { ...players[pid], deck: sizes.deck };
+    for (const zone of ["hand", "discard", "play_mat"]) {
+      if (Array.isArray(player[zone]) && player[zone].length !== sizes[zone]) return null;
+    }
+    players[pid] = player;
+  }
+
+  return {
+    players,
+    supply: delta.supply ? { ...game.supply, ...delta.supply } : game.supply,
+    game: delta.game ? { ...game.game, ...delta.game } : game.game,
+  };
+}
+
+function reducer(state, action) {
+  switch (action.type) {
+    case "sync":
+      return { version: action.state.v, game: action.state, synced: true };
+    case "delta": {
+      const { delta } = action;
+      if (!state.synced || delta.v <= state.version) return state; // 이미 반영한 delta
+      if (delta.v !== state.version + 1) return { ...state, synced: false }; // 구멍 → resync
+      const game = applyDelta(state.game, delta);
+      if (game === null) return { ...state, synced: false };
+      return { version: delta.v, game, synced: true };
+    }
+    default:
+      return state;
+  }
+}
+
+export default function useGameSocket(url) {
+  const [state, dispatch] = useReducer(reducer, initialState);
+  const socketRef = useRef(null);
+  const nextIdRef = useRef(1);
+  const pendingRef = useRef(new Map()); // 명령 id → resolve
+  const versionRef = useRef(0);
+  versionRef.current = state.version;
+
+  const send = useCallback((message) => {
+    const socket = socketRef.current;
+    if (socket && socket.readyState === WebSocket.OPEN) socket.send(JSON.stringify(message));
+  }, []);
+
+  useEffect(() => {
+    const socket = new WebSocket(url);
+    socketRef.current = socket;
+
+    socket.onmessage = (event) => {
+      const message = JSON.parse(event.data);
+      if (message.type === "sync") {
+        dispatch({ type: "sync", state: message.state });
+      } else if (message.type === "delta") {
+        dispatch({ type: "delta", delta: message.delta });
+      } else if (message.type === "result") {
+        const resolve = pendingRef.current.get(message.id);
+        pendingRef.current.delete(message.id);
+        if (resolve) resolve({ ok: message.ok, error: message.error });
+      }
+    };
+
+    return () => {
+      socket.close();
+      socketRef.current = null;
+    };
+  }, [url]);
+
+  // 구멍을 발견해 synced 가 false 가 되면 마지막으로 적용한 버전 이후를 다시 요청합니다.
+  useEffect(() => {
+    if (state.game !== null && !state.synced) send({ type: "resync", since: versionRef.current });
+  }, [state.game, state.synced, send]);
+
+  const command = useCallback(
+    (cmd, ...args) =>
+      new Promise((resolve) => {
+        const id = nextIdRef.current++;
+        pendingRef.current.set(id, resolve);
+        send({ type: "command", id, cmd, args });
+      }),
+    [send]
+  );
+
+  // 여러 명령을 한 번에 보냅니다 (예: [["play_treasures"], ["buy_card", "Silver"], ["next_phase"]]).
+  // 서버는 전부 적용하거나 전혀 적용하지 않고, delta 도 하나만 보냅니다.
+  const batch = useCallback(
+    (commands) =>
+      new Promise((resolve) => {
+        const id = nextIdRef.current++;
+        pendingRef.current.set(id, resolve);
+        send({ type: "batch", id, commands });
+      }),
+    [send]
+  );
+
+  return {
+    version: state.version,
+    game: state.game,
+    synced: state.synced,
+    playCard: (card) => command("play_card", card),
+    buyCard: (card) => command("buy_card", card),
+    nextPhase: () => command("next_phase"),
+    batch,
+  };
+}
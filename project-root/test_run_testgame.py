@@ -6,38 +6,7 @@ sys.path.append(os.getcwd())
 
 from backend.app.core.engine import GameState, Engine, Phase
 from backend.app.core.card import CARD_DB, CLASS_DB
-
-def smart_ai_decision(pid, engine):
-    """AI의 의사결정 로직"""
-    p_state = engine.state.players[pid]
-    
-    # 1. 액션 페이즈 판단
-    if engine.state.phase == Phase.ACTION:
-        actions = [c for c in p_state["hand"] if CARD_DB[c].card_type == "ACTION"]
-        if not actions:
-            return None
-        
-        for card_name in actions:
-            card = CARD_DB[card_name]
-            # [전략] 체력이 20 이하인데 자폭 카드(Madness 등)라면 사용하지 않음
-            if hasattr(card, 'add_hp') and card.add_hp < 0:
-                if p_state["hp"] <= abs(card.add_hp) + 5: # 여유치 5 남김
-                    continue
-            return card_name
-            
-    # 2. 구매 페이즈 판단
-    elif engine.state.phase == Phase.BUY:
-        # [전략] 현재 골드로 살 수 있는 가장 비싼 전용 카드 혹은 실버/골드 선택
-        available_private = [c for c in p_state["private_market"] if p_state["private_market"][c] > 0]
-        affordable = [c for c in (available_private + ["Gold", "Silver"]) 
-                      if CARD_DB[c].cost <= p_state["gold"]]
-        
-        if affordable:
-            # 가장 비싼 카드 순으로 정렬하여 구매
-            affordable.sort(key=lambda x: CARD_DB[x].cost, reverse=True)
-            return affordable[0]
-            
-    return None
+from backend.app.core.ai import smart_ai_decision
 
 def run_smart_random_battle():
     # 1. 클래스 랜덤 선택